@@ -0,0 +1,47 @@
+"""Gunicorn configuration, see https://docs.gunicorn.org/en/stable/settings.html
+
+Requests spend most of their time waiting on other services, so each worker process runs a pool of
+threads (the `gthread` worker) rather than handling a single request at a time. The number of
+processes is derived from the CPU count, capped by the memory available to the container.
+"""
+import multiprocessing
+import os
+
+
+def _memory_limit():
+    """The container memory limit in bytes (cgroup v2 then v1) or None if there isn't one."""
+    for path in ('/sys/fs/cgroup/memory.max', '/sys/fs/cgroup/memory/memory.limit_in_bytes'):
+        try:
+            with open(path) as f:
+                limit = f.read().strip()
+        except OSError:
+            continue
+        if limit.isdigit() and int(limit) < 2 ** 60:
+            return int(limit)
+    return None
+
+
+def _default_workers():
+    workers = multiprocessing.cpu_count() * 2 + 1
+    memory_limit = _memory_limit()
+    if memory_limit:
+        worker_memory = int(os.environ.get('GUNICORN_WORKER_MEMORY_MB', 256)) * 1024 * 1024
+        workers = min(workers, memory_limit // worker_memory)
+    return max(workers, 1)
+
+
+worker_class = 'gthread'
+workers = int(os.environ.get('WEB_CONCURRENCY') or _default_workers())
+threads = int(os.environ.get('GUNICORN_THREADS', 8))
+# Connections queued per worker before gunicorn stops accepting, beyond which the platform router queues
+worker_connections = int(os.environ.get('GUNICORN_WORKER_CONNECTIONS', threads * 4))
+backlog = int(os.environ.get('GUNICORN_BACKLOG', 64))
+
+# Upstream calls time out after UPSTREAM_TIMEOUT, so a request taking longer than this is stuck
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 60))
+graceful_timeout = int(os.environ.get('GUNICORN_GRACEFUL_TIMEOUT', 30))
+keepalive = int(os.environ.get('GUNICORN_KEEPALIVE', 5))
+
+# Recycle workers now and then so that slow memory growth can't take a container down
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 1000))
+max_requests_jitter = int(os.environ.get('GUNICORN_MAX_REQUESTS_JITTER', 100))
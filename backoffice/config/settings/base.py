@@ -56,7 +56,7 @@ INSTALLED_APPS = [
 
     # viewflow
     'viewflow',
-    'viewflow.frontend',
+    'web.grant_management.apps.GrantManagementFrontendConfig',  # viewflow.frontend
 
     'django.contrib.admin',
     'django.contrib.auth',
@@ -64,12 +64,17 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
 
     'sass_processor',
     'django_filters',
 ] + TAP_APPS
 
 MIDDLEWARE = [
+    'web.core.middleware.LoadSheddingMiddleware',
+    'web.core.middleware.ServerTimingMiddleware',
+    'web.core.middleware.QueryBudgetMiddleware',
+    'web.core.profiling.ProfilingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -124,6 +129,8 @@ else:
         }
     }
 
+CACHES = {'default': env.cache('CACHE_URL', default='locmemcache://')}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/3.0/ref/settings/#auth-password-validators
@@ -200,6 +207,13 @@ REST_FRAMEWORK = {
 DNB_SERVICE_URL = env('DNB_SERVICE_URL', default=None)
 DNB_SERVICE_TOKEN = env('DNB_SERVICE_TOKEN', default=None)
 
+# Company searches are also run against the stored dnb responses, which answer identifier lookups
+# and are served alone when dnb-service is unavailable
+LOCAL_COMPANY_SEARCH_ENABLED = env.bool('LOCAL_COMPANY_SEARCH_ENABLED', default=True)
+LOCAL_COMPANY_SEARCH_MAX_RESULTS = env.int('LOCAL_COMPANY_SEARCH_MAX_RESULTS', default=20)
+# How long the companies returned by a search can be selected without looking them up in dnb-service again
+COMPANY_SEARCH_SNAPSHOT_TIMEOUT = env.int('COMPANY_SEARCH_SNAPSHOT_TIMEOUT', default=60 * 30)  # 30 minutes
+
 COMPANIES_HOUSE_URL = env('COMPANIES_HOUSE_URL', default=None)
 COMPANIES_HOUSE_COMPANIES_URL = env('COMPANIES_HOUSE_COMPANIES_URL', default=None)
 COMPANIES_HOUSE_API_KEY = env('COMPANIES_HOUSE_API_KEY', default=None)
@@ -212,8 +226,63 @@ CURRENCY_DECIMAL_PRECISION = {
 }
 
 NOTIFY_API_KEY = env('NOTIFY_API_KEY', default='')
+NOTIFY_API_URL = env('NOTIFY_API_URL', default='https://api.notifications.service.gov.uk')
 NOTIFY_ENABLED = False
 
+# Maximum number of SQL queries per request, keyed by url name (shell-style patterns are allowed).
+# Requests over budget are logged and flagged with an X-Query-Budget-Exceeded header.
+QUERY_BUDGET_DEFAULT = env.int('QUERY_BUDGET_DEFAULT', default=50)
+QUERY_BUDGETS = {
+    'grant-applications:grant-applications-list': 30,
+    'grant-applications:grant-applications-send-for-review': 80,
+    'grant-applications:grant-applications-select-company': 15,
+    'grant-applications:*': 10,
+    'companies:companies-list': 10,
+    'companies:*': 5,
+    'sectors:*': 5,
+    'trade-events:*': 5,
+    'viewflow:grant_management:grantmanagement:index': 15,
+    'viewflow:grant_management:grantmanagement:*': 25,
+}
+
+# Sampled request profiling. Profiles are listed for staff users at /profiling/
+PROFILING_ENABLED = env.bool('PROFILING_ENABLED', default=False)
+# Profile requests sent with an `X-Profile: <PROFILING_TOKEN>` header
+PROFILING_TOKEN = env('PROFILING_TOKEN', default=None)
+PROFILING_SAMPLE_RATE = env.float('PROFILING_SAMPLE_RATE', default=0)
+# Url names (shell-style patterns are allowed) to profile on every request
+PROFILING_ROUTES = env.list('PROFILING_ROUTES', default=[])
+PROFILING_DIR = env('PROFILING_DIR', default=os.path.join(BACKOFFICE_DIR, 'reports', 'profiles'))
+PROFILING_MAX_FILES = env.int('PROFILING_MAX_FILES', default=100)
+# Filters (regular expressions on file:line(function)) offered on each profile
+PROFILING_HOT_PATHS = {
+    'GrantApplicationPdf.generate': r'grant_applications/services\.py:\d+\(generate\)',
+    'Viewflow task views': r'viewflow/flow/views/task\.py',
+}
+
+# Bearer token required to scrape /metrics/ (the endpoint is disabled when unset, unless DEBUG)
+METRICS_TOKEN = env('METRICS_TOKEN', default=None)
+
+# Timeout (seconds) for calls to other services
+UPSTREAM_TIMEOUT = env.float('UPSTREAM_TIMEOUT', default=30)
+
+# Load shedding (see web.core.middleware.LoadSheddingMiddleware), 0 turns a check off.
+# Keep LOAD_SHEDDING_MAX_IN_FLIGHT below the gunicorn threads per worker so that a thread is left to shed.
+LOAD_SHEDDING_MAX_IN_FLIGHT = env.int('LOAD_SHEDDING_MAX_IN_FLIGHT', default=0)
+LOAD_SHEDDING_MAX_QUEUE_TIME = env.float('LOAD_SHEDDING_MAX_QUEUE_TIME', default=0)  # seconds
+LOAD_SHEDDING_RETRY_AFTER = env.int('LOAD_SHEDDING_RETRY_AFTER', default=5)  # seconds
+LOAD_SHEDDING_EXEMPT_PATHS = ['/metrics/']
+
+# Request and response bodies are truncated to LOG_BODY_MAX_LENGTH characters when logged
+LOG_BODY_MAX_LENGTH = env.int('LOG_BODY_MAX_LENGTH', default=1000)
+# Keys whose values are never written to the logs
+LOG_REDACTED_FIELDS = {
+    'email', 'email_address', 'applicant_email', 'applicant_full_name', 'applicant_mobile_number',
+    'personalisation', 'magic_link', 'body', 'password', 'token',
+}
+# Fraction of INFO records kept per logger, eg. LOG_SAMPLE_RATES='web.companies.services=0.1;web.core.notify=0.5'
+LOG_SAMPLE_RATES = env.dict('LOG_SAMPLE_RATES', cast={'value': float}, default={})
+
 BOOLEAN_CHOICES = [(True, 'Yes'), (False, 'No')]
 
 GRAPH_MODELS = {
@@ -226,5 +295,16 @@ GRAPH_MODELS = {
 FRONTEND_DOMAIN = env('FRONTEND_DOMAIN', default='')
 FRONTEND_SECRET_KEY = env('FRONTEND_SECRET_KEY', default='')
 MAGIC_LINK_HASH_TTL = 60 * 60 * 24 * 30  # 30 days
+
+# Grant application changes made in the backoffice (eg. by a reviewer) are posted to the frontend so that it can
+# drop its cached copy of the application. Change events are not recorded when CHANGE_EVENTS_WEBHOOK_URL is empty.
+CHANGE_EVENTS_WEBHOOK_URL = env('CHANGE_EVENTS_WEBHOOK_URL', default='')
+CHANGE_EVENTS_SECRET = env('CHANGE_EVENTS_SECRET', default='')
+CHANGE_EVENTS_TIMEOUT = env.float('CHANGE_EVENTS_TIMEOUT', default=2)  # seconds
+CHANGE_EVENTS_MAX_ATTEMPTS = env.int('CHANGE_EVENTS_MAX_ATTEMPTS', default=10)
+
+# Primary keys of new rows are time ordered uuids instead of random uuid4s, both kinds can be mixed in a table
+TIME_ORDERED_IDS = env.bool('TIME_ORDERED_IDS', default=False)
+
 MEDIA_ROOT = os.path.join(BACKOFFICE_DIR, 'media/')
 MEDIA_URL = '/media/'
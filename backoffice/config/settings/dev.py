@@ -14,9 +14,23 @@ NOTIFY_ENABLED = True
 LOGGING = {
     'version': 1,
     'disable_existing_loggers': False,
+    'formatters': {
+        'json': {
+            '()': 'web.core.logs.JSONFormatter',
+        },
+    },
+    'filters': {
+        'sampling': {
+            '()': 'web.core.logs.SamplingFilter',
+            'rates': LOG_SAMPLE_RATES,
+        },
+    },
     'handlers': {
         'console': {
-            'class': 'logging.StreamHandler',
+            'class': 'web.core.logs.AsyncStreamHandler',
+            'stream': 'ext://sys.stdout',
+            'formatter': 'json',
+            'filters': ['sampling'],
         },
     },
     'root': {
@@ -50,7 +50,11 @@ LOGGING = {
             'handlers': ['console'],
             'level': 'DEBUG',
             'propagate': True,
-        }
+        },
+        # Email previews (including magic links) are logged at DEBUG when NOTIFY_ENABLED is off
+        'web.core.notify': {
+            'level': 'DEBUG',
+        },
     },
 }
 
@@ -20,7 +20,7 @@ from django.views.generic import RedirectView
 from django.views.static import serve
 from material.frontend.urls import modules as viewflow_apps
 
-from web.core.views import IndexView
+from web.core.views import IndexView, metrics, profile_detail, profile_list
 
 urlpatterns = [
     path('', IndexView.as_view(), name='index'),
@@ -32,6 +32,9 @@ urlpatterns = [
         RedirectView.as_view(url='/static/govuk/assets/%(asset_path)s'),
     ),
     path('auth/', include('authbroker_client.urls')),
+    path('metrics/', metrics, name='metrics'),
+    path('profiling/', profile_list, name='profile-list'),
+    path('profiling/<str:name>/', profile_detail, name='profile-detail'),
 
     # Viewflow urls (includes the django /admin site)
     path('', include(viewflow_apps.urls)),
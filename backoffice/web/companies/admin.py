@@ -12,6 +12,8 @@ class CompanyAdmin(admin.ModelAdmin):
 
 @admin.register(DnbGetCompanyResponse)
 class DnbGetCompanyResponseAdmin(admin.ModelAdmin):
-    fields = ['id', 'company', 'dnb_data', 'created', 'updated']
-    readonly_fields = ['id', 'company', 'dnb_data', 'created', 'updated']
-    list_display = ['id', 'company', 'dnb_data', 'created', 'updated']
+    fields = ['id', 'company', 'primary_name', 'registration_number', 'dnb_data', 'created', 'updated', 'last_seen']
+    readonly_fields = [
+        'id', 'company', 'primary_name', 'registration_number', 'dnb_data', 'created', 'updated', 'last_seen'
+    ]
+    list_display = ['id', 'company', 'primary_name', 'registration_number', 'created', 'last_seen']
@@ -1,3 +1,9 @@
+import logging
+import time
+
+import requests
+from django.conf import settings
+from django.db.models import Prefetch
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.viewsets import ModelViewSet
@@ -8,7 +14,17 @@ from web.companies.serializers import (
     DnbGetCompanyResponseSerializer
 )
 
-from web.companies.services import refresh_dnb_company_response_data, DnbServiceClient
+from web.companies.services import (
+    refresh_dnb_company_response_data, save_company_search_results, search_local_companies, DnbServiceClient
+)
+from web.core.exceptions import DnbServiceClientException
+from web.core.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+registry.describe('company_searches_total', 'Company searches, by the source which answered them.')
+registry.describe('company_search_local_hits_total', 'Company searches which found stored companies.')
+registry.describe('company_search_duration_seconds', 'Time taken to search companies, by source.')
 
 
 class CompaniesViewSet(ModelViewSet):
@@ -20,6 +36,15 @@ class CompaniesViewSet(ModelViewSet):
             return CompanyWriteSerializer
         return CompanyReadSerializer
 
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.get_serializer_class() is CompanyReadSerializer:
+            # The raw data of every response is serialized, so it is not deferred as by default
+            queryset = queryset.prefetch_related(Prefetch(
+                'dnb_get_company_responses', queryset=DnbGetCompanyResponse.objects.defer(None)
+            ))
+        return queryset
+
     def perform_create(self, serializer):
         company = serializer.save()
         refresh_dnb_company_response_data(company)
@@ -27,13 +52,58 @@ class CompaniesViewSet(ModelViewSet):
 
 class SearchCompaniesView(APIView):
 
+    def search_local(self, params):
+        started = time.perf_counter()
+        responses = search_local_companies(**params)
+        registry.observe('company_search_duration_seconds', time.perf_counter() - started, labels={'source': 'local'})
+        if responses:
+            registry.inc('company_search_local_hits_total')
+        return responses
+
+    def search_dnb(self, params):
+        started = time.perf_counter()
+        companies_data = DnbServiceClient().search_companies(**params)
+        registry.observe('company_search_duration_seconds', time.perf_counter() - started, labels={'source': 'dnb'})
+        return [DnbGetCompanyResponse(dnb_data=d) for d in companies_data]
+
+    def is_answered_locally(self, params, local_responses):
+        """Identifiers match exactly, so stored companies answer a search for them without a call to
+        dnb-service when every requested identifier was found.
+        """
+        if not local_responses or not ('duns_number' in params or 'registration_numbers' in params):
+            return False
+        if 'registration_numbers' in params:
+            found = {r.registration_number for r in local_responses}
+            return {n.upper() for n in params['registration_numbers']} <= found
+        return True
+
+    def search(self, params):
+        if not settings.LOCAL_COMPANY_SEARCH_ENABLED:
+            registry.inc('company_searches_total', labels={'source': 'dnb'})
+            return self.search_dnb(params)
+
+        local_responses = self.search_local(params)
+        if self.is_answered_locally(params, local_responses):
+            registry.inc('company_searches_total', labels={'source': 'local'})
+            return local_responses
+
+        try:
+            dnb_responses = self.search_dnb(params)
+        except (DnbServiceClientException, requests.exceptions.RequestException) as e:
+            if not local_responses:
+                raise
+            logger.warning('Serving local company search results, dnb-service failed: %s', e)
+            registry.inc('company_searches_total', labels={'source': 'local_fallback'})
+            return local_responses
+
+        registry.inc('company_searches_total', labels={'source': 'dnb'})
+        dnb_duns_numbers = {r.dnb_data.get('duns_number') for r in dnb_responses}
+        return dnb_responses + [r for r in local_responses if r.dnb_data.get('duns_number') not in dnb_duns_numbers]
+
     def get(self, request, *args, **kwargs):
         serializer = SearchCompaniesSerializer(data=request.query_params)
         serializer.is_valid(raise_exception=True)
-        dnb_client = DnbServiceClient()
-        companies_data = dnb_client.search_companies(**serializer.validated_data)
-        companies = DnbGetCompanyResponseSerializer(
-            instance=[DnbGetCompanyResponse(dnb_data=d) for d in companies_data],
-            many=True
-        )
+        responses = self.search(serializer.validated_data)
+        save_company_search_results([r.dnb_data for r in responses])
+        companies = DnbGetCompanyResponseSerializer(instance=responses, many=True)
         return Response(companies.data)
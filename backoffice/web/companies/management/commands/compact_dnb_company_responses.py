@@ -0,0 +1,83 @@
+from itertools import groupby
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count
+
+from web.companies.models import Company, DnbGetCompanyResponse
+
+
+class Command(BaseCommand):
+    help = (
+        "Collapse consecutive dnb responses of a company with the same data into the first of them, "
+        "keeping the time the data was last seen. Each batch is committed separately so rows are only "
+        "locked for a short time."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            help="Number of dnb responses hashed, or companies compacted, per transaction",
+            dest="batch_size",
+            type=int,
+            default=1000,
+        )
+
+    def hash_responses(self, batch_size):
+        """Set the hash of dnb responses saved before it was stored."""
+        total = 0
+        while True:
+            batch = list(DnbGetCompanyResponse.objects.filter(dnb_data_hash__isnull=True).only(
+                'dnb_data_compressed'
+            )[:batch_size])
+            if not batch:
+                return total
+            for dnb_get_company_response in batch:
+                dnb_get_company_response.dnb_data_hash = DnbGetCompanyResponse.hash_dnb_data(
+                    dnb_get_company_response.dnb_data
+                )
+            DnbGetCompanyResponse.objects.bulk_update(batch, ['dnb_data_hash'])
+            total += len(batch)
+
+    def compact_companies(self, company_ids):
+        responses = DnbGetCompanyResponse.objects.filter(company_id__in=company_ids).order_by(
+            'company_id', 'created'
+        ).only('company_id', 'dnb_data_hash', 'created', 'last_seen')
+
+        kept, duplicates = {}, []
+        for _, company_responses in groupby(responses, key=lambda r: r.company_id):
+            previous = None
+            for response in company_responses:
+                if previous and previous.dnb_data_hash == response.dnb_data_hash:
+                    previous.last_seen = max(
+                        previous.last_seen or previous.created, response.last_seen or response.created
+                    )
+                    duplicates.append(response.pk)
+                    kept[previous.pk] = previous
+                else:
+                    previous = response
+
+        DnbGetCompanyResponse.objects.bulk_update(kept.values(), ['last_seen'])
+        removed = DnbGetCompanyResponse.objects.filter(pk__in=duplicates).delete()[0]
+        # Removing the latest response of a company clears its latest_dnb_response
+        Company.update_latest_dnb_responses(Company.objects.filter(pk__in=company_ids))
+        return removed
+
+    def handle(self, *args, **options):
+        hashed = self.hash_responses(options["batch_size"])
+
+        removed = 0
+        last_company_id = None
+        companies = DnbGetCompanyResponse.objects.filter(company_id__isnull=False).values('company_id').annotate(
+            responses=Count('id')
+        ).filter(responses__gt=1).order_by('company_id')
+        while True:
+            batch_companies = companies.filter(company_id__gt=last_company_id) if last_company_id else companies
+            company_ids = [c['company_id'] for c in batch_companies[:options["batch_size"]]]
+            if not company_ids:
+                break
+            with transaction.atomic():
+                removed += self.compact_companies(company_ids)
+            last_company_id = company_ids[-1]
+
+        self.stdout.write(f"Hashed {hashed} dnb responses and removed {removed} duplicates")
@@ -0,0 +1,180 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+import requests
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from web.companies.models import Company, DnbGetCompanyResponse
+from web.companies.services import DnbServiceClient
+from web.core.exceptions import DnbServiceClientException
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimiter:
+    """Space calls made from any number of threads at least 1 / rate seconds apart."""
+
+    def __init__(self, rate):
+        self.interval = 1 / rate if rate else 0
+        self.next_call = time.monotonic()
+        self.lock = threading.Lock()
+
+    def wait(self):
+        with self.lock:
+            now = time.monotonic()
+            delay = self.next_call - now
+            self.next_call = max(now, self.next_call) + self.interval
+        if delay > 0:
+            time.sleep(delay)
+
+
+class Command(BaseCommand):
+    help = (
+        "Refresh the dnb data of companies with undecided grant applications which hasn't been received "
+        "for --max-age days. Companies are searched by registration number in bulk where possible, each "
+        "batch is saved when its searches finish so an interrupted run can be resumed by running it again."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--max-age",
+            help="Refresh companies whose dnb data is older than this many days",
+            dest="max_age",
+            type=int,
+            default=7,
+        )
+        parser.add_argument(
+            "--all-companies",
+            help="Refresh all stale companies, not only those with undecided grant applications",
+            dest="all_companies",
+            action="store_true",
+        )
+        parser.add_argument(
+            "--batch-size",
+            help="Number of companies refreshed and saved per transaction",
+            dest="batch_size",
+            type=int,
+            default=100,
+        )
+        parser.add_argument(
+            "--bulk-size",
+            help="Number of registration numbers per dnb-service search",
+            dest="bulk_size",
+            type=int,
+            default=10,
+        )
+        parser.add_argument(
+            "--workers",
+            help="Number of concurrent dnb-service requests",
+            type=int,
+            default=4,
+        )
+        parser.add_argument(
+            "--rate",
+            help="Maximum number of dnb-service requests per second, 0 for no limit",
+            type=float,
+            default=5,
+        )
+
+    def get_stale_companies(self, max_age, all_companies):
+        companies = Company.objects.annotate(
+            dnb_data_received=Coalesce('latest_dnb_response__last_seen', 'latest_dnb_response__created')
+        ).filter(
+            Q(dnb_data_received__lt=timezone.now() - timedelta(days=max_age)) | Q(latest_dnb_response__isnull=True)
+        )
+        if not all_companies:
+            companies = companies.filter(
+                pk__in=Company.objects.filter(grantapplication__grant_management_process__decision__isnull=True)
+            )
+        return companies.select_related('latest_dnb_response').order_by('pk')
+
+    def search(self, **params):
+        self.rate_limiter.wait()
+        try:
+            return DnbServiceClient().search_companies(**params)
+        except (DnbServiceClientException, requests.exceptions.RequestException) as e:
+            # The companies stay stale, so they are retried by the next run
+            logger.error('Could not refresh dnb data: %s', e, exc_info=e)
+            return []
+
+    def fetch(self, companies):
+        """Return the dnb data of companies by duns number. Companies which are not found by the bulk search
+        are searched by their duns number.
+        """
+        results = {}
+        registration_numbers = [c.registration_number for c in companies if c.registration_number]
+        if len(registration_numbers) > 1:
+            for dnb_data in self.search(registration_numbers=registration_numbers):
+                results[str(dnb_data.get('duns_number'))] = dnb_data
+        for company in companies:
+            if company.duns_number not in results:
+                found = self.search(duns_number=company.duns_number)
+                if len(found) == 1:
+                    results[company.duns_number] = found[0]
+        return results
+
+    def save(self, companies, results):
+        new_responses, seen_responses = [], []
+        for company in companies:
+            dnb_data = results.get(company.duns_number)
+            if dnb_data is None:
+                continue
+            latest = company.latest_dnb_response
+            if latest and latest.dnb_data_hash == DnbGetCompanyResponse.hash_dnb_data(dnb_data):
+                seen_responses.append(latest.pk)
+            else:
+                new_responses.append(DnbGetCompanyResponse(company=company, dnb_data=dnb_data))
+
+        with transaction.atomic():
+            DnbGetCompanyResponse.objects.bulk_create(new_responses)
+            DnbGetCompanyResponse.objects.filter(pk__in=seen_responses).update(last_seen=timezone.now())
+            Company.update_latest_dnb_responses(
+                Company.objects.filter(pk__in=[r.company_id for r in new_responses])
+            )
+        return len(new_responses), len(seen_responses)
+
+    def handle(self, *args, **options):
+        self.rate_limiter = RateLimiter(options['rate'])
+        companies = self.get_stale_companies(options['max_age'], options['all_companies'])
+        total = companies.count()
+        started = time.perf_counter()
+        done = changed = unchanged = 0
+        last_company_id = None
+
+        with ThreadPoolExecutor(max_workers=options['workers']) as executor:
+            while True:
+                batch_companies = companies.filter(pk__gt=last_company_id) if last_company_id else companies
+                batch = list(batch_companies[:options['batch_size']])
+                if not batch:
+                    break
+                # Companies without a registration number are searched one at a time
+                with_registration_number = [c for c in batch if c.registration_number]
+                chunks = [
+                    with_registration_number[i:i + options['bulk_size']]
+                    for i in range(0, len(with_registration_number), options['bulk_size'])
+                ] + [[c] for c in batch if not c.registration_number]
+
+                results = {}
+                for chunk_results in executor.map(self.fetch, chunks):
+                    results.update(chunk_results)
+                batch_changed, batch_unchanged = self.save(batch, results)
+
+                done += len(batch)
+                changed += batch_changed
+                unchanged += batch_unchanged
+                last_company_id = batch[-1].pk
+                self.stdout.write(
+                    f"{done}/{total} companies, {done / (time.perf_counter() - started):.1f} companies/s"
+                )
+
+        failed = done - changed - unchanged
+        self.stdout.write(
+            f"Refreshed {done} companies: {changed} changed, {unchanged} unchanged, {failed} not found or failed"
+        )
@@ -0,0 +1,24 @@
+# Generated by Django 3.1.1 on 2026-10-19 18:46
+
+from django.db import migrations, models
+import web.core.abstract_models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies', '0002_auto_20201111_1445'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='company',
+            name='id',
+            field=models.UUIDField(default=web.core.abstract_models.generate_id, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='dnbgetcompanyresponse',
+            name='id',
+            field=models.UUIDField(default=web.core.abstract_models.generate_id, editable=False, primary_key=True, serialize=False),
+        ),
+    ]
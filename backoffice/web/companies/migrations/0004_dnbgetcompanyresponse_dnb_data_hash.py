@@ -0,0 +1,33 @@
+# Generated by Django 3.1.1 on 2026-10-19 18:48
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies', '0003_time_ordered_ids'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dnbgetcompanyresponse',
+            name='dnb_data_hash',
+            field=models.CharField(max_length=64, null=True),
+        ),
+        migrations.AddField(
+            model_name='dnbgetcompanyresponse',
+            name='last_seen',
+            field=models.DateTimeField(null=True),
+        ),
+        migrations.AlterField(
+            model_name='dnbgetcompanyresponse',
+            name='company',
+            field=models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='dnb_get_company_responses', to='companies.company'),
+        ),
+        migrations.AddIndex(
+            model_name='dnbgetcompanyresponse',
+            index=models.Index(fields=['company', 'created'], name='dnb_response_company_idx'),
+        ),
+    ]
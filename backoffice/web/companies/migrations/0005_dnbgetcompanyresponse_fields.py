@@ -0,0 +1,105 @@
+# Generated by Django 3.1.1 on 2026-10-19 18:50
+
+import hashlib
+import json
+import zlib
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import migrations, models
+
+
+FIELDS = [
+    'dnb_data_compressed', 'dnb_data_hash', 'primary_name', 'registration_number', 'company_address',
+    'employee_number', 'annual_sales', 'annual_sales_currency',
+]
+
+
+def get_field_values(dnb_data):
+    # As DnbGetCompanyResponse.get_field_values when this migration was written
+    registration_numbers = [
+        r['registration_number'] for r in dnb_data.get('registration_numbers') or []
+        if r['registration_type'] == 'uk_companies_house_number'
+    ]
+    data = json.dumps(dnb_data, sort_keys=True, separators=(',', ':'), cls=DjangoJSONEncoder)
+    return {
+        'dnb_data_compressed': zlib.compress(json.dumps(dnb_data, cls=DjangoJSONEncoder).encode()),
+        'dnb_data_hash': hashlib.sha256(data.encode()).hexdigest(),
+        'primary_name': dnb_data.get('primary_name'),
+        'registration_number': registration_numbers[0] if registration_numbers else None,
+        'company_address': ', '.join(
+            [v for k, v in dnb_data.items() if k.startswith('address_') and v]
+        ) or None,
+        'employee_number': dnb_data.get('employee_number'),
+        'annual_sales': dnb_data.get('annual_sales'),
+        'annual_sales_currency': dnb_data.get('annual_sales_currency'),
+    }
+
+
+def populate_fields(apps, schema_editor):
+    DnbGetCompanyResponse = apps.get_model('companies', 'DnbGetCompanyResponse')
+    responses = DnbGetCompanyResponse.objects.only('dnb_data')
+    batch = []
+    for response in responses.iterator(chunk_size=1000):
+        for field, value in get_field_values(response.dnb_data).items():
+            setattr(response, field, value)
+        batch.append(response)
+        if len(batch) == 1000:
+            DnbGetCompanyResponse.objects.bulk_update(batch, FIELDS)
+            batch = []
+    DnbGetCompanyResponse.objects.bulk_update(batch, FIELDS)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies', '0004_dnbgetcompanyresponse_dnb_data_hash'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dnbgetcompanyresponse',
+            name='dnb_data_compressed',
+            field=models.BinaryField(null=True),
+        ),
+        migrations.AddField(
+            model_name='dnbgetcompanyresponse',
+            name='primary_name',
+            field=models.CharField(db_index=True, max_length=500, null=True),
+        ),
+        migrations.AddField(
+            model_name='dnbgetcompanyresponse',
+            name='registration_number',
+            field=models.CharField(db_index=True, max_length=20, null=True),
+        ),
+        migrations.AddField(
+            model_name='dnbgetcompanyresponse',
+            name='company_address',
+            field=models.TextField(null=True),
+        ),
+        migrations.AddField(
+            model_name='dnbgetcompanyresponse',
+            name='employee_number',
+            field=models.IntegerField(null=True),
+        ),
+        migrations.AddField(
+            model_name='dnbgetcompanyresponse',
+            name='annual_sales',
+            field=models.FloatField(null=True),
+        ),
+        migrations.AddField(
+            model_name='dnbgetcompanyresponse',
+            name='annual_sales_currency',
+            field=models.CharField(max_length=3, null=True),
+        ),
+        # Irreversible, the dnb_data json column is dropped below and isn't restored
+        migrations.RunPython(populate_fields),
+        migrations.RemoveField(
+            model_name='dnbgetcompanyresponse',
+            name='dnb_data',
+        ),
+        migrations.AlterField(
+            model_name='dnbgetcompanyresponse',
+            name='dnb_data_compressed',
+            field=models.BinaryField(),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 3.1.1 on 2026-10-19 18:53
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def populate_latest_dnb_response(apps, schema_editor):
+    Company = apps.get_model('companies', 'Company')
+    DnbGetCompanyResponse = apps.get_model('companies', 'DnbGetCompanyResponse')
+    Company.objects.update(latest_dnb_response=models.Subquery(
+        DnbGetCompanyResponse.objects.filter(
+            company=models.OuterRef('pk')
+        ).order_by('-created').values('pk')[:1]
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies', '0005_dnbgetcompanyresponse_fields'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='dnbgetcompanyresponse',
+            options={'base_manager_name': 'objects'},
+        ),
+        migrations.AddField(
+            model_name='company',
+            name='latest_dnb_response',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='companies.dnbgetcompanyresponse'),
+        ),
+        migrations.RunPython(populate_latest_dnb_response, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 3.1.1 on 2026-10-19 18:55
+
+import json
+import zlib
+
+from django.db import migrations, models
+
+
+def populate_address_postcode(apps, schema_editor):
+    DnbGetCompanyResponse = apps.get_model('companies', 'DnbGetCompanyResponse')
+    responses = DnbGetCompanyResponse.objects.only('dnb_data_compressed')
+    batch = []
+    for response in responses.iterator(chunk_size=1000):
+        postcode = json.loads(zlib.decompress(response.dnb_data_compressed)).get('address_postcode')
+        response.address_postcode = postcode.replace(' ', '').upper() if postcode else None
+        batch.append(response)
+        if len(batch) == 1000:
+            DnbGetCompanyResponse.objects.bulk_update(batch, ['address_postcode'])
+            batch = []
+    DnbGetCompanyResponse.objects.bulk_update(batch, ['address_postcode'])
+
+
+def create_primary_name_trigram_index(apps, schema_editor):
+    # pg_trgm can't be installed on every server (eg. it has to be enabled on the database service first), the
+    # local company search falls back to a contains match without it
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+        if cursor.fetchone() is None:
+            return
+        cursor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        cursor.execute(
+            'CREATE INDEX IF NOT EXISTS dnb_response_name_trgm_idx ON companies_dnbgetcompanyresponse '
+            'USING gin (primary_name gin_trgm_ops)'
+        )
+
+
+def drop_primary_name_trigram_index(apps, schema_editor):
+    schema_editor.execute('DROP INDEX IF EXISTS dnb_response_name_trgm_idx')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies', '0006_company_latest_dnb_response'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dnbgetcompanyresponse',
+            name='address_postcode',
+            field=models.CharField(db_index=True, max_length=20, null=True),
+        ),
+        migrations.RunPython(populate_address_postcode, migrations.RunPython.noop),
+        migrations.RunPython(create_primary_name_trigram_index, drop_primary_name_trigram_index),
+    ]
@@ -1,5 +1,12 @@
+import hashlib
+import json
+import zlib
+
+from django.apps import apps
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
-from django.db.models import PROTECT
+from django.db.models import OuterRef, PROTECT, Subquery, Value
+from django.db.models.functions import NullIf
 
 from web.core.abstract_models import BaseMetaModel
 
@@ -8,24 +15,149 @@ class Company(BaseMetaModel):
     duns_number = models.CharField(unique=True, max_length=20)
     registration_number = models.CharField(null=True, unique=True, max_length=20)
     name = models.CharField(max_length=500)
+    # Kept up to date when a dnb response is saved, so that the latest response of companies can be
+    # selected with a join
+    latest_dnb_response = models.ForeignKey(
+        'DnbGetCompanyResponse', on_delete=models.SET_NULL, null=True, related_name='+'
+    )
+
+    # Fields included in the grant applications read by the frontend, a change to any of them is published
+    # to the applications of the company
+    published_fields = ['name', 'registration_number', 'latest_dnb_response']
 
     class Meta:
         verbose_name_plural = 'companies'
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
+    def refresh_from_db(self, *args, **kwargs):
+        super().refresh_from_db(*args, **kwargs)
+        self.set_loaded_values()
+
+    def set_loaded_values(self):
+        """Remember the current values as those in the database, see get_changed_published_fields."""
+        self._loaded_values = {
+            f.attname: self.__dict__[f.attname] for f in self._meta.concrete_fields if f.attname in self.__dict__
+        }
+
+    def get_changed_published_fields(self, update_fields=None):
+        """Published fields which differ from the values loaded from the database. Fields which weren't
+        loaded count as changed when they have been set.
+        """
+        loaded_values = getattr(self, '_loaded_values', {})
+        changed = []
+        for name in self.published_fields:
+            if update_fields is not None and name not in update_fields:
+                continue
+            attname = self._meta.get_field(name).attname
+            if attname in loaded_values:
+                if loaded_values[attname] != getattr(self, attname):
+                    changed.append(name)
+            elif attname in self.__dict__:
+                changed.append(name)
+        return changed
+
+    def save(self, *args, **kwargs):
+        # A new company has no grant applications to publish a change to
+        changed = not self._state.adding and self.get_changed_published_fields(kwargs.get('update_fields'))
+        super().save(*args, **kwargs)
+        self.set_loaded_values()
+        # Keep the business name of applications for this company in sync, those with a manual company name
+        # (which is used when not empty, as in GrantApplication.build_company_display_name) keep it
+        renamed = list(
+            self.grantapplication_set.annotate(
+                manual_name=NullIf('manual_company_name', Value(''))
+            ).filter(manual_name__isnull=True).exclude(company_display_name=self.name).values_list('pk', flat=True)
+        )
+        if renamed:
+            self.grantapplication_set.filter(pk__in=renamed).update(company_display_name=self.name)
+            GrantManagementProcess = apps.get_model('grant_management', 'GrantManagementProcess')
+            GrantManagementProcess.update_summary_texts(
+                GrantManagementProcess.objects.filter(grant_application__in=renamed)
+            )
+        if changed:
+            Company.publish_changes(Company.objects.filter(pk=self.pk))
+
+    @classmethod
+    def publish_changes(cls, queryset):
+        """Publish a change to the grant applications of the companies of queryset, which include them."""
+        GrantApplication = apps.get_model('grant_applications', 'GrantApplication')
+        GrantApplication.publish_changes(GrantApplication.objects.filter(company__in=queryset), 'company')
+
     @property
     def last_dnb_get_company_response(self):
-        return self.dnb_get_company_responses.order_by('-created').first()
+        return self.latest_dnb_response
+
+    @classmethod
+    def update_latest_dnb_responses(cls, queryset):
+        """Point the companies of queryset at their latest dnb response. Only the companies whose latest
+        response changes are updated and published, returns their number.
+        """
+        latest = Subquery(
+            DnbGetCompanyResponse.objects.filter(company=OuterRef('pk')).order_by('-created').values('pk')[:1]
+        )
+        changed = [
+            pk for pk, current, new in queryset.annotate(new_latest_dnb_response=latest).values_list(
+                'pk', 'latest_dnb_response', 'new_latest_dnb_response'
+            ) if current != new
+        ]
+        if not changed:
+            return 0
+        updated = cls.objects.filter(pk__in=changed).update(latest_dnb_response=latest)
+        cls.publish_changes(cls.objects.filter(pk__in=changed))
+        return updated
+
+
+class DnbGetCompanyResponseManager(models.Manager):
+
+    def get_queryset(self):
+        # The raw data is only loaded from the database when dnb_data is used
+        return super().get_queryset().defer('dnb_data_compressed')
 
 
 class DnbGetCompanyResponse(BaseMetaModel):
+    # Indexed by the (company, created) index in Meta.indexes
     company = models.ForeignKey(
-        Company, on_delete=PROTECT, null=True, related_name='dnb_get_company_responses'
+        Company, on_delete=PROTECT, null=True, related_name='dnb_get_company_responses', db_index=False
     )
-    dnb_data = models.JSONField()
+    # zlib compressed json of dnb_data, set with the fields below when dnb_data is set
+    dnb_data_compressed = models.BinaryField()
+    # sha256 of dnb_data, so that unchanged data received again is not stored again
+    dnb_data_hash = models.CharField(null=True, max_length=64)
+    # When the same dnb_data was last received again, see save_dnb_get_company_response
+    last_seen = models.DateTimeField(null=True)
+    # Fields of dnb_data used when listing and reviewing companies
+    primary_name = models.CharField(null=True, max_length=500, db_index=True)
+    registration_number = models.CharField(null=True, max_length=20, db_index=True)
+    company_address = models.TextField(null=True)
+    # Upper case without spaces, for the local company search
+    address_postcode = models.CharField(null=True, max_length=20, db_index=True)
+    employee_number = models.IntegerField(null=True)
+    annual_sales = models.FloatField(null=True)
+    annual_sales_currency = models.CharField(null=True, max_length=3)
 
-    @property
-    def registration_number(self):
-        registration_numbers = self.dnb_data.get('registration_numbers') or []
+    objects = DnbGetCompanyResponseManager()
+
+    class Meta:
+        # Also used for Company.latest_dnb_response, so the raw data is deferred there too
+        base_manager_name = 'objects'
+        # primary_name also has a trigram index, created by migration 0007 when pg_trgm is available
+        indexes = [
+            models.Index(fields=['company', 'created'], name='dnb_response_company_idx'),
+        ]
+
+    @staticmethod
+    def hash_dnb_data(dnb_data):
+        data = json.dumps(dnb_data, sort_keys=True, separators=(',', ':'), cls=DjangoJSONEncoder)
+        return hashlib.sha256(data.encode()).hexdigest()
+
+    @staticmethod
+    def get_registration_number(dnb_data):
+        registration_numbers = dnb_data.get('registration_numbers') or []
         reg_number_list = [
             r for r in registration_numbers
             if r['registration_type'] == 'uk_companies_house_number'
@@ -33,8 +165,52 @@ class DnbGetCompanyResponse(BaseMetaModel):
         reg_number = reg_number_list[0]['registration_number'] if reg_number_list else None
         return reg_number
 
-    @property
-    def company_address(self):
+    @staticmethod
+    def get_company_address(dnb_data):
         return ', '.join(
-            [v for k, v in self.dnb_data.items() if k.startswith('address_') and v]
+            [v for k, v in dnb_data.items() if k.startswith('address_') and v]
         ) or None
+
+    @staticmethod
+    def normalize_postcode(postcode):
+        return postcode.replace(' ', '').upper() if postcode else None
+
+    @classmethod
+    def get_field_values(cls, dnb_data):
+        """Values of the stored fields for dnb_data."""
+        return {
+            'dnb_data_compressed': zlib.compress(json.dumps(dnb_data, cls=DjangoJSONEncoder).encode()),
+            'dnb_data_hash': cls.hash_dnb_data(dnb_data),
+            'primary_name': dnb_data.get('primary_name'),
+            'registration_number': cls.get_registration_number(dnb_data),
+            'company_address': cls.get_company_address(dnb_data),
+            'address_postcode': cls.normalize_postcode(dnb_data.get('address_postcode')),
+            'employee_number': dnb_data.get('employee_number'),
+            'annual_sales': dnb_data.get('annual_sales'),
+            'annual_sales_currency': dnb_data.get('annual_sales_currency'),
+        }
+
+    def save(self, *args, **kwargs):
+        adding = self._state.adding
+        super().save(*args, **kwargs)
+        # Saves of an existing response only touch bookkeeping (eg. last_seen), which isn't published
+        if adding and self.company_id:
+            Company.objects.filter(pk=self.company_id).update(latest_dnb_response=self)
+            if self._meta.get_field('company').is_cached(self):
+                self.company.latest_dnb_response = self
+                # As saved by the update above, so a later save of the company doesn't publish it again
+                if hasattr(self.company, '_loaded_values'):
+                    self.company._loaded_values['latest_dnb_response_id'] = self.pk
+            Company.publish_changes(Company.objects.filter(pk=self.company_id))
+
+    @property
+    def dnb_data(self):
+        if getattr(self, '_dnb_data', None) is None:
+            self._dnb_data = json.loads(zlib.decompress(self.dnb_data_compressed))
+        return self._dnb_data
+
+    @dnb_data.setter
+    def dnb_data(self, dnb_data):
+        for field, value in self.get_field_values(dnb_data).items():
+            setattr(self, field, value)
+        self._dnb_data = dnb_data
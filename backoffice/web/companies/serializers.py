@@ -23,6 +23,7 @@ class CompanyWriteSerializer(serializers.ModelSerializer):
     class Meta:
         model = Company
         fields = '__all__'
+        read_only_fields = ['latest_dnb_response']
 
 
 class SearchCompaniesSerializer(serializers.Serializer):
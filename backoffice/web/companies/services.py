@@ -1,21 +1,30 @@
 import logging
+from functools import lru_cache
 from urllib.parse import urljoin
 
 import requests
 from django.conf import settings
+from django.contrib.postgres.search import TrigramSimilarity
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
 from requests.adapters import HTTPAdapter, Retry
 
-from web.companies.models import DnbGetCompanyResponse
+from web.companies.models import Company, DnbGetCompanyResponse
 from web.core.exceptions import DnbServiceClientException, CompaniesHouseApiException
+from web.core.instrumentation import InstrumentedSession, get_thread_session
+from web.core.logs import LogBody, LogUrl
 
 logger = logging.getLogger(__name__)
 
 
 def _log_hook(response, **kwargs):
-    body = response.request.body or 'No content'
-    logger.info(f'EXTERNAL {response.request.method} : {response.request.url} : {body}')
+    logger.info(
+        'EXTERNAL %s : %s : %s', response.request.method, LogUrl(response.request.url), LogBody(response.request.body)
+    )
     if not response.ok:
-        logger.error(f'RESPONSE : {response.status_code} : {response.text}')
+        logger.error('RESPONSE : %s : %s', response.status_code, LogBody(response.text))
 
 
 class DnbServiceClient:
@@ -24,16 +33,22 @@ class DnbServiceClient:
         self.base_url = settings.DNB_SERVICE_URL
         self.company_url = urljoin(self.base_url, 'companies/search/')
 
-        self.session = requests.Session()
-        self.session.headers.update({'Authorization': f'Token {settings.DNB_SERVICE_TOKEN}'})
+        self.session = get_thread_session(
+            ('dnb-service', self.base_url, settings.DNB_SERVICE_TOKEN), self._create_session
+        )
+
+    def _create_session(self):
+        session = InstrumentedSession(upstream='dnb-service', timeout=settings.UPSTREAM_TIMEOUT)
+        session.headers.update({'Authorization': f'Token {settings.DNB_SERVICE_TOKEN}'})
 
         # Attach retry adapter
         retry_strategy = Retry(total=3, status_forcelist=[500], method_whitelist=['GET', 'POST'])
         retry_adapter = HTTPAdapter(max_retries=retry_strategy)
-        self.session.mount(self.base_url, retry_adapter)
+        session.mount(self.base_url, retry_adapter)
 
         # Attach response hooks
-        self.session.hooks['response'] = [_log_hook, self._raise_for_status]
+        session.hooks['response'] = [_log_hook, self._raise_for_status]
+        return session
 
     @staticmethod
     def _raise_for_status(response, **kwargs):
@@ -58,13 +73,109 @@ class DnbServiceClient:
         return response.json()['results']
 
 
+def save_dnb_get_company_response(company, dnb_data):
+    """Store dnb data received for a company as its latest dnb response. When the data is the same as
+    the latest response only its last_seen time is updated.
+    """
+    latest = company.last_dnb_get_company_response
+    if latest and latest.dnb_data_hash == DnbGetCompanyResponse.hash_dnb_data(dnb_data):
+        latest.last_seen = timezone.now()
+        latest.save(update_fields=['last_seen'])
+        return latest
+    return DnbGetCompanyResponse.objects.create(company=company, dnb_data=dnb_data)
+
+
+def _search_result_cache_key(duns_number):
+    return f'company-search-result:{duns_number}'
+
+
+def save_company_search_results(companies_data):
+    """Remember the hash of each company search result for COMPANY_SEARCH_SNAPSHOT_TIMEOUT, so that a
+    selected result can be checked with get_verified_dnb_data without calling dnb-service again.
+    """
+    cache.set_many({
+        _search_result_cache_key(dnb_data['duns_number']): DnbGetCompanyResponse.hash_dnb_data(dnb_data)
+        for dnb_data in companies_data if dnb_data.get('duns_number')
+    }, timeout=settings.COMPANY_SEARCH_SNAPSHOT_TIMEOUT)
+
+
+def get_verified_dnb_data(dnb_data):
+    """Return dnb_data if it is a recent company search result, otherwise the data dnb-service has for
+    its duns number, or None if dnb-service doesn't know the company.
+    """
+    if cache.get(_search_result_cache_key(dnb_data['duns_number'])) == DnbGetCompanyResponse.hash_dnb_data(dnb_data):
+        return dnb_data
+    return DnbServiceClient().get_company(duns_number=dnb_data['duns_number'])
+
+
+def save_dnb_company_snapshot(dnb_data):
+    """Get or create the company described by a dnb-service search result, update its name and
+    registration number, and store the result as its latest dnb response. No call is made to
+    dnb-service, dnb_data should be checked with get_verified_dnb_data first.
+    """
+    registration_number = DnbGetCompanyResponse.get_registration_number(dnb_data)
+    with transaction.atomic():
+        company, created = Company.objects.get_or_create(
+            duns_number=dnb_data['duns_number'],
+            defaults={'registration_number': registration_number, 'name': dnb_data['primary_name']}
+        )
+        if not created and (company.name, company.registration_number) != (
+                dnb_data['primary_name'], registration_number):
+            company.name = dnb_data['primary_name']
+            company.registration_number = registration_number
+            company.save()
+        save_dnb_get_company_response(company, dnb_data)
+    return company
+
+
 def refresh_dnb_company_response_data(company):
     dnb_company_data = DnbServiceClient().get_company(duns_number=company.duns_number)
     if dnb_company_data:
-        dnb_get_company_response = DnbGetCompanyResponse.objects.create(
-            company=company, dnb_data=dnb_company_data
+        return save_dnb_get_company_response(company, dnb_company_data)
+
+
+@lru_cache(maxsize=None)
+def has_trigram_extension():
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+        return cursor.fetchone() is not None
+
+
+def search_local_companies(search_term=None, primary_name=None, registration_numbers=None, duns_number=None):
+    """Search the latest stored dnb responses of companies, taking the same parameters as
+    DnbServiceClient.search_companies. Names are matched by trigram similarity when pg_trgm is
+    installed and by a case insensitive contains otherwise, registration numbers and postcodes exactly.
+    """
+    trigram = has_trigram_extension()
+    name_lookup = 'latest_dnb_response__primary_name__trigram_similar' if trigram \
+        else 'latest_dnb_response__primary_name__icontains'
+
+    companies = Company.objects.filter(latest_dnb_response__isnull=False)
+    if duns_number:
+        companies = companies.filter(duns_number=duns_number)
+    if registration_numbers:
+        companies = companies.filter(
+            latest_dnb_response__registration_number__in=[r.upper() for r in registration_numbers]
         )
-        return dnb_get_company_response
+    if primary_name:
+        companies = companies.filter(**{name_lookup: primary_name})
+    if search_term:
+        companies = companies.filter(
+            Q(**{name_lookup: search_term})
+            | Q(latest_dnb_response__registration_number=search_term.strip().upper())
+            | Q(latest_dnb_response__address_postcode=DnbGetCompanyResponse.normalize_postcode(search_term))
+        )
+
+    name = search_term or primary_name
+    if name and trigram:
+        companies = companies.annotate(
+            similarity=TrigramSimilarity('latest_dnb_response__primary_name', name)
+        ).order_by('-similarity', 'latest_dnb_response__primary_name')
+    else:
+        companies = companies.order_by('latest_dnb_response__primary_name')
+
+    companies = companies.select_related('latest_dnb_response')[:settings.LOCAL_COMPANY_SEARCH_MAX_RESULTS]
+    return [company.latest_dnb_response for company in companies]
 
 
 class CompaniesHouseClient:
@@ -75,17 +186,23 @@ class CompaniesHouseClient:
         self.company_url = urljoin(self.base_url, 'company/{registration_number}/')
         self.filing_history_url = urljoin(self.company_url, 'filing-history/')
 
-        self.session = requests.Session()
-        self.session.auth = (settings.COMPANIES_HOUSE_API_KEY, "")
+        self.session = get_thread_session(
+            ('companies-house', self.base_url, settings.COMPANIES_HOUSE_API_KEY), self._create_session
+        )
+
+    def _create_session(self):
+        session = InstrumentedSession(upstream='companies-house', timeout=settings.UPSTREAM_TIMEOUT)
+        session.auth = (settings.COMPANIES_HOUSE_API_KEY, "")
 
         # Attach retry adapter
         retry_strategy = Retry(total=3, status_forcelist=[500], method_whitelist=['GET', 'POST'])
         retry_adapter = HTTPAdapter(max_retries=retry_strategy)
-        self.session.mount(self.search_companies_url, retry_adapter)
-        self.session.mount(self.company_url, retry_adapter)
+        session.mount(self.search_companies_url, retry_adapter)
+        session.mount(self.company_url, retry_adapter)
 
         # Attach response hooks
-        self.session.hooks['response'] = [_log_hook, self._raise_for_status]
+        session.hooks['response'] = [_log_hook, self._raise_for_status]
+        return session
 
     @staticmethod
     def _raise_for_status(response, **kwargs):
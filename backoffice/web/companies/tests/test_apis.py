@@ -2,14 +2,15 @@ import json
 from unittest.mock import patch
 
 import httpretty
+from django.test import override_settings
 from rest_framework.reverse import reverse
 from rest_framework.status import HTTP_200_OK, HTTP_400_BAD_REQUEST, HTTP_201_CREATED
 
 from web.companies.models import DnbGetCompanyResponse
 from web.companies.services import DnbServiceClient
 from web.core.exceptions import DnbServiceClientException, CompaniesHouseApiException
-from web.tests.external_api_responses import FAKE_DNB_SEARCH_COMPANIES
-from web.tests.factories.companies import CompanyFactory
+from web.core.external_api_responses import FAKE_DNB_SEARCH_COMPANIES
+from web.tests.factories.companies import CompanyFactory, DnbGetCompanyResponseFactory
 from web.tests.factories.users import UserFactory
 from web.tests.helpers import BaseAPITestCase
 
@@ -94,6 +95,16 @@ class CompaniesApiTests(BaseAPITestCase):
         self.assertEqual(response.status_code, HTTP_201_CREATED, msg=response.data)
         self.assertTrue(DnbGetCompanyResponse.objects.filter(company__duns_number=2).exists())
 
+    def test_latest_dnb_response_is_read_only(self, *mocks):
+        company = CompanyFactory()
+        latest = DnbGetCompanyResponseFactory(company=company)
+        other = DnbGetCompanyResponseFactory()
+        path = reverse('companies:companies-detail', args=(company.id,))
+        response = self.client.patch(path, data={'latest_dnb_response': other.id_str})
+        self.assertEqual(response.status_code, HTTP_200_OK, msg=response.data)
+        company.refresh_from_db()
+        self.assertEqual(company.latest_dnb_response, latest)
+
 
 @patch.object(DnbServiceClient, 'get_company', return_value={'primary_name': 'Company 1'})
 @patch.object(
@@ -139,3 +150,53 @@ class SearchCompaniesApiTests(BaseAPITestCase):
         mocks[0].side_effect = [CompaniesHouseApiException]
         response = self.client.get(reverse('companies:search'), {'search_term': 'fake-name'})
         self.assertEqual(response.status_code, 503)
+
+    def test_stored_company_answers_identifier_search(self, *mocks):
+        company = CompanyFactory(duns_number='239896579')
+        response = self.client.get(reverse('companies:search'), {'duns_number': '239896579'})
+        self.assertEqual(response.status_code, HTTP_200_OK, msg=response.data)
+        self.assertEqual(len(response.data), 1)
+        self.assertEqual(response.data[0]['company'], company.id)
+        self.assertEqual(response.data[0]['dnb_data']['primary_name'], 'GOOGLE UK LIMITED')
+        mocks[0].assert_not_called()
+
+    def test_stored_companies_answer_registration_numbers_search_only_if_all_found(self, *mocks):
+        company = CompanyFactory(duns_number='239896579')
+        registration_number = company.latest_dnb_response.registration_number
+
+        response = self.client.get(reverse('companies:search'), {'registration_numbers': [registration_number]})
+        self.assertEqual(response.status_code, HTTP_200_OK, msg=response.data)
+        self.assertEqual([r['company'] for r in response.data], [company.id])
+        mocks[0].assert_not_called()
+
+        response = self.client.get(
+            reverse('companies:search'), {'registration_numbers': [registration_number, '03977902']}
+        )
+        self.assertEqual(response.status_code, HTTP_200_OK, msg=response.data)
+        self.assertEqual(
+            [r['dnb_data']['primary_name'] for r in response.data], ['Company 1', 'GOOGLE UK LIMITED']
+        )
+        mocks[0].assert_called_once_with(registration_numbers=[registration_number, '03977902'])
+
+    def test_stored_companies_merged_with_dnb_results(self, *mocks):
+        CompanyFactory(duns_number='239896579')
+        response = self.client.get(reverse('companies:search'), {'search_term': 'google'})
+        self.assertEqual(response.status_code, HTTP_200_OK, msg=response.data)
+        self.assertEqual(
+            [r['dnb_data']['primary_name'] for r in response.data], ['Company 1', 'GOOGLE UK LIMITED']
+        )
+
+    def test_stored_companies_served_on_dnb_service_exception(self, *mocks):
+        mocks[0].side_effect = [DnbServiceClientException]
+        CompanyFactory(duns_number='239896579')
+        response = self.client.get(reverse('companies:search'), {'search_term': 'google'})
+        self.assertEqual(response.status_code, HTTP_200_OK, msg=response.data)
+        self.assertEqual(len(response.data), 1)
+        self.assertEqual(response.data[0]['dnb_data']['primary_name'], 'GOOGLE UK LIMITED')
+
+    @override_settings(LOCAL_COMPANY_SEARCH_ENABLED=False)
+    def test_local_search_disabled(self, *mocks):
+        mocks[0].side_effect = [DnbServiceClientException]
+        CompanyFactory(duns_number='239896579')
+        response = self.client.get(reverse('companies:search'), {'search_term': 'google'})
+        self.assertEqual(response.status_code, 503)
@@ -0,0 +1,118 @@
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.utils import timezone
+
+from web.companies.models import DnbGetCompanyResponse
+from web.companies.services import DnbServiceClient
+from web.core.exceptions import DnbServiceClientException
+from web.grant_management.models import GrantManagementProcess
+from web.tests.factories.companies import CompanyFactory, DnbGetCompanyResponseFactory
+from web.tests.factories.grant_applications import GrantApplicationFactory
+from web.tests.factories.grant_management import GrantManagementProcessFactory
+from web.tests.helpers import BaseTestCase
+
+
+class TestCompactDnbCompanyResponsesCommand(BaseTestCase):
+
+    def create_responses(self, company, *dnb_data):
+        now = timezone.now()
+        responses = [DnbGetCompanyResponseFactory(company=company, dnb_data=data) for data in dnb_data]
+        for i, response in enumerate(responses):
+            DnbGetCompanyResponse.objects.filter(pk=response.pk).update(
+                created=now - timedelta(days=len(responses) - i), dnb_data_hash=None
+            )
+        return responses
+
+    def test_compact(self):
+        company = CompanyFactory(dnb_get_company_responses=None)
+        a1, a2, b, a3 = self.create_responses(company, {'a': 1}, {'a': 1}, {'b': 1}, {'a': 1})
+        other_company = CompanyFactory(dnb_get_company_responses=None)
+        c1, c2 = self.create_responses(other_company, {'c': 1}, {'c': 1})
+
+        out = StringIO()
+        call_command('compact_dnb_company_responses', batch_size=1, stdout=out)
+        self.assertIn('Hashed 6 dnb responses and removed 2 duplicates', out.getvalue())
+
+        # Only consecutive duplicates are removed so that the history of changes is kept
+        self.assertQuerysetEqual(
+            company.dnb_get_company_responses.order_by('created'), [a1.pk, b.pk, a3.pk], transform=lambda r: r.pk
+        )
+        self.assertQuerysetEqual(
+            other_company.dnb_get_company_responses.all(), [c1.pk], transform=lambda r: r.pk
+        )
+        # c2 was the latest response of other_company
+        other_company.refresh_from_db()
+        self.assertEqual(other_company.latest_dnb_response, c1)
+        a1.refresh_from_db()
+        self.assertEqual(a1.last_seen, DnbGetCompanyResponse.objects.get(pk=b.pk).created - timedelta(days=1))
+        self.assertEqual(a1.dnb_data_hash, DnbGetCompanyResponse.hash_dnb_data({'a': 1}))
+
+
+class TestRefreshDnbCompanyDataCommand(BaseTestCase):
+
+    def create_company(self, dnb_data, age_days=30, registration_number=None, decision=None):
+        company = CompanyFactory(registration_number=registration_number, dnb_get_company_responses=None)
+        response = DnbGetCompanyResponseFactory(company=company, dnb_data=dnb_data)
+        DnbGetCompanyResponse.objects.filter(pk=response.pk).update(
+            created=timezone.now() - timedelta(days=age_days)
+        )
+        GrantManagementProcessFactory(grant_application=GrantApplicationFactory(company=company), decision=decision)
+        company.refresh_from_db()
+        return company
+
+    def dnb_data(self, company, **data):
+        return {'duns_number': company.duns_number, **data}
+
+    def test_refresh(self):
+        changed = self.create_company({'a': 1}, registration_number='00000001')
+        unchanged = self.create_company({}, registration_number='00000002')
+        unchanged.latest_dnb_response.dnb_data = self.dnb_data(unchanged)
+        unchanged.latest_dnb_response.save()
+        no_registration_number = self.create_company({'a': 1})
+        fresh = self.create_company({'a': 1}, age_days=1, registration_number='00000003')
+        decided = self.create_company(
+            {'a': 1}, registration_number='00000004', decision=GrantManagementProcess.Decision.APPROVED
+        )
+
+        def search_companies(**params):
+            if 'registration_numbers' in params:
+                return [self.dnb_data(changed, a=2), self.dnb_data(unchanged)]
+            return [self.dnb_data(no_registration_number, a=2)]
+
+        out = StringIO()
+        with patch.object(DnbServiceClient, 'search_companies', side_effect=search_companies) as mock:
+            call_command('refresh_dnb_company_data', rate=0, stdout=out)
+        self.assertIn('Refreshed 3 companies: 2 changed, 1 unchanged, 0 not found or failed', out.getvalue())
+        # One bulk search of both registration numbers and one search for the company without one
+        self.assertEqual(mock.call_count, 2)
+        bulk_search = next(c for c in mock.call_args_list if 'registration_numbers' in c.kwargs)
+        self.assertCountEqual(bulk_search.kwargs['registration_numbers'], ['00000001', '00000002'])
+
+        for company in [changed, no_registration_number]:
+            company.refresh_from_db()
+            self.assertEqual(company.dnb_get_company_responses.count(), 2)
+            self.assertEqual(company.latest_dnb_response.dnb_data, self.dnb_data(company, a=2))
+        unchanged.latest_dnb_response.refresh_from_db()
+        self.assertIsNotNone(unchanged.latest_dnb_response.last_seen)
+        for company in [fresh, decided]:
+            self.assertEqual(company.dnb_get_company_responses.count(), 1)
+
+    def test_failed_companies_are_refreshed_by_next_run(self):
+        company = self.create_company({'a': 1})
+
+        out = StringIO()
+        with patch.object(DnbServiceClient, 'search_companies', side_effect=DnbServiceClientException):
+            call_command('refresh_dnb_company_data', rate=0, stdout=out)
+        self.assertIn('Refreshed 1 companies: 0 changed, 0 unchanged, 1 not found or failed', out.getvalue())
+
+        out = StringIO()
+        with patch.object(DnbServiceClient, 'search_companies', return_value=[self.dnb_data(company, a=2)]):
+            call_command('refresh_dnb_company_data', rate=0, stdout=out)
+        self.assertIn('Refreshed 1 companies: 1 changed', out.getvalue())
+
+        out = StringIO()
+        call_command('refresh_dnb_company_data', rate=0, stdout=out)
+        self.assertIn('Refreshed 0 companies', out.getvalue())
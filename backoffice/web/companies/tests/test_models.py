@@ -1,3 +1,5 @@
+from web.companies.models import Company, DnbGetCompanyResponse
+from web.core.external_api_responses import FAKE_DNB_SEARCH_COMPANIES
 from web.tests.factories.companies import CompanyFactory, DnbGetCompanyResponseFactory
 from web.tests.helpers import BaseTestCase
 
@@ -9,6 +11,26 @@ class TestCompanyModel(BaseTestCase):
         DnbGetCompanyResponseFactory(company=company)
         dnb_company_instance_2 = DnbGetCompanyResponseFactory(company=company)
         self.assertEqual(company.last_dnb_get_company_response, dnb_company_instance_2)
+        company.refresh_from_db()
+        self.assertEqual(company.latest_dnb_response, dnb_company_instance_2)
+
+    def test_latest_dnb_response_of_companies_in_one_query(self, *mocks):
+        companies = CompanyFactory.create_batch(size=3)
+        with self.assertNumQueries(1):
+            latest_dnb_responses = {
+                c.pk: c.last_dnb_get_company_response
+                for c in Company.objects.select_related('latest_dnb_response')
+            }
+        for company in companies:
+            self.assertEqual(latest_dnb_responses[company.pk], company.dnb_get_company_responses.get())
+
+    def test_update_latest_dnb_responses(self, *mocks):
+        company = CompanyFactory(dnb_get_company_responses=None)
+        dnb_get_company_response = DnbGetCompanyResponseFactory(company=company)
+        Company.objects.update(latest_dnb_response=None)
+        Company.update_latest_dnb_responses(Company.objects.all())
+        company.refresh_from_db()
+        self.assertEqual(company.latest_dnb_response, dnb_get_company_response)
 
 
 class TestDnbGetCompanyResponseModel(BaseTestCase):
@@ -20,7 +42,7 @@ class TestDnbGetCompanyResponseModel(BaseTestCase):
             instance.dnb_data['registration_numbers'][0]['registration_number']
         )
 
-        instance.dnb_data['registration_numbers'] = None
+        instance.dnb_data = {**instance.dnb_data, 'registration_numbers': None}
         self.assertIsNone(instance.registration_number)
 
     def test_company_address(self, *mocks):
@@ -30,10 +52,27 @@ class TestDnbGetCompanyResponseModel(BaseTestCase):
             'Belgrave House, 76 Buckingham Palace Road, LONDON, SW1W 9TQ, UK',
         )
 
-        instance.dnb_data['address_line_1'] = ''
-        instance.dnb_data['address_line_2'] = ''
-        instance.dnb_data['address_town'] = ''
-        instance.dnb_data['address_county'] = ''
-        instance.dnb_data['address_postcode'] = ''
-        instance.dnb_data['address_country'] = ''
+        instance.dnb_data = {
+            **instance.dnb_data,
+            'address_line_1': '',
+            'address_line_2': '',
+            'address_town': '',
+            'address_county': '',
+            'address_postcode': '',
+            'address_country': '',
+        }
         self.assertIsNone(instance.company_address)
+
+    def test_stored_fields(self, *mocks):
+        instance = DnbGetCompanyResponseFactory()
+        instance = DnbGetCompanyResponse.objects.get(pk=instance.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(instance.primary_name, 'GOOGLE UK LIMITED')
+            self.assertEqual(instance.registration_number, '10000001')
+            self.assertEqual(instance.employee_number, 4439)
+            self.assertEqual(instance.annual_sales, 2026167095.0)
+            self.assertEqual(instance.annual_sales_currency, 'USD')
+
+        # The raw data is loaded when used
+        with self.assertNumQueries(1):
+            self.assertEqual(instance.dnb_data, FAKE_DNB_SEARCH_COMPANIES['results'][0])
@@ -1,4 +1,5 @@
 import json
+from unittest.mock import patch
 
 import httpretty
 
@@ -229,3 +230,58 @@ class ServicesTests(BaseAPITestCase):
         dnb_get_company_response = services.refresh_dnb_company_response_data(company)
         self.assertIsNone(dnb_get_company_response)
         self.assertIsNone(company.last_dnb_get_company_response)
+
+    def test_save_dnb_get_company_response_only_stores_changed_data(self):
+        company = CompanyFactory(dnb_get_company_responses=None)
+        first = services.save_dnb_get_company_response(company, {'duns_number': 1, 'primary_name': 'name-1'})
+        self.assertIsNone(first.last_seen)
+
+        same = services.save_dnb_get_company_response(company, {'primary_name': 'name-1', 'duns_number': 1})
+        self.assertEqual(same, first)
+        first.refresh_from_db()
+        self.assertIsNotNone(first.last_seen)
+
+        changed = services.save_dnb_get_company_response(company, {'duns_number': 1, 'primary_name': 'name-2'})
+        self.assertNotEqual(changed, first)
+        self.assertEqual(company.dnb_get_company_responses.count(), 2)
+        self.assertEqual(company.last_dnb_get_company_response, changed)
+
+
+@patch.object(services, 'has_trigram_extension', return_value=False)
+class SearchLocalCompaniesTests(BaseAPITestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.company = CompanyFactory(dnb_get_company_responses=None)
+        services.save_dnb_get_company_response(self.company, {
+            'duns_number': self.company.duns_number,
+            'primary_name': 'Acme Widgets Limited',
+            'address_postcode': 'sw1a 1aa',
+            'registration_numbers': [
+                {'registration_type': 'uk_companies_house_number', 'registration_number': '01234567'}
+            ],
+        })
+        other = CompanyFactory(dnb_get_company_responses=None)
+        services.save_dnb_get_company_response(other, {'duns_number': other.duns_number, 'primary_name': 'Other'})
+
+    def assert_found(self, **params):
+        self.assertEqual(
+            services.search_local_companies(**params), [self.company.last_dnb_get_company_response], msg=params
+        )
+
+    def test_search_by_name_registration_number_or_postcode(self, *mocks):
+        self.assert_found(search_term='widgets')
+        self.assert_found(search_term='01234567')
+        self.assert_found(search_term='SW1A 1AA')
+        self.assert_found(primary_name='acme')
+        self.assert_found(registration_numbers=['01234567'])
+        self.assert_found(duns_number=self.company.duns_number)
+
+    def test_only_latest_dnb_response_is_searched(self, *mocks):
+        services.save_dnb_get_company_response(
+            self.company, {'duns_number': self.company.duns_number, 'primary_name': 'Renamed'}
+        )
+        self.assertEqual(services.search_local_companies(search_term='widgets'), [])
+        self.assertEqual(
+            services.search_local_companies(search_term='renamed'), [self.company.last_dnb_get_company_response]
+        )
@@ -1,10 +1,49 @@
-from uuid import uuid4
+import os
+import threading
+import time
+from uuid import UUID, uuid4
 
+from django.conf import settings
 from django.db import models
 
+# 74 bits of rand_a and rand_b follow the timestamp and version bits
+UUID7_COUNTER_BITS = 74
+
+_last_uuid7 = (0, 0)
+_uuid7_lock = threading.Lock()
+
+
+def uuid7():
+    """Time ordered uuid with the layout of UUIDv7, 48 bits of unix time in milliseconds followed by
+    random bits. New rows are appended to the end of the primary key index instead of anywhere in it.
+
+    Ids generated by a process in the same millisecond increment the random bits of the previous one as
+    a counter, so that they are ordered too and index pages are filled before being split. When the
+    counter overflows the timestamp is moved on a millisecond instead.
+    """
+    global _last_uuid7
+    timestamp = time.time_ns() // 1_000_000
+    counter = int.from_bytes(os.urandom(10), 'big') & ((1 << UUID7_COUNTER_BITS) - 1)
+    with _uuid7_lock:
+        last_timestamp, last_counter = _last_uuid7
+        if timestamp <= last_timestamp:
+            timestamp, counter = last_timestamp, last_counter + 1
+            if counter >> UUID7_COUNTER_BITS:
+                timestamp, counter = last_timestamp + 1, 0
+        _last_uuid7 = (timestamp, counter)
+    # Version 7 between rand_a (12 bits) and rand_b (62 bits), followed by the RFC 4122 variant bits
+    rand_a, rand_b = counter >> 62, counter & ((1 << 62) - 1)
+    return UUID(int=timestamp << 80 | 0x7 << 76 | rand_a << 64 | 0x2 << 62 | rand_b)
+
+
+def generate_id():
+    if settings.TIME_ORDERED_IDS:
+        return uuid7()
+    return uuid4()
+
 
 class BaseMetaModel(models.Model):
-    id = models.UUIDField(primary_key=True, default=uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=generate_id, editable=False)
     updated = models.DateTimeField(auto_now=True)
     created = models.DateTimeField(editable=False, auto_now_add=True)
 
@@ -0,0 +1,194 @@
+import contextvars
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from http.cookiejar import DefaultCookiePolicy
+from urllib.parse import urlparse
+
+import requests
+
+from web.core.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+_thread_sessions = threading.local()
+
+# Outbound calls made while handling the current request (None outside of a request)
+_outbound_calls = contextvars.ContextVar('outbound_calls', default=None)
+
+# uuids, integers and registration number like path segments (eg. 00000001, SC123456)
+ENDPOINT_ID_PATTERN = re.compile(
+    r'(?<=/)([0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}|\d+|[a-z]{1,2}\d{6,})(?=/|$)',
+    re.IGNORECASE
+)
+
+registry.describe('outbound_requests_total', 'Outbound HTTP requests by upstream, endpoint and status.')
+registry.describe('outbound_request_duration_seconds', 'Outbound HTTP request duration including retries.')
+registry.describe('outbound_request_retries_total', 'Retries taken by outbound HTTP requests.')
+registry.describe('outbound_response_bytes_total', 'Bytes received from outbound HTTP requests.')
+registry.describe(
+    'request_outbound_duration_seconds', 'Time spent waiting on each upstream per request, by view.'
+)
+
+
+def endpoint_template(url):
+    """Collapse identifiers in a url path so that calls to the same endpoint share metrics.
+
+    eg. /api/grant-applications/<uuid>/ -> /api/grant-applications/{id}/
+    """
+    return ENDPOINT_ID_PATTERN.sub('{id}', urlparse(url).path)
+
+
+class OutboundCall:
+
+    def __init__(self, upstream, method, url):
+        self.upstream = upstream
+        self.method = method.upper()
+        self.endpoint = endpoint_template(url)
+        self.response = None
+        self.error = None
+        self.duration = 0
+
+    def set_response(self, response, **kwargs):
+        # Only keep the first response, redirects re-use the hooks of the original request
+        if self.response is None:
+            self.response = response
+
+    @property
+    def status(self):
+        if self.response is not None:
+            return self.response.status_code
+        return getattr(self.error, 'status_code', None) or 'error'
+
+    @property
+    def retries(self):
+        if self.response is None:
+            return 0
+        retries = getattr(self.response.raw, 'retries', None)
+        return len(getattr(retries, 'history', None) or ())
+
+    @property
+    def bytes(self):
+        if self.response is None:
+            return 0
+        return len(self.response.content or b'')
+
+    def as_dict(self):
+        return {
+            'upstream': self.upstream,
+            'method': self.method,
+            'endpoint': self.endpoint,
+            'status': self.status,
+            'duration_ms': round(self.duration * 1000, 2),
+            'retries': self.retries,
+            'bytes': self.bytes,
+        }
+
+
+def _record(call):
+    calls = _outbound_calls.get()
+    if calls is not None:
+        calls.append(call)
+
+    data = call.as_dict()
+    labels = {'upstream': call.upstream, 'method': call.method, 'endpoint': call.endpoint}
+    registry.inc('outbound_requests_total', labels={**labels, 'status': data['status']})
+    registry.observe('outbound_request_duration_seconds', call.duration, labels=labels)
+    if data['retries']:
+        registry.inc('outbound_request_retries_total', labels=labels, value=data['retries'])
+    registry.inc('outbound_response_bytes_total', labels=labels, value=data['bytes'])
+
+    logger.debug(
+        f"OUTBOUND {call.upstream} {call.method} {call.endpoint} : {data['status']} : "
+        f"{data['duration_ms']}ms : retries={data['retries']} : bytes={data['bytes']}",
+        extra={'outbound_call': data}
+    )
+
+
+@contextmanager
+def record_outbound_call(upstream, method, url):
+    """Time an outbound call. Set `call.response` (or use `call.set_response` as a requests
+    response hook) so the status, retries and size of the response are recorded.
+    """
+    call = OutboundCall(upstream, method, url)
+    start = time.perf_counter()
+    try:
+        yield call
+    except Exception as e:
+        call.error = e
+        raise
+    finally:
+        call.duration = time.perf_counter() - start
+        _record(call)
+
+
+class InstrumentedSession(requests.Session):
+    """A requests session which records every call it sends against the given upstream.
+
+    Requests time out after `timeout` seconds unless a timeout is passed explicitly.
+    """
+
+    def __init__(self, upstream, timeout=None):
+        super().__init__()
+        self.upstream = upstream
+        self.timeout = timeout
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault('timeout', self.timeout)
+        return super().request(method, url, **kwargs)
+
+    def send(self, request, **kwargs):
+        with record_outbound_call(self.upstream, request.method, request.url) as call:
+            # Record the response before any other hook gets a chance to raise
+            request.hooks = {**request.hooks, 'response': [call.set_response] + request.hooks['response']}
+            return super().send(request, **kwargs)
+
+
+def get_thread_session(key, factory):
+    """This thread's session for `key`, created with `factory` on first use.
+
+    requests sessions are not thread safe, keeping one per thread lets every worker thread reuse its
+    pooled connections from one request to the next. Cookies are never stored as the session is
+    shared by every request the thread handles.
+    """
+    sessions = getattr(_thread_sessions, 'sessions', None)
+    if sessions is None:
+        sessions = _thread_sessions.sessions = {}
+    if key not in sessions:
+        session = factory()
+        session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        sessions[key] = session
+    return sessions[key]
+
+
+def start_recording():
+    return _outbound_calls.set([])
+
+
+def stop_recording(token):
+    calls = _outbound_calls.get()
+    _outbound_calls.reset(token)
+    return calls
+
+
+def summarise_calls(calls):
+    summary = OrderedDict()
+    for call in calls:
+        upstream = summary.setdefault(call.upstream, {'count': 0, 'duration': 0, 'retries': 0, 'bytes': 0})
+        upstream['count'] += 1
+        upstream['duration'] += call.duration
+        upstream['retries'] += call.retries
+        upstream['bytes'] += call.bytes
+    return summary
+
+
+def server_timing_header(calls, total_duration):
+    entries = [
+        f'{upstream};dur={s["duration"] * 1000:.1f};desc="{s["count"]} calls, {s["retries"]} retries"'
+        for upstream, s in summarise_calls(calls).items()
+    ]
+    entries.append(f'total;dur={total_duration * 1000:.1f}')
+    return ', '.join(entries)
@@ -0,0 +1,162 @@
+import atexit
+import json
+import logging
+import queue
+import random
+from logging.handlers import QueueHandler, QueueListener
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+
+from web.core.metrics import registry
+
+REDACTED = '[REDACTED]'
+
+# Attributes every LogRecord has, anything else was passed with `extra`
+RECORD_ATTRIBUTES = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+registry.describe('log_records_dropped_total', 'Log records dropped because the log queue was full.')
+
+
+def redact(data):
+    """Replace the values of settings.LOG_REDACTED_FIELDS anywhere in a json like structure."""
+    if isinstance(data, dict):
+        return {
+            k: REDACTED if k in settings.LOG_REDACTED_FIELDS and v not in (None, '') else redact(v)
+            for k, v in data.items()
+        }
+    if isinstance(data, list):
+        return [redact(v) for v in data]
+    return data
+
+
+def truncate(text, max_length=None):
+    max_length = max_length or settings.LOG_BODY_MAX_LENGTH
+    if len(text) <= max_length:
+        return text
+    return f'{text[:max_length]}... ({len(text) - max_length} characters truncated)'
+
+
+def format_body(body):
+    if not body:
+        return 'No content'
+    if isinstance(body, bytes):
+        try:
+            body = body.decode()
+        except UnicodeDecodeError:
+            return f'<{len(body)} bytes>'
+    try:
+        body = json.dumps(redact(json.loads(body)), cls=DjangoJSONEncoder)
+    except ValueError:
+        pass
+    return truncate(body)
+
+
+def format_url(url):
+    """url without credentials and with the values of its query string redacted, as they can hold search
+    terms, personal details or tokens."""
+    parts = urlsplit(url)
+    netloc = parts.netloc.rpartition('@')[2]
+    query = urlencode([(k, REDACTED) for k, _ in parse_qsl(parts.query, keep_blank_values=True)], safe='[]')
+    return urlunsplit((parts.scheme, netloc, parts.path, query, ''))
+
+
+class LogUrl:
+    """A url which is only redacted if the record is emitted, see format_url."""
+
+    def __init__(self, url):
+        self.url = url
+
+    def __str__(self):
+        return format_url(self.url)
+
+
+class LogBody:
+    """A request or response body which is only redacted and truncated if the record is emitted.
+
+    eg. logger.info('EXTERNAL %s : %s', LogUrl(request.url), LogBody(request.body))
+    """
+
+    def __init__(self, body):
+        self.body = body
+
+    def __str__(self):
+        return format_body(self.body)
+
+
+class JSONFormatter(logging.Formatter):
+    """One json object per record. Values passed with `extra` are included (and redacted)."""
+
+    def format(self, record):
+        data = {
+            'timestamp': self.formatTime(record),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        data.update(redact({
+            key: value for key, value in record.__dict__.items()
+            if key not in RECORD_ATTRIBUTES and not key.startswith('_')
+        }))
+        if record.exc_info:
+            data['exc_info'] = self.formatException(record.exc_info)
+        return json.dumps(data, cls=DjangoJSONEncoder, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """Keep a fraction of the INFO (and lower) records of high volume loggers.
+
+    `rates` maps logger names to the fraction of records kept, eg. {'web.core.instrumentation': 0.1}.
+    Warnings and errors are always kept.
+    """
+
+    def __init__(self, rates=None):
+        super().__init__()
+        self.rates = rates or {}
+
+    def _rate(self, name):
+        while name:
+            if name in self.rates:
+                return self.rates[name]
+            name = name.rpartition('.')[0]
+        return 1
+
+    def filter(self, record):
+        if record.levelno > logging.INFO:
+            return True
+        rate = self._rate(record.name)
+        return rate >= 1 or random.random() < rate
+
+
+class AsyncStreamHandler(QueueHandler):
+    """Write records to a stream from a background thread so that request threads never block on I/O.
+
+    Records are formatted by the caller, as QueueHandler.prepare does, so that arguments changed after
+    the call can't change what is written, only the write is left to the background thread. When the
+    queue is full records are dropped (and counted) rather than blocking the caller.
+    """
+
+    def __init__(self, stream=None, queue_size=10000):
+        super().__init__(queue.Queue(queue_size))
+        self.target = logging.StreamHandler(stream)
+        self.listener = QueueListener(self.queue, self.target)
+        self.listener.start()
+        self._listening = True
+        atexit.register(self.stop_listener)
+
+    def stop_listener(self):
+        # Writes out any records still queued
+        if self._listening:
+            self._listening = False
+            self.listener.stop()
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            registry.inc('log_records_dropped_total')
+
+    def close(self):
+        self.stop_listener()
+        super().close()
@@ -0,0 +1,51 @@
+import time
+from uuid import uuid4
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from psycopg2.extras import execute_values
+
+from web.core.abstract_models import uuid7
+
+
+class Command(BaseCommand):
+    help = "Compare insert throughput and primary key index size of random and time ordered uuids"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows",
+            help="Number of rows inserted for each kind of id",
+            type=int,
+            default=100000,
+        )
+        parser.add_argument(
+            "--batch-size",
+            help="Number of rows inserted per query",
+            dest="batch_size",
+            type=int,
+            default=1000,
+        )
+
+    def benchmark(self, cursor, name, generate_id, rows, batch_size):
+        table = f'benchmark_ids_{name}'
+        cursor.execute(f'CREATE TEMPORARY TABLE {table} (id uuid PRIMARY KEY, created timestamptz)')
+        started = time.perf_counter()
+        for offset in range(0, rows, batch_size):
+            execute_values(
+                cursor, f'INSERT INTO {table} (id, created) VALUES %s',
+                [(str(generate_id()), 'now') for _ in range(min(batch_size, rows - offset))],
+                page_size=batch_size
+            )
+        duration = time.perf_counter() - started
+        cursor.execute('SELECT pg_relation_size(%s)', [f'{table}_pkey'])
+        index_size = cursor.fetchone()[0]
+        self.stdout.write(
+            f"{name}: {rows / duration:.0f} rows/s, primary key index {index_size / 1024 / 1024:.1f} MB"
+        )
+
+    def handle(self, *args, **options):
+        # Temporary tables are dropped with the rolled back transaction
+        with transaction.atomic(), connection.cursor() as cursor:
+            for name, generate_id in [('uuid4', uuid4), ('uuid7', uuid7)]:
+                self.benchmark(cursor, name, generate_id, options['rows'], options['batch_size'])
+            transaction.set_rollback(True)
@@ -0,0 +1,121 @@
+import json
+import re
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from django.core.management.base import BaseCommand
+
+from web.core.external_api_responses import FAKE_DNB_SEARCH_COMPANIES
+
+NOTIFY_TEMPLATE_NAMES = [
+    'application-submitted', 'application-approved', 'application-rejected',
+    'application-resume', 'event-booking-evidence', 'event-evidence-upload-confirmation',
+    'event-booking-document-approved', 'event-booking-document-rejected',
+]
+
+
+class StubServicesRequestHandler(BaseHTTPRequestHandler):
+    """Local stand-ins for dnb-service, Companies House and GOV.UK Notify.
+
+    dnb-service and Companies House are served under their own path prefix so that a single process
+    can stand in for all three, eg. DNB_SERVICE_URL=http://localhost:8002/dnb/
+    The Notify client joins absolute paths onto its base url, so Notify is served from the root.
+    """
+    latency = 0
+    routes = [
+        ('POST', r'^/dnb/companies/search/$', 'dnb_search_companies'),
+        ('GET', r'^/companies-house/search/companies/$', 'ch_search_companies'),
+        ('GET', r'^/companies-house/company/(?P<number>[^/]+)/$', 'ch_get_company'),
+        ('GET', r'^/companies-house/company/(?P<number>[^/]+)/filing-history/$', 'ch_filing_history'),
+        ('GET', r'^/v2/templates$', 'notify_templates'),
+        ('POST', r'^/v2/template/(?P<template_id>[^/]+)/preview$', 'notify_preview'),
+        ('POST', r'^/v2/notifications/email$', 'notify_send_email'),
+    ]
+
+    def _read_json(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        return json.loads(self.rfile.read(length) or b'{}')
+
+    def _send_json(self, data, status=200):
+        body = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _dispatch(self, method):
+        path = self.path.split('?')[0]
+        for route_method, pattern, handler_name in self.routes:
+            match = re.match(pattern, path)
+            if route_method == method and match:
+                time.sleep(self.latency)
+                return self._send_json(*getattr(self, handler_name)(**match.groupdict()))
+        return self._send_json({'detail': 'Not found.'}, status=404)
+
+    def do_GET(self):
+        self._dispatch('GET')
+
+    def do_POST(self):
+        self._dispatch('POST')
+
+    def log_message(self, format, *args):
+        # Keep benchmark output readable
+        pass
+
+    def dnb_search_companies(self):
+        params = self._read_json()
+        results = FAKE_DNB_SEARCH_COMPANIES['results']
+        if params.get('duns_number'):
+            results = [r for r in results if r['duns_number'] == params['duns_number']]
+        return {**FAKE_DNB_SEARCH_COMPANIES, 'results': results}, 200
+
+    def ch_search_companies(self):
+        return {'items': []}, 200
+
+    def ch_get_company(self, number):
+        return {'company_number': number}, 200
+
+    def ch_filing_history(self, number):
+        return {'items': []}, 200
+
+    def notify_templates(self):
+        return {'templates': [{'id': str(i), 'name': n} for i, n in enumerate(NOTIFY_TEMPLATE_NAMES)]}, 200
+
+    def notify_preview(self, template_id):
+        return {'id': template_id, 'type': 'email', 'subject': 'Subject', 'body': 'Body'}, 200
+
+    def notify_send_email(self):
+        return {'id': str(uuid.uuid4())}, 201
+
+
+class Command(BaseCommand):
+    help = "Run local stand-ins for dnb-service, Companies House and Notify (for benchmarking)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', default='127.0.0.1')
+        parser.add_argument('--port', type=int, default=8002)
+        parser.add_argument(
+            '--latency-ms',
+            help='Artificial latency added to every stub response',
+            type=int,
+            default=0
+        )
+
+    def handle(self, *args, **options):
+        StubServicesRequestHandler.latency = options['latency_ms'] / 1000
+        server = ThreadingHTTPServer((options['host'], options['port']), StubServicesRequestHandler)
+        base_url = f"http://{options['host']}:{options['port']}"
+        self.stdout.write(self.style.SUCCESS(
+            f"Stub services running on {base_url}. Point the backoffice at them with:\n"
+            f"  DNB_SERVICE_URL={base_url}/dnb/\n"
+            f"  COMPANIES_HOUSE_URL={base_url}/companies-house/\n"
+            f"  NOTIFY_API_URL={base_url}"
+        ))
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
@@ -0,0 +1,89 @@
+import threading
+from collections import defaultdict
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+
+def _escape_label_value(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    label_pairs = ','.join(f'{k}="{_escape_label_value(v)}"' for k, v in labels)
+    return f'{{{label_pairs}}}'
+
+
+class MetricsRegistry:
+    """In-process counters and histograms rendered in the Prometheus text exposition format.
+
+    Values are held per process, so each worker exposes its own series.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._help = {}
+        self._counters = defaultdict(float)
+        self._histograms = {}
+
+    def describe(self, name, help_text):
+        self._help[name] = help_text
+
+    def inc(self, name, labels=None, value=1):
+        key = (name, tuple(sorted((labels or {}).items())))
+        with self._lock:
+            self._counters[key] += value
+
+    def observe(self, name, value, labels=None):
+        key = (name, tuple(sorted((labels or {}).items())))
+        with self._lock:
+            histogram = self._histograms.setdefault(
+                key, {'buckets': [0] * len(self.buckets), 'sum': 0.0, 'count': 0}
+            )
+            for i, upper_bound in enumerate(self.buckets):
+                if value <= upper_bound:
+                    histogram['buckets'][i] += 1
+            histogram['sum'] += value
+            histogram['count'] += 1
+
+    def clear(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def render(self):
+        with self._lock:
+            counters = sorted(self._counters.items())
+            histograms = sorted(
+                (key, {**h, 'buckets': list(h['buckets'])}) for key, h in self._histograms.items()
+            )
+
+        lines = []
+        described = set()
+
+        def write_header(name, metric_type):
+            if name not in described:
+                described.add(name)
+                if name in self._help:
+                    lines.append(f'# HELP {name} {self._help[name]}')
+                lines.append(f'# TYPE {name} {metric_type}')
+
+        for (name, labels), value in counters:
+            write_header(name, 'counter')
+            lines.append(f'{name}{_format_labels(labels)} {value:g}')
+
+        for (name, labels), histogram in histograms:
+            write_header(name, 'histogram')
+            for upper_bound, count in zip(self.buckets, histogram['buckets']):
+                bucket_labels = labels + (('le', f'{upper_bound:g}'),)
+                lines.append(f'{name}_bucket{_format_labels(bucket_labels)} {count}')
+            lines.append(f'{name}_bucket{_format_labels(labels + (("le", "+Inf"),))} {histogram["count"]}')
+            lines.append(f'{name}_sum{_format_labels(labels)} {histogram["sum"]:g}')
+            lines.append(f'{name}_count{_format_labels(labels)} {histogram["count"]}')
+
+        return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
@@ -4,14 +4,27 @@ import requests
 from django.conf import settings
 from notifications_python_client import NotificationsAPIClient
 
+from web.core.instrumentation import record_outbound_call
+from web.core.logs import LogBody
+
 logger = logging.getLogger(__name__)
 
 
+class InstrumentedNotificationsAPIClient(NotificationsAPIClient):
+
+    def _perform_request(self, method, url, kwargs):
+        with record_outbound_call('notify', method, url) as call:
+            call.response = super()._perform_request(method, url, kwargs)
+            return call.response
+
+
 class NotifyService:
 
     def __init__(self, api_client=None):
         self._templates = None
-        self.api_client = api_client or NotificationsAPIClient(api_key=settings.NOTIFY_API_KEY)
+        self.api_client = api_client or InstrumentedNotificationsAPIClient(
+            api_key=settings.NOTIFY_API_KEY, base_url=settings.NOTIFY_API_URL
+        )
 
     @property
     def templates(self):
@@ -25,10 +38,8 @@ class NotifyService:
             template_id=template_id,
             personalisation=personalisation
         )
-        logging.info(
-            f"Sent {preview['type']}\ntemplate_id: {preview['id']}\n"
-            f"subject: {preview['subject']}\nbody: {preview['body']}"
-        )
+        logger.info('Sent %s : template_id: %s : subject: %s', preview['type'], preview['id'], preview['subject'])
+        logger.debug('body: %s', LogBody(preview['body']))
         return preview
 
     def send_email(self, email_address, template_name, personalisation):
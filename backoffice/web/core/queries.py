@@ -0,0 +1,35 @@
+import time
+from fnmatch import fnmatchcase
+
+from django.conf import settings
+
+
+class QueryCounter:
+    """Database execute wrapper counting the queries run and the time spent running them."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+
+
+def get_query_budget(view_name):
+    """The maximum number of queries a view may run, from settings.QUERY_BUDGETS.
+
+    Budgets are keyed by url name (eg. 'grant-applications:grant-applications-detail') and keys may be
+    shell-style patterns (eg. 'viewflow:grant_management:grantmanagement:*').
+    """
+    budgets = settings.QUERY_BUDGETS
+    if view_name in budgets:
+        return budgets[view_name]
+    for pattern, budget in budgets.items():
+        if view_name and fnmatchcase(view_name, pattern):
+            return budget
+    return settings.QUERY_BUDGET_DEFAULT
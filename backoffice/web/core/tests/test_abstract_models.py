@@ -0,0 +1,43 @@
+import time
+from unittest.mock import patch
+from uuid import RFC_4122, UUID
+
+from django.test import override_settings
+
+from web.core.abstract_models import UUID7_COUNTER_BITS, generate_id, uuid7
+from web.tests.factories.grant_applications import GrantApplicationFactory
+from web.tests.helpers import BaseTestCase
+
+
+class TestGenerateId(BaseTestCase):
+
+    def test_uuid7_layout(self):
+        value = uuid7()
+        self.assertEqual(value.version, 7)
+        self.assertEqual(value.variant, UUID('00000000-0000-4000-8000-000000000000').variant)
+
+    def test_uuid7_is_time_ordered(self):
+        values = [uuid7() for _ in range(1000)]
+        self.assertEqual(values, sorted(values))
+        self.assertEqual(len(set(values)), 1000)
+
+    def test_uuid7_counter_overflow_moves_timestamp_on(self):
+        timestamp = time.time_ns() // 1_000_000
+        with patch('web.core.abstract_models._last_uuid7', (timestamp, (1 << UUID7_COUNTER_BITS) - 1)), \
+                patch('time.time_ns', return_value=timestamp * 1_000_000):
+            previous = uuid7()
+            value = uuid7()
+        self.assertEqual(previous.int >> 80, timestamp + 1)
+        self.assertEqual(value.int >> 80, timestamp + 1)
+        self.assertLess(previous, value)
+        for uuid in [previous, value]:
+            self.assertEqual(uuid.version, 7)
+            self.assertEqual(uuid.variant, RFC_4122)
+
+    def test_uuid4_by_default(self):
+        self.assertEqual(generate_id().version, 4)
+
+    @override_settings(TIME_ORDERED_IDS=True)
+    def test_time_ordered_ids(self):
+        self.assertEqual(generate_id().version, 7)
+        self.assertEqual(GrantApplicationFactory().id.version, 7)
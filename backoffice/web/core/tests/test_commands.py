@@ -0,0 +1,14 @@
+from io import StringIO
+
+from django.core.management import call_command
+
+from web.tests.helpers import BaseTestCase
+
+
+class TestBenchmarkIdsCommand(BaseTestCase):
+
+    def test_benchmark(self):
+        out = StringIO()
+        call_command('benchmark_ids', rows=10, batch_size=3, stdout=out)
+        self.assertRegex(out.getvalue(), r'uuid4: \d+ rows/s, primary key index [\d.]+ MB')
+        self.assertRegex(out.getvalue(), r'uuid7: \d+ rows/s, primary key index [\d.]+ MB')
@@ -0,0 +1,53 @@
+from unittest.mock import patch
+
+import httpretty
+import requests
+from django.test import override_settings
+from django.urls import reverse
+from notifications_python_client import NotificationsAPIClient
+from notifications_python_client.errors import HTTPError
+
+from web.companies.services import DnbServiceClient
+from web.core.instrumentation import start_recording, stop_recording
+from web.core.metrics import registry
+from web.core.notify import InstrumentedNotificationsAPIClient
+from web.tests.helpers import BaseTestCase
+
+
+class TestOutboundCallInstrumentation(BaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        registry.clear()
+
+    @httpretty.activate
+    def test_dnb_service_calls_are_recorded(self):
+        dnb_client = DnbServiceClient()
+        httpretty.register_uri(httpretty.POST, dnb_client.company_url, status=200, body='{"results": []}')
+        token = start_recording()
+        dnb_client.search_companies(search_term='test')
+        calls = stop_recording(token)
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(calls[0].upstream, 'dnb-service')
+        self.assertEqual(calls[0].endpoint, '/companies/search/')
+        self.assertEqual(calls[0].status, 200)
+
+    @patch.object(NotificationsAPIClient, '_perform_request', side_effect=HTTPError.create(requests.ConnectionError()))
+    def test_notify_errors_are_recorded(self, *mocks):
+        api_client = InstrumentedNotificationsAPIClient(api_key='test-' + 'a' * 36 + '-' + 'b' * 36)
+        token = start_recording()
+        self.assertRaises(HTTPError, api_client.get_all_templates)
+        calls = stop_recording(token)
+
+        self.assertEqual(calls[0].upstream, 'notify')
+        self.assertEqual(calls[0].endpoint, '/v2/templates')
+        self.assertEqual(calls[0].status, 503)
+
+    @override_settings(METRICS_TOKEN='a-token')
+    def test_metrics_view(self):
+        registry.inc('outbound_requests_total', labels={'upstream': 'notify'})
+        response = self.client.get(reverse('metrics'), HTTP_AUTHORIZATION='Bearer a-token')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('outbound_requests_total{upstream="notify"} 1', response.content.decode())
+        self.assertIn('Server-Timing', response)
@@ -0,0 +1,69 @@
+import threading
+import time
+
+from django.http import HttpResponse
+from django.test import RequestFactory, override_settings
+
+from web.core.metrics import registry
+from web.core.middleware import LoadSheddingMiddleware
+from web.tests.helpers import BaseTestCase
+
+
+@override_settings(LOAD_SHEDDING_MAX_IN_FLIGHT=1, LOAD_SHEDDING_MAX_QUEUE_TIME=2, LOAD_SHEDDING_RETRY_AFTER=5)
+class TestLoadSheddingMiddleware(BaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        registry.clear()
+        self.factory = RequestFactory()
+        self.middleware = LoadSheddingMiddleware(lambda request: HttpResponse('ok'))
+
+    def test_request_is_handled(self):
+        response = self.middleware(self.factory.get('/'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.middleware.in_flight, 0)
+
+    def test_request_is_shed_when_too_many_in_flight(self):
+        started, release = threading.Event(), threading.Event()
+
+        def slow_view(request):
+            started.set()
+            release.wait(timeout=1)
+            return HttpResponse('ok')
+
+        middleware = LoadSheddingMiddleware(slow_view)
+        thread = threading.Thread(target=middleware, args=(self.factory.get('/'),))
+        thread.start()
+        started.wait(timeout=1)
+        response = middleware(self.factory.get('/'))
+        release.set()
+        thread.join()
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response['Retry-After'], '5')
+        self.assertIn('requests_shed_total{reason="in_flight"} 1', registry.render())
+        self.assertEqual(middleware.in_flight, 0)
+
+    def test_request_is_shed_when_queued_too_long(self):
+        for header in [f't={time.time() - 3}', str(int((time.time() - 3) * 1000))]:
+            response = self.middleware(self.factory.get('/', HTTP_X_REQUEST_START=header))
+            self.assertEqual(response.status_code, 503)
+        self.assertIn('requests_shed_total{reason="queue_time"} 2', registry.render())
+
+    def test_request_queued_briefly_is_handled(self):
+        response = self.middleware(self.factory.get('/', HTTP_X_REQUEST_START=str(int(time.time() * 1000000))))
+        self.assertEqual(response.status_code, 200)
+
+    def test_invalid_request_start_header_is_ignored(self):
+        response = self.middleware(self.factory.get('/', HTTP_X_REQUEST_START='invalid'))
+        self.assertEqual(response.status_code, 200)
+
+    @override_settings(LOAD_SHEDDING_MAX_IN_FLIGHT=0, LOAD_SHEDDING_MAX_QUEUE_TIME=0)
+    def test_disabled(self):
+        self.middleware.in_flight = 100
+        response = self.middleware(self.factory.get('/', HTTP_X_REQUEST_START=f't={time.time() - 3}'))
+        self.assertEqual(response.status_code, 200)
+
+    def test_exempt_paths_are_not_shed(self):
+        response = self.middleware(self.factory.get('/metrics/', HTTP_X_REQUEST_START=f't={time.time() - 3}'))
+        self.assertEqual(response.status_code, 200)
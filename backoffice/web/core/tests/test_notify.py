@@ -46,6 +46,22 @@ class TestNotifyEmail(TestNotifyMixin, BaseTestCase):
         self.assertFalse(self.notifications_api_client.send_email_notification.called)
         self.assertTrue(self.notifications_api_client.post_template_preview.called)
 
+    @override_settings(NOTIFY_ENABLED=False)
+    def test_preview_body_is_not_logged_at_info(self):
+        self.notifications_api_client.post_template_preview.return_value = {
+            'type': 'email', 'id': 1, 'subject': 'Your application', 'body': 'Hello Test User'
+        }
+        log_capture = LogCapture('web.core.notify', level=logging.INFO)
+        self.notify_client.send_email(
+            email_address='test@test.com',
+            template_name='application-submitted',
+            personalisation={'applicant_full_name': 'Test User'}
+        )
+        log_capture.uninstall()
+        log_capture.check(
+            ('web.core.notify', 'INFO', 'Sent email : template_id: 1 : subject: Your application'),
+        )
+
     @override_settings(NOTIFY_ENABLED=True)
     def test_log_and_continue_on_notify_exception(self):
         log_capture = LogCapture(level=logging.ERROR)
@@ -0,0 +1,51 @@
+import tempfile
+from unittest.mock import patch
+
+from django.conf import settings
+from django.test import override_settings
+from django.urls import reverse
+
+from web.core.notify import NotifyService
+from web.core.profiling import list_profiles
+from web.tests.factories.grant_applications import CompletedGrantApplicationFactory
+from web.tests.factories.users import UserFactory
+from web.tests.helpers import BaseTestCase
+
+
+@patch.object(NotifyService, 'send_email')
+class TestProfiling(BaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.profiling_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.profiling_dir.cleanup)
+        settings_override = override_settings(
+            PROFILING_ENABLED=True,
+            PROFILING_ROUTES=['grant-applications:grant-applications-pdf'],
+            PROFILING_DIR=self.profiling_dir.name,
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def test_route_is_profiled(self, *mocks):
+        ga = CompletedGrantApplicationFactory()
+        ga.send_for_review()
+        response = self.client.get(reverse('grant-applications:grant-applications-pdf', args=(ga.id,)))
+        name = response['X-Profile-Name']
+        self.assertEqual(list_profiles(), [name])
+
+        self.client.force_login(UserFactory(is_staff=True))
+        response = self.client.get(
+            reverse('profile-detail', args=(name,)),
+            {'filter': settings.PROFILING_HOT_PATHS['GrantApplicationPdf.generate']}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertRegex(response.content.decode(), r'grant_applications/services\.py:\d+\(generate\)')
+
+        response = self.client.get(reverse('profile-detail', args=(name,)), {'filter': '(unclosed'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_other_routes_are_not_profiled(self, *mocks):
+        response = self.client.get(reverse('sectors:sectors-list'))
+        self.assertNotIn('X-Profile-Name', response)
+        self.assertEqual(list_profiles(), [])
@@ -0,0 +1,194 @@
+import logging
+from unittest.mock import patch
+
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.status import HTTP_200_OK, HTTP_201_CREATED
+from testfixtures import LogCapture
+
+from web.companies.services import DnbServiceClient
+from web.core.notify import NotifyService
+from web.core.queries import get_query_budget
+from web.grant_management.tests.helpers import GrantManagementFlowTestHelper
+from web.tests.factories.companies import DnbGetCompanyResponseFactory
+from web.tests.factories.events import EventFactory
+from web.tests.factories.grant_applications import CompletedGrantApplicationFactory
+from web.tests.factories.sector import SectorFactory
+from web.tests.factories.users import UserFactory
+from web.tests.helpers import BaseAPITestCase, BaseTestCase
+
+
+class TestQueryBudgetMiddleware(BaseTestCase):
+
+    @override_settings(QUERY_BUDGETS={'sectors:*': 0})
+    def test_request_over_budget_is_flagged(self):
+        SectorFactory()
+        with LogCapture(level=logging.WARNING) as log_capture:
+            response = self.client.get(reverse('sectors:sectors-list'))
+        self.assertEqual(response['X-Query-Budget-Exceeded'], '1/0')
+        log_capture.check_present(
+            (
+                'web.core.middleware',
+                'WARNING',
+                'Query budget exceeded : GET /api/sectors/ (sectors:sectors-list) : 1 queries, budget 0'
+            )
+        )
+
+    def test_request_within_budget_is_not_flagged(self):
+        response = self.client.get(reverse('sectors:sectors-list'))
+        self.assertNotIn('X-Query-Budget-Exceeded', response)
+        self.assertRegex(response['Server-Timing'], r'^db;dur=[\d.]+;desc="1 queries", total;dur=')
+
+    @override_settings(
+        QUERY_BUDGETS={'companies:companies-list': 1, 'companies:*': 2}, QUERY_BUDGET_DEFAULT=3
+    )
+    def test_get_query_budget(self):
+        self.assertEqual(get_query_budget('companies:companies-list'), 1)
+        self.assertEqual(get_query_budget('companies:companies-detail'), 2)
+        self.assertEqual(get_query_budget('sectors:sectors-list'), 3)
+
+
+@patch.object(DnbServiceClient, 'get_company', return_value=None)
+@patch.object(NotifyService, 'send_email')
+class TestApiQueryBudgets(BaseAPITestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.gas = CompletedGrantApplicationFactory.create_batch(size=3)
+        self.ga = self.gas[0]
+
+    def test_grant_applications_list(self, *mocks):
+        with self.assert_within_query_budget('grant-applications:grant-applications-list'):
+            response = self.client.get(reverse('grant-applications:grant-applications-list'))
+        self.assertEqual(response.status_code, HTTP_200_OK)
+
+    def test_grant_applications_create(self, *mocks):
+        with self.assert_within_query_budget('grant-applications:grant-applications-list'):
+            response = self.client.post(
+                reverse('grant-applications:grant-applications-list'), {'search_term': 'company'}
+            )
+        self.assertEqual(response.status_code, HTTP_201_CREATED)
+
+    def test_grant_applications_detail(self, *mocks):
+        with self.assert_within_query_budget('grant-applications:grant-applications-detail'):
+            response = self.client.get(
+                reverse('grant-applications:grant-applications-detail', args=(self.ga.id,))
+            )
+        self.assertEqual(response.status_code, HTTP_200_OK)
+
+    def test_grant_applications_partial_update(self, *mocks):
+        event = EventFactory()
+        with self.assert_within_query_budget('grant-applications:grant-applications-detail'):
+            response = self.client.patch(
+                reverse('grant-applications:grant-applications-detail', args=(self.ga.id,)),
+                {'event': event.id_str}
+            )
+        self.assertEqual(response.status_code, HTTP_200_OK)
+
+    def test_grant_applications_send_for_review(self, *mocks):
+        with self.assert_within_query_budget('grant-applications:grant-applications-send-for-review'):
+            response = self.client.post(
+                reverse('grant-applications:grant-applications-send-for-review', args=(self.ga.id,)),
+                {'application_summary': []}
+            )
+        self.assertEqual(response.status_code, HTTP_200_OK)
+
+    def test_grant_applications_pdf(self, *mocks):
+        self.ga.send_for_review()
+        with self.assert_within_query_budget('grant-applications:grant-applications-pdf'):
+            response = self.client.get(
+                reverse('grant-applications:grant-applications-pdf', args=(self.ga.id,))
+            )
+        self.assertEqual(response.status_code, HTTP_200_OK)
+
+    def test_state_aid_list(self, *mocks):
+        with self.assert_within_query_budget('grant-applications:state-aid-list'):
+            response = self.client.get(
+                reverse('grant-applications:state-aid-list'), {'grant_application': self.ga.id}
+            )
+        self.assertEqual(response.status_code, HTTP_200_OK)
+
+    def test_companies_list(self, *mocks):
+        for ga in self.gas:
+            DnbGetCompanyResponseFactory.create_batch(size=5, company=ga.company)
+        with self.assert_within_query_budget('companies:companies-list'):
+            response = self.client.get(reverse('companies:companies-list'))
+        self.assertEqual(response.status_code, HTTP_200_OK)
+
+    def test_companies_detail(self, *mocks):
+        DnbGetCompanyResponseFactory.create_batch(size=5, company=self.ga.company)
+        with self.assert_within_query_budget('companies:companies-detail'):
+            response = self.client.get(reverse('companies:companies-detail', args=(self.ga.company.id,)))
+        self.assertEqual(response.status_code, HTTP_200_OK)
+
+    def test_trade_events_list(self, *mocks):
+        with self.assert_within_query_budget('trade-events:trade-events-list'):
+            response = self.client.get(reverse('trade-events:trade-events-list'), {'page': 1})
+        self.assertEqual(response.status_code, HTTP_200_OK)
+
+    def test_sectors_list(self, *mocks):
+        with self.assert_within_query_budget('sectors:sectors-list'):
+            response = self.client.get(reverse('sectors:sectors-list'))
+        self.assertEqual(response.status_code, HTTP_200_OK)
+
+
+class TestGrantManagementQueryBudgets(GrantManagementFlowTestHelper, BaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        for patcher in [
+            patch.object(DnbServiceClient, 'get_company', return_value=None),
+            patch.object(NotifyService, 'send_email'),
+        ]:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        self.user = UserFactory(is_superuser=True)
+        self.client.force_login(self.user)
+        for ga in CompletedGrantApplicationFactory.create_batch(size=3):
+            self.ga = ga
+            self.process = self._start_process_and_step_through_until('verify_event_commitment')
+
+    def test_process_list(self):
+        view_name = 'viewflow:grant_management:grantmanagement:index'
+        with self.assert_within_query_budget(view_name):
+            response = self.client.get(reverse(view_name))
+        self.assertEqual(response.status_code, HTTP_200_OK)
+
+    def test_process_detail(self):
+        view_name = 'viewflow:grant_management:grantmanagement:detail'
+        with self.assert_within_query_budget(view_name):
+            response = self.client.get(reverse(view_name, kwargs={'process_pk': self.process.pk}))
+        self.assertEqual(response.status_code, HTTP_200_OK)
+
+    def test_task_view(self):
+        _, task = self._assign_task(self.process, self.process.active_tasks().first())
+        view_name = 'viewflow:grant_management:grantmanagement:verify_event_commitment'
+        with self.assert_within_query_budget(view_name):
+            response = self.client.get(
+                reverse(view_name, kwargs={'process_pk': self.process.pk, 'task_pk': task.pk})
+            )
+        self.assertEqual(response.status_code, HTTP_200_OK)
+
+    def _count_queries(self, view_name):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(reverse(view_name))
+        self.assertEqual(response.status_code, HTTP_200_OK)
+        return len(context)
+
+    def _add_processes(self, size):
+        for ga in CompletedGrantApplicationFactory.create_batch(size=size):
+            self.ga = ga
+            self._start_process_and_step_through_until('verify_event_commitment')
+
+    def test_list_queries_do_not_grow_with_rows(self):
+        view_names = [
+            'viewflow:grant_management:grantmanagement:index', 'viewflow:index', 'viewflow:queue',
+            'viewflow:archive'
+        ]
+        queries = {view_name: self._count_queries(view_name) for view_name in view_names}
+        self._add_processes(size=3)
+        for view_name in view_names:
+            self.assertEqual(self._count_queries(view_name), queries[view_name], msg=view_name)
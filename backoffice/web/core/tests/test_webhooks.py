@@ -0,0 +1,32 @@
+import hashlib
+import hmac
+import json
+from unittest.mock import patch
+
+import requests
+from django.test import override_settings
+
+from web.core.instrumentation import InstrumentedSession
+from web.core.webhooks import ChangeEventsClient, sign
+from web.tests.helpers import BaseTestCase
+
+
+@override_settings(CHANGE_EVENTS_WEBHOOK_URL='http://frontend/change-events/', CHANGE_EVENTS_SECRET='a-secret')
+class TestChangeEventsClient(BaseTestCase):
+
+    def test_sign(self):
+        expected = hmac.new(b'a-secret', b'{}', hashlib.sha256).hexdigest()
+        self.assertEqual(sign(b'{}', 'a-secret'), f'sha256={expected}')
+
+    @patch.object(InstrumentedSession, 'post')
+    def test_send_posts_signed_changes(self, post):
+        changes = [{'grant_application': 'an-id', 'version': 2, 'changed_fields': ['is_completed']}]
+        self.assertTrue(ChangeEventsClient().send(changes))
+        body = post.call_args.kwargs['data']
+        self.assertEqual(post.call_args.args, ('http://frontend/change-events/',))
+        self.assertEqual(json.loads(body), {'changes': changes})
+        self.assertEqual(post.call_args.kwargs['headers']['X-Signature'], sign(body, 'a-secret'))
+
+    @patch.object(InstrumentedSession, 'post', side_effect=requests.exceptions.ConnectionError)
+    def test_send_returns_false_on_error(self, *mocks):
+        self.assertFalse(ChangeEventsClient().send([]))
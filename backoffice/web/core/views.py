@@ -1,8 +1,19 @@
-from django.http import HttpResponseRedirect
+import re
+
+from django.conf import settings
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import (
+    FileResponse, Http404, HttpResponse, HttpResponseBadRequest, HttpResponseForbidden, HttpResponseRedirect
+)
+from django.shortcuts import render
 from django.urls import reverse
+from django.utils.crypto import constant_time_compare
 from django.views.generic import TemplateView
 from rest_framework.pagination import PageNumberPagination
 
+from web.core.metrics import registry
+from web.core.profiling import get_profile_path, list_profiles, render_profile
+
 
 class IndexView(TemplateView):
     template_name = 'index.html'
@@ -25,3 +36,45 @@ class TAPPageNumberPagination(PageNumberPagination):
         response = super().get_paginated_response(data)
         response.data['total_pages'] = self.page.paginator.num_pages
         return response
+
+
+def metrics(request):
+    """Prometheus scrape endpoint. Only served when DEBUG is on or a METRICS_TOKEN is configured."""
+    if not (settings.DEBUG or settings.METRICS_TOKEN):
+        raise Http404
+    if settings.METRICS_TOKEN and not constant_time_compare(
+        request.headers.get('Authorization', ''), f'Bearer {settings.METRICS_TOKEN}'
+    ):
+        return HttpResponseForbidden()
+    return HttpResponse(registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+@staff_member_required
+def profile_list(request):
+    return render(request, 'profiling.html', {
+        'profiles': list_profiles(),
+        'hot_paths': settings.PROFILING_HOT_PATHS,
+        'profiling_enabled': settings.PROFILING_ENABLED,
+    })
+
+
+@staff_member_required
+def profile_detail(request, name):
+    path = get_profile_path(name)
+    if path is None:
+        raise Http404
+
+    if 'download' in request.GET:
+        return FileResponse(open(path, 'rb'), as_attachment=True, filename=name)
+
+    sort = request.GET.get('sort', 'cumulative')
+    if sort not in ['cumulative', 'tottime', 'calls']:
+        return HttpResponseBadRequest(f'Cannot sort by {sort}')
+    restriction = request.GET.get('filter')
+    if restriction:
+        try:
+            re.compile(restriction)
+        except re.error as e:
+            return HttpResponseBadRequest(f'Invalid filter: {e}')
+    content = render_profile(path, sort=sort, restriction=restriction)
+    return HttpResponse(content, content_type='text/plain; charset=utf-8')
@@ -0,0 +1,47 @@
+import hashlib
+import hmac
+import json
+import logging
+
+import requests
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+
+from web.core.instrumentation import InstrumentedSession, get_thread_session
+
+logger = logging.getLogger(__name__)
+
+
+def sign(body, secret):
+    return 'sha256=' + hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+
+
+class ChangeEventsClient:
+    """Posts batches of grant application change events to the frontend."""
+
+    def __init__(self):
+        self.url = settings.CHANGE_EVENTS_WEBHOOK_URL
+        self.session = get_thread_session(('change-events', self.url), self._create_session)
+
+    @staticmethod
+    def _create_session():
+        # No retries, undelivered events are sent again by the deliver_grant_application_changes command
+        return InstrumentedSession(upstream='frontend', timeout=settings.CHANGE_EVENTS_TIMEOUT)
+
+    def send(self, changes):
+        """Return True if the frontend accepted the changes."""
+        body = json.dumps({'changes': changes}, cls=DjangoJSONEncoder).encode()
+        try:
+            response = self.session.post(
+                self.url,
+                data=body,
+                headers={
+                    'Content-Type': 'application/json',
+                    'X-Signature': sign(body, settings.CHANGE_EVENTS_SECRET),
+                }
+            )
+            response.raise_for_status()
+        except requests.exceptions.RequestException as e:
+            logger.warning(f'Could not deliver {len(changes)} change events : {e}')
+            return False
+        return True
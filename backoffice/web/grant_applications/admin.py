@@ -6,6 +6,11 @@ from web.grant_applications.models import GrantApplication
 @admin.register(GrantApplication)
 class GrantApplicationAdmin(admin.ModelAdmin):
     fields = [field.name for field in GrantApplication._meta.get_fields() if not field.is_relation]
-    readonly_fields = ['id', 'created', 'updated']
-    list_display = ['id', 'company', 'created', 'updated']
-    search_fields = ('id', 'applicant_email')
+    readonly_fields = ['id', 'created', 'updated', 'company_display_name', 'version']
+    list_display = ['id', 'company_display_name', 'created', 'updated']
+    search_fields = ('id', 'applicant_email', 'company_display_name')
+
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        if change and form.changed_data:
+            obj.publish_change(*form.changed_data)
@@ -1,22 +1,66 @@
 from django.http import FileResponse
+from django_filters.rest_framework import (
+    BooleanFilter, ChoiceFilter, DjangoFilterBackend, FilterSet, IsoDateTimeFromToRangeFilter, NumberFilter
+)
 from rest_framework.decorators import action
+from rest_framework.filters import OrderingFilter, SearchFilter
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.viewsets import ModelViewSet
+from viewflow.activation import STATUS_CHOICES
 
 from web.grant_applications.models import GrantApplication, StateAid
 from web.grant_applications.serializers import (
     GrantApplicationReadSerializer, GrantApplicationWriteSerializer, StateAidSerializer,
-    SendForReviewWriteSerializer, SendApplicationMagicLinkSerializer
+    SendForReviewWriteSerializer, SendApplicationMagicLinkSerializer, SelectCompanySerializer
 )
+from web.companies.services import save_dnb_company_snapshot
 from web.core.notify import NotifyService
 from web.grant_applications.services import GrantApplicationPdf
 from web.grant_management.flows import GrantManagementFlow
+from web.grant_management.models import GrantManagementProcess
+
+
+class GrantApplicationsFilterSet(FilterSet):
+    # ?created_after=...&created_before=... and ?updated_after=...&updated_before=...
+    created = IsoDateTimeFromToRangeFilter()
+    updated = IsoDateTimeFromToRangeFilter()
+    decision = ChoiceFilter(
+        field_name='grant_management_process__decision', choices=GrantManagementProcess.Decision.choices
+    )
+    status = ChoiceFilter(field_name='grant_management_process__status', choices=STATUS_CHOICES)
+    # Filter on the annotations of GrantApplicationQuerySet.with_status
+    is_eligible = BooleanFilter(field_name='eligible')
+    sent_for_review = BooleanFilter(field_name='submitted')
+    is_completed = BooleanFilter(field_name='completed')
+    in_review = BooleanFilter(field_name='in_review')
+    min_total_verified = NumberFilter(field_name='total_verified', lookup_expr='gte')
+    min_suitability_score = NumberFilter(field_name='suitability_score', lookup_expr='gte')
+
+    class Meta:
+        model = GrantApplication
+        fields = [
+            'event', 'company', 'sector', 'applicant_email', 'created', 'updated', 'decision', 'status',
+            'is_eligible', 'sent_for_review', 'is_completed', 'in_review', 'min_total_verified',
+            'min_suitability_score'
+        ]
 
 
 class GrantApplicationsViewSet(ModelViewSet):
-    queryset = GrantApplication.objects.all()
+    queryset = GrantApplication.objects.select_related('company__latest_dnb_response').defer(
+        'company__latest_dnb_response__dnb_data_compressed'
+    )
     notification_service = NotifyService()
+    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    filterset_class = GrantApplicationsFilterSet
+    search_fields = ['company_display_name']
+    ordering_fields = ['created', 'updated', 'company_display_name', 'total_verified', 'suitability_score']
+    ordering = ['created']
+
+    def get_queryset(self):
+        if self.action == 'list':
+            return self.queryset.with_status()
+        return super().get_queryset()
 
     def get_serializer_class(self):
         if self.action in ['create', 'update', 'partial_update']:
@@ -32,6 +76,19 @@ class GrantApplicationsViewSet(ModelViewSet):
         instance.send_for_review()
         return Response(self.get_serializer(instance).data)
 
+    @action(detail=True, methods=['POST'], url_path='select-company')
+    def select_company(self, request, pk=None):
+        instance = self.get_object()
+        serializer = SelectCompanySerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        instance.company = save_dnb_company_snapshot(serializer.validated_data['dnb_data'])
+        # Clear manual company details in case they have previously been set
+        for field in GrantApplication.MANUAL_COMPANY_FIELDS:
+            setattr(instance, field, None)
+        instance.update_application_summary_sections(serializer.validated_data.get('application_summary_sections', {}))
+        instance.save()
+        return Response(self.get_serializer(instance).data)
+
     @action(detail=True, methods=['POST'], url_path='event-evidence-upload-confirmation')
     def event_evidence_upload_confirmation(self, request, pk=None):
         grant_application = self.get_object()
@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand
+from django.db.models import OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce, NullIf
+
+from web.companies.models import Company
+from web.grant_applications.models import GrantApplication
+from web.grant_management.models import GrantManagementProcess
+
+
+class Command(BaseCommand):
+    help = "Set the company display name of grant applications saved before it was stored"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            help="Number of grant applications updated per query",
+            dest="batch_size",
+            type=int,
+            default=1000,
+        )
+
+    def handle(self, *args, **options):
+        # An empty manual company name is not used, as in GrantApplication.build_company_display_name
+        manual_name = NullIf('manual_company_name', Value(''))
+        queryset = GrantApplication.objects.annotate(manual_name=manual_name).filter(
+            Q(manual_name__isnull=False) | Q(company__isnull=False),
+            company_display_name__isnull=True,
+        )
+        company_name = Subquery(Company.objects.filter(pk=OuterRef('company_id')).values('name')[:1])
+
+        total = 0
+        while True:
+            batch = list(queryset.values_list('pk', flat=True)[:options["batch_size"]])
+            if not batch:
+                break
+            total += GrantApplication.objects.filter(pk__in=batch).update(
+                company_display_name=Coalesce(manual_name, company_name)
+            )
+            GrantManagementProcess.update_summary_texts(
+                GrantManagementProcess.objects.filter(grant_application__in=batch)
+            )
+            GrantApplication.publish_changes(GrantApplication.objects.filter(pk__in=batch), 'company_display_name')
+        self.stdout.write(f"Updated {total} grant applications")
@@ -0,0 +1,45 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from web.grant_applications.models import GrantApplicationChange
+
+
+class Command(BaseCommand):
+    help = (
+        "Post undelivered grant application change events to the frontend. Several can run at once, "
+        "each delivers different events."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            help="Number of change events posted per request",
+            dest="batch_size",
+            type=int,
+            default=100,
+        )
+        parser.add_argument(
+            "--interval",
+            help="Keep running as a worker, checking for new change events every this many seconds",
+            type=float,
+            default=0,
+        )
+
+    def deliver(self, batch_size):
+        total = 0
+        while True:
+            delivered = GrantApplicationChange.deliver_pending(batch_size=batch_size)
+            if not delivered:
+                return total
+            total += delivered
+
+    def handle(self, *args, **options):
+        while True:
+            total = self.deliver(options["batch_size"])
+            if not options["interval"]:
+                break
+            if total:
+                self.stdout.write(f"Delivered {total} change events")
+            time.sleep(options["interval"])
+        self.stdout.write(f"Delivered {total} change events")
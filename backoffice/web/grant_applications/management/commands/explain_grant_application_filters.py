@@ -0,0 +1,75 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from viewflow.activation import STATUS
+
+from web.grant_applications.apis import GrantApplicationsFilterSet
+from web.grant_applications.models import GrantApplication
+from web.grant_management.models import GrantManagementProcess
+
+SEQ_SCAN = f'Seq Scan on {GrantApplication._meta.db_table}'
+
+
+class Command(BaseCommand):
+    help = (
+        "Print the query plan of the first page of the grant applications list api for each filter. "
+        "Run against a database of production size, the planner prefers sequential scans on small tables."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--page-size",
+            help="Number of grant applications in the page",
+            dest="page_size",
+            type=int,
+            default=settings.REST_FRAMEWORK['PAGE_SIZE'],
+        )
+        parser.add_argument(
+            "--analyze",
+            help="Run the queries and include actual timings in the plans",
+            action="store_true",
+        )
+        parser.add_argument(
+            "--check",
+            help="Fail if any filter reads the whole grant applications table",
+            action="store_true",
+        )
+
+    def get_filters(self):
+        """Filter name, query params and ordering, using values of the most recent applications."""
+        latest = GrantApplication.objects.order_by('-created')
+        filters = []
+        for field in ['event', 'company', 'sector', 'applicant_email']:
+            value = latest.filter(**{f'{field}__isnull': False}).values_list(field, flat=True).first()
+            if value is None:
+                self.stdout.write(f"Skipping {field}, no grant application has one")
+            else:
+                filters.append((field, {field: value}, 'created'))
+        last_week = (timezone.now() - timedelta(days=7)).isoformat()
+        filters += [
+            ('created', {'created_after': last_week}, 'created'),
+            # A range of one column can't be read in the order of another from an index, consumers
+            # polling for changes order by updated
+            ('updated', {'updated_after': last_week}, '-updated'),
+            ('decision', {'decision': GrantManagementProcess.Decision.APPROVED}, 'created'),
+            ('status', {'status': STATUS.DONE}, 'created'),
+        ]
+        return filters
+
+    def handle(self, *args, **options):
+        seq_scans = []
+        for name, params, ordering in self.get_filters():
+            filterset = GrantApplicationsFilterSet(
+                params, queryset=GrantApplication.objects.with_status().order_by(ordering)
+            )
+            if not filterset.is_valid():
+                raise CommandError(f"Invalid {name} filter : {filterset.errors}")
+            plan = filterset.qs[:options["page_size"]].explain(analyze=options["analyze"])
+            if SEQ_SCAN in plan:
+                seq_scans.append(name)
+            self.stdout.write(f"{name} {params} ordering={ordering}\n{plan}\n")
+
+        if options["check"] and seq_scans:
+            raise CommandError(f"Sequential scan of grant applications for filters : {', '.join(seq_scans)}")
@@ -0,0 +1,18 @@
+# Generated by Django 3.1.1 on 2026-10-19 10:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('grant_applications', '0022_added_event_evidence_upload_field'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='grantapplication',
+            name='application_summary_sections',
+            field=models.JSONField(default=dict),
+        ),
+    ]
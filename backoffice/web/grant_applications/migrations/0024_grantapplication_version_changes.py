@@ -0,0 +1,37 @@
+# Generated by Django 3.1.1 on 2026-10-19 18:29
+
+import django.contrib.postgres.fields
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('grant_applications', '0023_grantapplication_application_summary_sections'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='grantapplication',
+            name='version',
+            field=models.PositiveIntegerField(default=1),
+        ),
+        migrations.CreateModel(
+            name='GrantApplicationChange',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('updated', models.DateTimeField(auto_now=True)),
+                ('created', models.DateTimeField(auto_now_add=True)),
+                ('version', models.PositiveIntegerField()),
+                ('changed_fields', django.contrib.postgres.fields.ArrayField(base_field=models.CharField(max_length=100), size=None)),
+                ('delivered', models.DateTimeField(db_index=True, null=True)),
+                ('attempts', models.PositiveSmallIntegerField(default=0)),
+                ('grant_application', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='grant_applications.grantapplication')),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 3.1.1 on 2026-10-19 18:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('grant_applications', '0024_grantapplication_version_changes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='grantapplication',
+            name='company_display_name',
+            field=models.CharField(db_index=True, max_length=500, null=True),
+        ),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 3.1.1 on 2026-10-19 18:42
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sectors', '0001_initial'),
+        ('trade_events', '0001_initial'),
+        ('companies', '0002_auto_20201111_1445'),
+        ('grant_applications', '0025_grantapplication_company_display_name'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='grantapplication',
+            name='company',
+            field=models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.PROTECT, to='companies.company'),
+        ),
+        migrations.AlterField(
+            model_name='grantapplication',
+            name='event',
+            field=models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.PROTECT, to='trade_events.event'),
+        ),
+        migrations.AlterField(
+            model_name='grantapplication',
+            name='sector',
+            field=models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.PROTECT, to='sectors.sector'),
+        ),
+        migrations.AddIndex(
+            model_name='grantapplication',
+            index=models.Index(fields=['event', 'created'], name='grant_app_event_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='grantapplication',
+            index=models.Index(fields=['company', 'created'], name='grant_app_company_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='grantapplication',
+            index=models.Index(fields=['sector', 'created'], name='grant_app_sector_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='grantapplication',
+            index=models.Index(fields=['applicant_email', 'created'], name='grant_app_email_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='grantapplication',
+            index=models.Index(fields=['created'], name='grant_app_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='grantapplication',
+            index=models.Index(fields=['updated'], name='grant_app_updated_idx'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 3.1.1 on 2026-10-19 18:46
+
+from django.db import migrations, models
+import web.core.abstract_models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('grant_applications', '0026_grantapplication_list_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='grantapplication',
+            name='id',
+            field=models.UUIDField(default=web.core.abstract_models.generate_id, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='grantapplicationchange',
+            name='id',
+            field=models.UUIDField(default=web.core.abstract_models.generate_id, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='stateaid',
+            name='id',
+            field=models.UUIDField(default=web.core.abstract_models.generate_id, editable=False, primary_key=True, serialize=False),
+        ),
+    ]
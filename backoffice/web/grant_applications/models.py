@@ -1,16 +1,62 @@
 from django.conf import settings
 from django.contrib.postgres.fields import ArrayField
 from django.core.validators import MaxValueValidator, MinValueValidator, RegexValidator
-from django.db import models
-from django.db.models import PROTECT
+from django.db import models, transaction
+from django.db.models import BooleanField, ExpressionWrapper, F, IntegerField, PROTECT, Q, Value
+from django.db.models.functions import Cast, Coalesce
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from phonenumber_field.modelfields import PhoneNumberField
 
 from web.core.abstract_models import BaseMetaModel
+from web.core.webhooks import ChangeEventsClient
 from web.grant_management.flows import GrantManagementFlow
 from web.grant_management.models import GrantManagementProcess
 
 
+def _boolean(q):
+    return ExpressionWrapper(q, output_field=BooleanField())
+
+
+def _sum_of(*fields):
+    total = Value(0)
+    for field in fields:
+        total += Coalesce(field, 0)
+    return ExpressionWrapper(total, output_field=IntegerField())
+
+
+class GrantApplicationQuerySet(models.QuerySet):
+
+    def with_status(self):
+        """Annotate the is_eligible, sent_for_review and is_completed properties and the grant management
+        process scores so that applications can be filtered and sorted on them in the database.
+        """
+        return self.annotate(
+            eligible=_boolean(
+                ~Q(previous_applications__gte=6)
+                & ~Q(is_already_committed_to_event=True)
+                & ~Q(number_of_employees=GrantApplication.NumberOfEmployees.HAS_250_OR_MORE)
+                & ~Q(is_turnover_greater_than=True)
+            ),
+            submitted=_boolean(Q(grant_management_process__isnull=False)),
+            completed=_boolean(Q(grant_management_process__decision__isnull=False)),
+            in_review=_boolean(
+                Q(grant_management_process__isnull=False) & Q(grant_management_process__decision__isnull=True)
+            ),
+            total_verified=_sum_of(*[
+                Cast(f'grant_management_process__{field}', IntegerField()) for field in [
+                    'previous_applications_is_verified', 'event_commitment_is_verified',
+                    'business_entity_is_verified', 'state_aid_is_verified',
+                ]
+            ]),
+            suitability_score=_sum_of(
+                'grant_management_process__products_and_services_score',
+                'grant_management_process__products_and_services_competitors_score',
+                'grant_management_process__export_strategy_score',
+            ),
+        )
+
+
 class GrantApplication(BaseMetaModel):
 
     class NumberOfEmployees(models.TextChoices):
@@ -58,14 +104,23 @@ class GrantApplication(BaseMetaModel):
         SIX_TO_TEN_YEARS = '6 to 10 years', _('6 to 10 years')
         MORE_THAN_10_YEARS = 'more than 10 years', _('More than 10 years')
 
+    MANUAL_COMPANY_FIELDS = [
+        'manual_company_type', 'manual_company_name', 'manual_company_address_line_1',
+        'manual_company_address_line_2', 'manual_company_address_town', 'manual_company_address_county',
+        'manual_company_address_postcode', 'manual_time_trading_in_uk', 'manual_registration_number',
+        'manual_vat_number', 'manual_website',
+    ]
+
     previous_applications = models.IntegerField(
         null=True, validators=[MinValueValidator(0), MaxValueValidator(6)]
     )
-    event = models.ForeignKey('trade_events.Event', on_delete=PROTECT, null=True)
+    # Indexed by the (event, created) index in Meta.indexes
+    event = models.ForeignKey('trade_events.Event', on_delete=PROTECT, null=True, db_index=False)
     event_evidence_upload = models.ForeignKey('core.Image', on_delete=PROTECT, null=True)
     is_already_committed_to_event = models.BooleanField(null=True)
     search_term = models.CharField(max_length=500, null=True)
-    company = models.ForeignKey('companies.Company', on_delete=PROTECT, null=True)
+    # Indexed by the (company, created) index in Meta.indexes
+    company = models.ForeignKey('companies.Company', on_delete=PROTECT, null=True, db_index=False)
     manual_company_type = models.CharField(null=True, choices=CompanyType.choices, max_length=20)
     manual_company_name = models.CharField(null=True, max_length=500)
     manual_company_address_line_1 = models.CharField(null=True, max_length=100)
@@ -110,7 +165,8 @@ class GrantApplication(BaseMetaModel):
     previous_years_export_turnover_3 = models.DecimalField(
         null=True, validators=[MinValueValidator(0)], **settings.CURRENCY_DECIMAL_PRECISION
     )
-    sector = models.ForeignKey('sectors.Sector', on_delete=PROTECT, null=True)
+    # Indexed by the (sector, created) index in Meta.indexes
+    sector = models.ForeignKey('sectors.Sector', on_delete=PROTECT, null=True, db_index=False)
     other_business_names = models.CharField(null=True, max_length=500)
     products_and_services_description = models.TextField(null=True)
     products_and_services_competitors = models.TextField(null=True)
@@ -142,6 +198,45 @@ class GrantApplication(BaseMetaModel):
     trade_show_experience_description = models.TextField(null=True)
     additional_guidance = models.TextField(null=True)
     application_summary = models.JSONField(default=list)
+    # Review page summary lists by section, kept up to date by the frontend as each step is saved
+    application_summary_sections = models.JSONField(default=dict)
+    # Incremented whenever the backoffice changes the application, see publish_change
+    version = models.PositiveIntegerField(default=1)
+    # manual_company_name or the company name, kept up to date on save so that applications can be listed,
+    # sorted and searched by business name without a join
+    company_display_name = models.CharField(null=True, max_length=500, db_index=True)
+
+    objects = GrantApplicationQuerySet.as_manager()
+
+    class Meta:
+        # One index per filter of the list api, followed by its default ordering, so that a page of
+        # filtered applications is read in order from the index whatever the size of the table
+        indexes = [
+            models.Index(fields=['event', 'created'], name='grant_app_event_created_idx'),
+            models.Index(fields=['company', 'created'], name='grant_app_company_created_idx'),
+            models.Index(fields=['sector', 'created'], name='grant_app_sector_created_idx'),
+            models.Index(fields=['applicant_email', 'created'], name='grant_app_email_created_idx'),
+            models.Index(fields=['created'], name='grant_app_created_idx'),
+            models.Index(fields=['updated'], name='grant_app_updated_idx'),
+        ]
+
+    def build_company_display_name(self):
+        if self.manual_company_name:
+            return self.manual_company_name
+        if self.company_id:
+            return self.company.name
+        return None
+
+    def save(self, *args, **kwargs):
+        self.company_display_name = self.build_company_display_name()
+        if kwargs.get('update_fields') is not None:
+            kwargs['update_fields'] = {*kwargs['update_fields'], 'company_display_name'}
+        super().save(*args, **kwargs)
+
+    def update_application_summary_sections(self, sections):
+        """Update the stored application summary sections with sections, a section set to None is removed."""
+        sections = {**self.application_summary_sections, **sections}
+        self.application_summary_sections = {k: v for k, v in sections.items() if v is not None}
 
     def send_for_review(self):
         qs = GrantManagementFlow.process_class.objects.filter(grant_application=self)
@@ -149,6 +244,37 @@ class GrantApplication(BaseMetaModel):
             return GrantManagementFlow.start.run(grant_application=self)
         return qs.get()
 
+    def publish_change(self, *changed_fields):
+        """Bump the version of the application and queue a change event for the frontend, which
+        drops its cached copy of the application. Call after saving any changed fields. Queued events are
+        posted by the deliver_grant_application_changes command, outside of the request.
+        """
+        GrantApplication.publish_changes(GrantApplication.objects.filter(pk=self.pk), *changed_fields)
+        self.refresh_from_db(fields=['version'])
+
+    @classmethod
+    def publish_changes(cls, queryset, *changed_fields):
+        """publish_change for each application of queryset."""
+        grant_application_ids = list(queryset.values_list('pk', flat=True))
+        if not grant_application_ids:
+            return
+        cls.objects.filter(pk__in=grant_application_ids).update(version=F('version') + 1)
+        if settings.CHANGE_EVENTS_WEBHOOK_URL:
+            GrantApplicationChange.objects.bulk_create([
+                GrantApplicationChange(
+                    grant_application_id=pk, version=version, changed_fields=list(changed_fields)
+                ) for pk, version in cls.objects.filter(pk__in=grant_application_ids).values_list('pk', 'version')
+            ])
+
+    def publish_company_change(self):
+        """Publish a change to the other applications of the company, whose counts of previous and in
+        review applications include this one.
+        """
+        if self.company_id:
+            GrantApplication.publish_changes(
+                GrantApplication.objects.filter(company_id=self.company_id).exclude(pk=self.pk), 'company'
+            )
+
     @property
     def is_eligible(self):
         if self.previous_applications and self.previous_applications >= 6:
@@ -174,7 +300,7 @@ class GrantApplication(BaseMetaModel):
 
     @property
     def company_name(self):
-        return self.manual_company_name or self.company.name
+        return self.company_display_name or self.build_company_display_name()
 
     @property
     def flow_process(self):
@@ -187,3 +313,43 @@ class StateAid(BaseMetaModel):
     amount = models.IntegerField(validators=[MinValueValidator(1)])
     description = models.CharField(max_length=2000)
     grant_application = models.ForeignKey(GrantApplication, on_delete=PROTECT)
+
+
+class GrantApplicationChange(BaseMetaModel):
+    """Outbox of grant application change events waiting to be posted to the frontend."""
+    grant_application = models.ForeignKey(GrantApplication, on_delete=models.CASCADE)
+    version = models.PositiveIntegerField()
+    changed_fields = ArrayField(models.CharField(max_length=100))
+    delivered = models.DateTimeField(null=True, db_index=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+
+    def as_event(self):
+        return {
+            'grant_application': self.grant_application_id,
+            'version': self.version,
+            'changed_fields': self.changed_fields,
+        }
+
+    @classmethod
+    def deliver_pending(cls, batch_size=100):
+        """Post the oldest undelivered changes to the frontend in one batch. Returns the number delivered.
+
+        The changes are locked until they are marked as delivered, changes locked by another worker are
+        skipped so that they aren't delivered twice.
+        """
+        with transaction.atomic():
+            changes = list(
+                cls.objects.select_for_update(skip_locked=True).filter(
+                    delivered__isnull=True, attempts__lt=settings.CHANGE_EVENTS_MAX_ATTEMPTS
+                ).order_by('created')[:batch_size]
+            )
+            if not changes:
+                return 0
+
+            change_ids = [change.id for change in changes]
+            if not ChangeEventsClient().send([change.as_event() for change in changes]):
+                cls.objects.filter(id__in=change_ids).update(attempts=F('attempts') + 1)
+                return 0
+
+            cls.objects.filter(id__in=change_ids).update(delivered=timezone.now())
+            return len(changes)
@@ -1,7 +1,7 @@
 from rest_framework import serializers
 
 from web.companies.models import Company, DnbGetCompanyResponse
-from web.companies.services import refresh_dnb_company_response_data
+from web.companies.services import get_verified_dnb_data, refresh_dnb_company_response_data
 from web.grant_applications.models import GrantApplication, StateAid
 from web.grant_management.models import GrantManagementProcess
 from web.sectors.models import Sector
@@ -12,7 +12,10 @@ class DnbGetCompanyResponseSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = DnbGetCompanyResponse
-        fields = ['id', 'dnb_data', 'registration_number', 'company_address']
+        fields = [
+            'id', 'primary_name', 'registration_number', 'company_address', 'employee_number', 'annual_sales',
+            'annual_sales_currency'
+        ]
 
 
 class CompanySerializer(serializers.ModelSerializer):
@@ -92,13 +95,47 @@ class GrantApplicationWriteSerializer(serializers.ModelSerializer):
     class Meta:
         model = GrantApplication
         fields = '__all__'
+        read_only_fields = ['version', 'company_display_name']
+
+    def to_representation(self, instance):
+        # Respond with the full grant application so that clients don't need to fetch it again
+        return GrantApplicationReadSerializer(instance, context=self.context).data
+
+    def validate_application_summary_sections(self, value):
+        if not isinstance(value, dict):
+            raise serializers.ValidationError('Expected an object of section name to summary list.')
+        return value
+
+    def update(self, instance, validated_data):
+        if 'application_summary_sections' in validated_data:
+            # Only the sections sent are updated
+            instance.update_application_summary_sections(validated_data.pop('application_summary_sections'))
+        return super().update(instance, validated_data)
 
     def save(self, **kwargs):
+        previous_company_id = self.instance.company_id if self.instance else None
         super(GrantApplicationWriteSerializer, self).save()
-        if self.instance.company:
+        # Only fetch fresh dnb data when the company changes
+        if self.instance.company and self.instance.company_id != previous_company_id:
             refresh_dnb_company_response_data(self.instance.company)
 
 
+class SelectCompanySerializer(serializers.Serializer):
+    # A company as returned by the company search api
+    dnb_data = serializers.JSONField()
+    # Application summary sections to update with the company, as when updating the grant application
+    application_summary_sections = serializers.DictField(required=False)
+
+    def validate_dnb_data(self, value):
+        if not isinstance(value, dict) or not value.get('duns_number') or not value.get('primary_name'):
+            raise serializers.ValidationError('duns_number and primary_name are required.')
+        # Only store data which dnb-service returned, from a recent search or looked up again
+        dnb_data = get_verified_dnb_data(value)
+        if not dnb_data:
+            raise serializers.ValidationError('Company not found.')
+        return dnb_data
+
+
 class SendForReviewWriteSerializer(serializers.ModelSerializer):
     application_summary = serializers.JSONField()
 
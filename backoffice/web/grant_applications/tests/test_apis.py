@@ -5,6 +5,7 @@ from rest_framework.status import (
     HTTP_200_OK, HTTP_201_CREATED, HTTP_204_NO_CONTENT, HTTP_400_BAD_REQUEST
 )
 
+from web.companies.services import DnbServiceClient, save_company_search_results
 from web.grant_applications.models import GrantApplication, StateAid
 from web.grant_management.models import GrantManagementProcess
 from web.tests.factories.companies import CompanyFactory
@@ -54,10 +55,13 @@ class GrantApplicationsApiTests(BaseAPITestCase):
                     'name': ga.company.name,
                     'last_dnb_get_company_response': {
                         'id': ga.company.last_dnb_get_company_response.id_str,
-                        'dnb_data': ga.company.last_dnb_get_company_response.dnb_data,
+                        'primary_name': ga.company.last_dnb_get_company_response.primary_name,
                         'company_address': ga.company.last_dnb_get_company_response.company_address,
                         'registration_number':
-                            ga.company.last_dnb_get_company_response.registration_number
+                            ga.company.last_dnb_get_company_response.registration_number,
+                        'employee_number': ga.company.last_dnb_get_company_response.employee_number,
+                        'annual_sales': ga.company.last_dnb_get_company_response.annual_sales,
+                        'annual_sales_currency': ga.company.last_dnb_get_company_response.annual_sales_currency,
                     },
                     'previous_applications': 0,
                     'applications_in_review': 0,
@@ -131,6 +135,74 @@ class GrantApplicationsApiTests(BaseAPITestCase):
             ]
         )
 
+    def test_list_grant_applications_by_review_status(self, *mocks):
+        in_review = GrantManagementProcessFactory(
+            products_and_services_score=5, products_and_services_competitors_score=4, export_strategy_score=3
+        ).grant_application
+        GrantManagementProcessFactory(
+            products_and_services_score=1, products_and_services_competitors_score=1, export_strategy_score=1
+        )
+        GrantManagementProcessFactory(
+            decision=GrantManagementProcess.Decision.APPROVED, products_and_services_score=5,
+            products_and_services_competitors_score=5, export_strategy_score=5
+        )
+        GrantApplicationFactory(is_already_committed_to_event=True)
+
+        path = reverse('grant-applications:grant-applications-list')
+        response = self.client.get(
+            path, {'is_eligible': True, 'in_review': True, 'min_suitability_score': 10, 'ordering': 'created'}
+        )
+        self.assertEqual(response.status_code, HTTP_200_OK, msg=response.data)
+        self.assertEqual([ga['id'] for ga in response.data], [in_review.id_str])
+
+    def test_list_grant_applications_by_event_company_and_dates(self, *mocks):
+        ga = CompletedGrantApplicationFactory(applicant_email='a@test.com')
+        other_ga = CompletedGrantApplicationFactory(applicant_email='b@test.com')
+        GrantApplication.objects.filter(pk=other_ga.pk).update(created='2020-01-01T00:00:00Z')
+        path = reverse('grant-applications:grant-applications-list')
+
+        for params in [
+            {'event': ga.event.id}, {'company': ga.company.id}, {'sector': ga.sector.id},
+            {'applicant_email': 'a@test.com'}, {'created_after': '2020-06-01T00:00:00Z'},
+        ]:
+            response = self.client.get(path, params)
+            self.assertEqual(response.status_code, HTTP_200_OK, msg=response.data)
+            self.assertEqual([ga['id'] for ga in response.data], [ga.id_str], msg=params)
+
+        response = self.client.get(path, {'created_before': '2020-06-01T00:00:00Z'})
+        self.assertEqual([ga['id'] for ga in response.data], [other_ga.id_str])
+
+    def test_list_grant_applications_by_process_decision_and_status(self, *mocks):
+        approved = GrantManagementProcessFactory(decision=GrantManagementProcess.Decision.APPROVED, status='DONE')
+        GrantManagementProcessFactory(status='NEW')
+        GrantApplicationFactory()
+        path = reverse('grant-applications:grant-applications-list')
+
+        response = self.client.get(path, {'decision': 'approved'})
+        self.assertEqual([ga['id'] for ga in response.data], [approved.grant_application.id_str])
+        response = self.client.get(path, {'status': 'NEW'})
+        self.assertEqual(len(response.data), 1)
+        self.assertNotEqual(response.data[0]['id'], approved.grant_application.id_str)
+
+    def test_list_grant_applications_ordering(self, *mocks):
+        gas = [
+            GrantApplicationFactory(manual_company_name=name) for name in ['b-company', 'c-company', 'a-company']
+        ]
+        path = reverse('grant-applications:grant-applications-list')
+        response = self.client.get(path, {'ordering': 'company_display_name'})
+        self.assertEqual(
+            [ga['id'] for ga in response.data], [gas[2].id_str, gas[0].id_str, gas[1].id_str]
+        )
+        response = self.client.get(path, {'ordering': '-created'})
+        self.assertEqual([ga['id'] for ga in response.data], [ga.id_str for ga in reversed(gas)])
+
+    def test_search_grant_applications_by_business_name(self, *mocks):
+        ga = GrantApplicationFactory(manual_company_name='A company')
+        GrantApplicationFactory(manual_company_name='Another business')
+        path = reverse('grant-applications:grant-applications-list')
+        response = self.client.get(path, {'search': 'company'})
+        self.assertEqual([ga['id'] for ga in response.data], [ga.id_str])
+
     def test_grant_application_counts(self, *mocks):
         company = CompanyFactory()
 
@@ -184,7 +256,129 @@ class GrantApplicationsApiTests(BaseAPITestCase):
         path = reverse('grant-applications:grant-applications-detail', args=(ga.id,))
         response = self.client.patch(path, {'event': event.id})
         self.assertEqual(response.status_code, HTTP_200_OK, msg=response.data)
-        self.assert_response_data_contains(response, data_contains={'event': event.id})
+        self.assertEqual(response.data['event']['id'], event.id_str)
+
+    def test_update_grant_application_does_not_refresh_dnb_company_data_if_company_unchanged(self, *mocks):
+        ga = CompletedGrantApplicationFactory()
+        path = reverse('grant-applications:grant-applications-detail', args=(ga.id,))
+        self.client.patch(path, {'event': EventFactory().id, 'company': ga.company.id})
+        mocks[1].assert_not_called()
+
+    def test_update_grant_application_summary_sections(self, *mocks):
+        ga = CompletedGrantApplicationFactory(
+            application_summary_sections={'contact-details': {'heading': 'A'}, 'export-details': {'heading': 'B'}}
+        )
+        path = reverse('grant-applications:grant-applications-detail', args=(ga.id,))
+        response = self.client.patch(
+            path,
+            {'application_summary_sections': {'select-an-event': {'heading': 'C'}, 'export-details': None}},
+            format='json'
+        )
+        self.assertEqual(response.status_code, HTTP_200_OK, msg=response.data)
+        ga.refresh_from_db()
+        self.assertDictEqual(
+            ga.application_summary_sections,
+            {'contact-details': {'heading': 'A'}, 'select-an-event': {'heading': 'C'}}
+        )
+
+    def test_update_grant_application_version_is_read_only(self, *mocks):
+        ga = CompletedGrantApplicationFactory()
+        path = reverse('grant-applications:grant-applications-detail', args=(ga.id,))
+        response = self.client.patch(path, {'version': 10}, format='json')
+        self.assertEqual(response.status_code, HTTP_200_OK, msg=response.data)
+        self.assertEqual(response.data['version'], 1)
+
+    def test_update_grant_application_summary_sections_must_be_an_object(self, *mocks):
+        ga = CompletedGrantApplicationFactory()
+        path = reverse('grant-applications:grant-applications-detail', args=(ga.id,))
+        response = self.client.patch(path, {'application_summary_sections': ['a']}, format='json')
+        self.assertEqual(response.status_code, HTTP_400_BAD_REQUEST)
+
+    def test_select_company_creates_company_from_search_result(self, *mocks):
+        ga = GrantApplicationFactory(manual_company_name='A manual name')
+        path = reverse('grant-applications:grant-applications-select-company', args=(ga.id,))
+        dnb_data = {
+            'duns_number': '123456789',
+            'primary_name': 'A company',
+            'registration_numbers': [
+                {'registration_type': 'uk_companies_house_number', 'registration_number': '10000001'}
+            ],
+        }
+        save_company_search_results([dnb_data])
+        with patch.object(DnbServiceClient, 'get_company') as get_company:
+            response = self.client.post(path, data={'dnb_data': dnb_data}, format='json')
+        self.assertEqual(response.status_code, HTTP_200_OK, msg=response.data)
+        get_company.assert_not_called()
+        ga.refresh_from_db()
+        self.assertEqual(ga.company.duns_number, dnb_data['duns_number'])
+        self.assertEqual(ga.company.name, dnb_data['primary_name'])
+        self.assertEqual(ga.company.registration_number, '10000001')
+        self.assertEqual(ga.company.last_dnb_get_company_response.dnb_data, dnb_data)
+        self.assertIsNone(ga.manual_company_name)
+        self.assertEqual(response.data['company']['id'], ga.company.id_str)
+        mocks[1].assert_not_called()
+
+    def test_select_company_reuses_existing_company(self, *mocks):
+        company = CompanyFactory()
+        ga = GrantApplicationFactory()
+        path = reverse('grant-applications:grant-applications-select-company', args=(ga.id,))
+        dnb_data = {'duns_number': company.duns_number, 'primary_name': company.name}
+        save_company_search_results([dnb_data])
+        response = self.client.post(path, data={'dnb_data': dnb_data}, format='json')
+        self.assertEqual(response.status_code, HTTP_200_OK, msg=response.data)
+        ga.refresh_from_db()
+        self.assertEqual(ga.company, company)
+        self.assertEqual(company.dnb_get_company_responses.count(), 2)
+
+    def test_select_company_clears_summary_sections(self, *mocks):
+        company = CompanyFactory()
+        ga = GrantApplicationFactory(
+            application_summary_sections={'select-company': {'heading': 'A'}, 'contact-details': {'heading': 'B'}}
+        )
+        path = reverse('grant-applications:grant-applications-select-company', args=(ga.id,))
+        dnb_data = {'duns_number': company.duns_number, 'primary_name': company.name}
+        save_company_search_results([dnb_data])
+        response = self.client.post(
+            path, data={'dnb_data': dnb_data, 'application_summary_sections': {'select-company': None}}, format='json'
+        )
+        self.assertEqual(response.status_code, HTTP_200_OK, msg=response.data)
+        ga.refresh_from_db()
+        self.assertEqual(ga.application_summary_sections, {'contact-details': {'heading': 'B'}})
+
+    def test_select_company_updates_existing_company(self, *mocks):
+        company = CompanyFactory(name='Old name', registration_number='10000002')
+        ga = GrantApplicationFactory()
+        path = reverse('grant-applications:grant-applications-select-company', args=(ga.id,))
+        dnb_data = {'duns_number': company.duns_number, 'primary_name': 'New name'}
+        save_company_search_results([dnb_data])
+        response = self.client.post(path, data={'dnb_data': dnb_data}, format='json')
+        self.assertEqual(response.status_code, HTTP_200_OK, msg=response.data)
+        company.refresh_from_db()
+        self.assertEqual(company.name, 'New name')
+        self.assertIsNone(company.registration_number)
+
+    def test_select_company_looks_up_data_not_from_a_search(self, *mocks):
+        ga = GrantApplicationFactory()
+        path = reverse('grant-applications:grant-applications-select-company', args=(ga.id,))
+        dnb_data = {'duns_number': '123456780', 'primary_name': 'A company'}
+        with patch.object(DnbServiceClient, 'get_company', return_value={**dnb_data, 'primary_name': 'Real name'}):
+            response = self.client.post(path, data={'dnb_data': dnb_data}, format='json')
+        self.assertEqual(response.status_code, HTTP_200_OK, msg=response.data)
+        ga.refresh_from_db()
+        self.assertEqual(ga.company.name, 'Real name')
+        self.assertEqual(ga.company.last_dnb_get_company_response.primary_name, 'Real name')
+
+        with patch.object(DnbServiceClient, 'get_company', return_value=None):
+            response = self.client.post(
+                path, data={'dnb_data': {'duns_number': '123456781', 'primary_name': 'A company'}}, format='json'
+            )
+        self.assertEqual(response.status_code, HTTP_400_BAD_REQUEST)
+
+    def test_select_company_requires_dnb_data(self, *mocks):
+        ga = GrantApplicationFactory()
+        path = reverse('grant-applications:grant-applications-select-company', args=(ga.id,))
+        response = self.client.post(path, data={'dnb_data': {'duns_number': '1'}}, format='json')
+        self.assertEqual(response.status_code, HTTP_400_BAD_REQUEST)
 
     def test_create_new_grant_application_with_existing_company(self, *mocks):
         path = reverse('grant-applications:grant-applications-list')
@@ -0,0 +1,89 @@
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import override_settings
+
+from web.core.webhooks import ChangeEventsClient
+from web.grant_applications.models import GrantApplication, GrantApplicationChange
+from web.grant_management.models import GrantManagementProcess
+from web.tests.factories.companies import CompanyFactory
+from web.tests.factories.grant_applications import CompletedGrantApplicationFactory, GrantApplicationFactory
+from web.tests.factories.grant_management import GrantManagementProcessFactory
+from web.tests.helpers import BaseTestCase
+
+
+@override_settings(CHANGE_EVENTS_WEBHOOK_URL='http://frontend/change-events/')
+@patch.object(ChangeEventsClient, 'send', return_value=True)
+class TestDeliverGrantApplicationChangesCommand(BaseTestCase):
+
+    def test_delivers_in_batches(self, send):
+        ga = GrantApplicationFactory()
+        for _ in range(3):
+            ga.publish_change('is_completed')
+        out = StringIO()
+        call_command('deliver_grant_application_changes', batch_size=2, stdout=out)
+        self.assertEqual(send.call_count, 2)
+        self.assertIn('Delivered 3 change events', out.getvalue())
+        self.assertFalse(GrantApplicationChange.objects.filter(delivered__isnull=True).exists())
+
+    def test_interval_keeps_delivering(self, send):
+        ga = GrantApplicationFactory()
+        ga.publish_change('is_completed')
+
+        def sleep(seconds):
+            if sleep.calls:
+                raise KeyboardInterrupt
+            sleep.calls += 1
+            ga.publish_change('is_completed')
+        sleep.calls = 0
+
+        with patch('time.sleep', side_effect=sleep), self.assertRaises(KeyboardInterrupt):
+            call_command('deliver_grant_application_changes', interval=5, stdout=StringIO())
+        self.assertEqual(send.call_count, 2)
+        self.assertFalse(GrantApplicationChange.objects.filter(delivered__isnull=True).exists())
+
+
+class TestBackfillCompanyDisplayNameCommand(BaseTestCase):
+
+    def test_backfill(self):
+        ga = GrantApplicationFactory(company=CompanyFactory(name='A company'))
+        manual_ga = GrantApplicationFactory(manual_company_name='A manual name')
+        empty_manual_ga = GrantApplicationFactory(company=CompanyFactory(name='B company'), manual_company_name='')
+        no_company_ga = GrantApplicationFactory()
+        empty_manual_no_company_ga = GrantApplicationFactory(manual_company_name='')
+        gm_process = GrantManagementProcessFactory(grant_application=ga)
+        GrantApplication.objects.update(company_display_name=None)
+        GrantManagementProcess.objects.update(summary_text='')
+
+        out = StringIO()
+        call_command('backfill_company_display_name', batch_size=1, stdout=out)
+        self.assertIn('Updated 3 grant applications', out.getvalue())
+        for grant_application, expected in [
+            (ga, 'A company'), (manual_ga, 'A manual name'), (empty_manual_ga, 'B company'),
+            (no_company_ga, None), (empty_manual_no_company_ga, None)
+        ]:
+            grant_application.refresh_from_db()
+            self.assertEqual(grant_application.company_display_name, expected)
+        gm_process.refresh_from_db()
+        self.assertEqual(gm_process.summary_text, f'A company [{gm_process.status}]')
+
+
+class TestExplainGrantApplicationFiltersCommand(BaseTestCase):
+
+    def test_plan_for_each_filter(self):
+        CompletedGrantApplicationFactory(company=None, applicant_email='test@test.com')
+        out = StringIO()
+        call_command('explain_grant_application_filters', stdout=out)
+        for name in ['event', 'sector', 'applicant_email', 'created', 'updated', 'decision', 'status']:
+            self.assertIn(f'\n{name} {{', f'\n{out.getvalue()}')
+        self.assertIn('Skipping company, no grant application has one', out.getvalue())
+        self.assertIn('Limit', out.getvalue())
+
+    def test_check_fails_on_sequential_scan(self):
+        GrantApplicationFactory()
+        with connection.cursor() as cursor:
+            cursor.execute('SET enable_indexscan = off; SET enable_bitmapscan = off')
+        with self.assertRaisesRegex(CommandError, 'Sequential scan of grant applications for filters'):
+            call_command('explain_grant_application_filters', check=True, stdout=StringIO())
@@ -1,7 +1,14 @@
 from unittest.mock import patch
 
-from web.grant_applications.models import GrantApplication
+from django.test import override_settings
+from django.utils import timezone
+
+from web.companies.models import Company
+from web.core.webhooks import ChangeEventsClient
+from web.grant_applications.models import GrantApplication, GrantApplicationChange
+from web.tests.factories.companies import CompanyFactory, DnbGetCompanyResponseFactory
 from web.tests.factories.grant_applications import GrantApplicationFactory
+from web.tests.factories.grant_management import GrantManagementProcessFactory
 from web.tests.helpers import BaseTestCase
 
 
@@ -57,3 +64,140 @@ class TestGrantApplicationModel(BaseTestCase):
     def test_grant_application_is_not_eligible_with_high_turnover(self, *mocks):
         ga = GrantApplicationFactory(is_turnover_greater_than=True)
         self.assertFalse(ga.is_eligible)
+
+    def test_company_display_name_is_manual_company_name(self, *mocks):
+        ga = GrantApplicationFactory(company=CompanyFactory(), manual_company_name='A manual name')
+        self.assertEqual(ga.company_display_name, 'A manual name')
+        self.assertEqual(ga.company_name, 'A manual name')
+
+    def test_company_display_name_is_company_name(self, *mocks):
+        ga = GrantApplicationFactory(company=CompanyFactory(name='A company'))
+        self.assertEqual(ga.company_display_name, 'A company')
+        ga.company = None
+        ga.save(update_fields=['company'])
+        ga.refresh_from_db()
+        self.assertIsNone(ga.company_display_name)
+
+    def test_company_display_name_is_updated_when_company_is_renamed(self, *mocks):
+        company = CompanyFactory(name='A company')
+        ga = GrantApplicationFactory(company=company)
+        manual_ga = GrantApplicationFactory(company=company, manual_company_name='A manual name')
+        empty_manual_ga = GrantApplicationFactory(company=company, manual_company_name='')
+        gm_process = GrantManagementProcessFactory(grant_application=ga)
+        company.name = 'A new name'
+        company.save()
+        for grant_application, expected in [
+            (ga, 'A new name'), (manual_ga, 'A manual name'), (empty_manual_ga, 'A new name')
+        ]:
+            grant_application.refresh_from_db()
+            self.assertEqual(grant_application.company_display_name, expected)
+        gm_process.refresh_from_db()
+        self.assertEqual(gm_process.summary_text, gm_process.build_summary_text())
+        self.assertEqual(gm_process.summary_text, f'A new name [{gm_process.status}]')
+
+    def test_with_status_matches_properties(self, *mocks):
+        gas = [
+            GrantApplicationFactory(),
+            GrantApplicationFactory(previous_applications=6),
+            GrantApplicationFactory(is_already_committed_to_event=True),
+            GrantApplicationFactory(number_of_employees=GrantApplication.NumberOfEmployees.HAS_250_OR_MORE),
+            GrantApplicationFactory(is_turnover_greater_than=True),
+            GrantManagementProcessFactory().grant_application,
+            GrantManagementProcessFactory(decision='approved').grant_application,
+        ]
+        annotated = {ga.id: ga for ga in GrantApplication.objects.with_status()}
+        for ga in gas:
+            self.assertEqual(annotated[ga.id].eligible, ga.is_eligible)
+            self.assertEqual(annotated[ga.id].submitted, ga.sent_for_review)
+            self.assertEqual(annotated[ga.id].completed, ga.is_completed)
+            self.assertEqual(annotated[ga.id].in_review, ga.sent_for_review and not ga.is_completed)
+
+    def test_with_status_scores(self, *mocks):
+        process = GrantManagementProcessFactory(
+            state_aid_is_verified=False, products_and_services_score=5, products_and_services_competitors_score=4,
+            export_strategy_score=3
+        )
+        ga = GrantApplication.objects.with_status().get(pk=process.grant_application.pk)
+        self.assertEqual(ga.total_verified, process.total_verified)
+        self.assertEqual(ga.suitability_score, process.suitability_score)
+        ga = GrantApplication.objects.with_status().get(pk=GrantApplicationFactory().pk)
+        self.assertEqual((ga.total_verified, ga.suitability_score), (0, 0))
+
+
+@patch('web.grant_management.flows.NotifyService')
+class TestGrantApplicationChanges(BaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.ga = GrantApplicationFactory()
+
+    def test_publish_change_bumps_version(self, *mocks):
+        self.ga.publish_change('is_event_evidence_requested')
+        self.assertEqual(self.ga.version, 2)
+        self.ga.refresh_from_db()
+        self.assertEqual(self.ga.version, 2)
+
+    def test_publish_change_is_not_recorded_without_webhook_url(self, *mocks):
+        self.ga.publish_change('is_event_evidence_requested')
+        self.assertFalse(GrantApplicationChange.objects.exists())
+
+    @override_settings(CHANGE_EVENTS_WEBHOOK_URL='http://frontend/change-events/')
+    def test_publish_change_is_recorded(self, *mocks):
+        self.ga.publish_change('is_event_evidence_requested')
+        change = GrantApplicationChange.objects.get()
+        self.assertEqual(change.as_event(), {
+            'grant_application': self.ga.id,
+            'version': 2,
+            'changed_fields': ['is_event_evidence_requested'],
+        })
+        self.assertIsNone(change.delivered)
+
+    def test_company_changes_are_published(self, *mocks):
+        company = CompanyFactory()
+        ga = GrantApplicationFactory(company=company)
+        other_ga = GrantApplicationFactory(company=company)
+
+        company.name = 'A new name'
+        company.save()
+        response = DnbGetCompanyResponseFactory(company=company)
+        Company.objects.update(latest_dnb_response=None)
+        Company.update_latest_dnb_responses(Company.objects.filter(pk=company.pk))
+
+        for grant_application in [ga, other_ga]:
+            grant_application.refresh_from_db()
+            self.assertEqual(grant_application.version, 4)
+        self.ga.refresh_from_db()
+        self.assertEqual(self.ga.version, 1)
+
+        # Nothing published is changed
+        company.refresh_from_db()
+        company.save()
+        Company.objects.get(pk=company.pk).save(update_fields=['updated'])
+        response.last_seen = timezone.now()
+        response.save(update_fields=['last_seen'])
+        self.assertEqual(Company.update_latest_dnb_responses(Company.objects.filter(pk=company.pk)), 0)
+        ga.refresh_from_db()
+        self.assertEqual(ga.version, 4)
+
+    @override_settings(CHANGE_EVENTS_WEBHOOK_URL='http://frontend/change-events/')
+    @patch.object(ChangeEventsClient, 'send', return_value=True)
+    def test_deliver_pending(self, *mocks):
+        self.ga.publish_change('is_event_evidence_requested')
+        self.ga.publish_change('is_event_evidence_approved')
+        self.assertEqual(GrantApplicationChange.deliver_pending(), 2)
+        mocks[0].assert_called_once_with([
+            {'grant_application': self.ga.id, 'version': 2, 'changed_fields': ['is_event_evidence_requested']},
+            {'grant_application': self.ga.id, 'version': 3, 'changed_fields': ['is_event_evidence_approved']},
+        ])
+        self.assertFalse(GrantApplicationChange.objects.filter(delivered__isnull=True).exists())
+        self.assertEqual(GrantApplicationChange.deliver_pending(), 0)
+
+    @override_settings(CHANGE_EVENTS_WEBHOOK_URL='http://frontend/change-events/', CHANGE_EVENTS_MAX_ATTEMPTS=2)
+    @patch.object(ChangeEventsClient, 'send', return_value=False)
+    def test_deliver_pending_gives_up_after_max_attempts(self, *mocks):
+        self.ga.publish_change('is_event_evidence_requested')
+        self.assertEqual(GrantApplicationChange.deliver_pending(), 0)
+        self.assertEqual(GrantApplicationChange.deliver_pending(), 0)
+        self.assertEqual(GrantApplicationChange.objects.get().attempts, 2)
+        GrantApplicationChange.deliver_pending()
+        self.assertEqual(mocks[0].call_count, 2)
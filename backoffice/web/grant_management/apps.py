@@ -1,5 +1,11 @@
 from django.apps import AppConfig
+from viewflow.frontend.apps import ViewflowFrontendConfig
 
 
 class GrantManagementConfig(AppConfig):
     name = 'grant_management'
+
+
+class GrantManagementFrontendConfig(ViewflowFrontendConfig):
+    """The viewflow frontend with inbox, queue and archive lists which don't query each row's process."""
+    viewset = 'web.grant_management.viewsets.GrantManagementFrontendViewSet'
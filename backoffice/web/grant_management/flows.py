@@ -12,15 +12,13 @@ from web.grant_management.forms import (
 )
 from web.grant_management.models import GrantManagementProcess
 from web.grant_management.views import BaseGrantManagementView
+from web.grant_management.viewsets import GrantManagementFlowViewSet
 
 
-@frontend.register
 class GrantManagementFlow(Flow):
     notify_service = NotifyService()
 
-    summary_template = "{{ process.grant_application.company.name" \
-                       "|default:process.grant_application.manual_company_name }} " \
-                       "[{{ process.status }}]"
+    summary_template = "{{ process.grant_application.company_display_name }} [{{ process.status }}]"
 
     process_class = GrantManagementProcess
 
@@ -147,6 +145,8 @@ class GrantManagementFlow(Flow):
         activation.prepare()
         activation.process.grant_application = grant_application
         activation.done()
+        grant_application.publish_change('sent_for_review')
+        grant_application.publish_company_change()
         return activation.process
 
     @method_decorator(flow.flow_func)
@@ -154,6 +154,7 @@ class GrantManagementFlow(Flow):
         activation.prepare()
         grant_application.is_event_evidence_uploaded = True
         grant_application.save()
+        grant_application.publish_change('is_event_evidence_uploaded')
         activation.process = grant_application.flow_process
         activation.done()
 
@@ -172,6 +173,8 @@ class GrantManagementFlow(Flow):
         )
 
     def send_decision_email_callback(self, activation):
+        activation.process.grant_application.publish_change('is_completed', 'grant_management_process')
+        activation.process.grant_application.publish_company_change()
         if activation.process.is_approved:
             self.notify_service.send_application_approved_email(
                 email_address=activation.process.grant_application.applicant_email,
@@ -202,12 +205,14 @@ class GrantManagementFlow(Flow):
         )
         grant_application.is_event_evidence_requested = True
         grant_application.save()
+        grant_application.publish_change('is_event_evidence_requested')
 
     def send_renew_proof_of_event_booking_response_email_callback(self, activation):
         grant_application = activation.process.grant_application
         if activation.process.is_event_booking_document_approved:
             grant_application.is_event_evidence_approved = True
             grant_application.save()
+            grant_application.publish_change('is_event_evidence_approved')
             self.notify_service.send_event_booking_document_approved_email(
                 email_address=grant_application.applicant_email,
                 applicant_full_name=grant_application.applicant_full_name,
@@ -219,3 +224,6 @@ class GrantManagementFlow(Flow):
                 applicant_full_name=grant_application.applicant_full_name,
                 application_id=grant_application.id_str
             )
+
+
+frontend.register(GrantManagementFlow, viewset_class=GrantManagementFlowViewSet)
@@ -0,0 +1,33 @@
+# Generated by Django 3.1.1 on 2026-10-19 18:35
+
+from django.db import migrations, models
+
+
+def populate_summary_text(apps, schema_editor):
+    GrantManagementProcess = apps.get_model('grant_management', 'GrantManagementProcess')
+    processes = GrantManagementProcess.objects.select_related('grant_application__company')
+    for process in processes.iterator():
+        company_name = ''
+        if process.grant_application:
+            company = process.grant_application.company
+            company_name = (company and company.name) or process.grant_application.manual_company_name or ''
+        GrantManagementProcess.objects.filter(pk=process.pk).update(
+            summary_text=f'{company_name} [{process.status}]'[:600]
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('grant_applications', '0024_grantapplication_version_changes'),
+        ('grant_management', '0006_added_event_booking_decision_boolean_field'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='grantmanagementprocess',
+            name='summary_text',
+            field=models.CharField(blank=True, db_index=True, max_length=600),
+        ),
+        migrations.RunPython(populate_summary_text, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 3.1.1 on 2026-10-19 18:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('grant_management', '0007_grantmanagementprocess_summary_text'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='grantmanagementprocess',
+            name='decision',
+            field=models.CharField(choices=[('approved', 'Approved'), ('rejected', 'Rejected')], db_index=True, max_length=10, null=True),
+        ),
+    ]
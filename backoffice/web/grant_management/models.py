@@ -1,7 +1,9 @@
 from django.conf import settings
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.db import models
-from django.db.models import PROTECT
+from django.db.models import CharField, OuterRef, PROTECT, Subquery, Value
+from django.db.models.functions import Coalesce, Concat, Left
+from django.utils.html import escape
 from viewflow.models import Process
 
 
@@ -49,7 +51,41 @@ class GrantManagementProcess(Process):
     event_is_appropriate = models.BooleanField(
         null=True, choices=settings.BOOLEAN_CHOICES
     )
-    decision = models.CharField(null=True, choices=Decision.choices, max_length=10)
+    decision = models.CharField(null=True, choices=Decision.choices, max_length=10, db_index=True)
+    # Copy of the flow summary, kept up to date on save, so that process and task lists don't load
+    # the grant application and company of every row
+    summary_text = models.CharField(max_length=600, blank=True, db_index=True)
+
+    def build_summary_text(self):
+        company_name = ''
+        if self.grant_application:
+            company_name = self.grant_application.company_display_name or ''
+        return f'{company_name} [{self.status}]'[:600]
+
+    @classmethod
+    def update_summary_texts(cls, queryset):
+        """Rebuild the summary text of the processes of queryset in one query, as build_summary_text does."""
+        GrantApplication = cls._meta.get_field('grant_application').related_model
+        company_name = Subquery(
+            GrantApplication.objects.filter(pk=OuterRef('grant_application_id')).values('company_display_name')[:1]
+        )
+        # status is a field of the parent Process table, which an update can't join
+        status = Subquery(cls.objects.filter(pk=OuterRef('pk')).values('status')[:1])
+        return queryset.update(summary_text=Left(
+            Concat(Coalesce(company_name, Value('')), Value(' ['), status, Value(']'), output_field=CharField()),
+            600
+        ))
+
+    def save(self, *args, **kwargs):
+        self.summary_text = self.build_summary_text()
+        if kwargs.get('update_fields') is not None:
+            kwargs['update_fields'] = {*kwargs['update_fields'], 'summary_text'}
+        super().save(*args, **kwargs)
+
+    def summary(self):
+        if self.summary_text:
+            return escape(self.summary_text)
+        return super().summary()
 
     @property
     def is_approved(self):
@@ -1,3 +1,4 @@
+from web.companies.models import DnbGetCompanyResponse
 from web.companies.services import DnbServiceClient, CompaniesHouseClient
 from web.core.exceptions import DnbServiceClientException
 
@@ -12,7 +13,7 @@ class SupportingInformationContent:
         self.grant_application = grant_application
         self.dnb_client = DnbServiceClient()
         self.ch_client = CompaniesHouseClient()
-        self._dnb_company_data = None
+        self._dnb_company_response = None
 
     def _make_table(self, headers=None, rows=None, col_tags=None):
         return {
@@ -22,31 +23,37 @@ class SupportingInformationContent:
         }
 
     @property
-    def dnb_company_data(self):
-        if self._dnb_company_data is None:
+    def dnb_company_response(self):
+        if self._dnb_company_response is None:
             # Look in local DB Cache first.
-            dnb_company_response = self.grant_application.company.last_dnb_get_company_response
-            if dnb_company_response:
-                self._dnb_company_data = dnb_company_response.dnb_data
+            self._dnb_company_response = self.grant_application.company.last_dnb_get_company_response
 
             # If not available then go to dnb-service
-            if not self._dnb_company_data:
+            if self._dnb_company_response is None:
                 try:
-                    self._dnb_company_data = self.dnb_client.get_company(
+                    dnb_company_data = self.dnb_client.get_company(
                         duns_number=self.grant_application.company.duns_number
                     )
                 except DnbServiceClientException:
-                    # leave self._dnb_company as None if not available
-                    pass
-        return self._dnb_company_data
+                    # leave self._dnb_company_response as None if not available
+                    dnb_company_data = None
+                if dnb_company_data:
+                    self._dnb_company_response = DnbGetCompanyResponse(dnb_data=dnb_company_data)
+        return self._dnb_company_response
+
+    @property
+    def dnb_company_data(self):
+        # Loads the full dnb data, the fields shown to reviewers are stored on dnb_company_response
+        if self.dnb_company_response:
+            return self.dnb_company_response.dnb_data
 
     @property
     def verify_business_entity_content(self):
-        if self.dnb_company_data:
+        if self.dnb_company_response:
             return {
-                'employee_number': self.dnb_company_data['employee_number'],
-                'annual_sales': int(self.dnb_company_data['annual_sales'] or 0),
-                'annual_sales_currency': self.dnb_company_data['annual_sales_currency']
+                'employee_number': self.dnb_company_response.employee_number,
+                'annual_sales': int(self.dnb_company_response.annual_sales or 0),
+                'annual_sales_currency': self.dnb_company_response.annual_sales_currency
             }
 
     @property
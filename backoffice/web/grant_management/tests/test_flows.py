@@ -1,6 +1,9 @@
 from unittest.mock import patch
 
+from django.test import override_settings
+
 from web.companies.services import DnbServiceClient
+from web.grant_applications.models import GrantApplicationChange
 from web.grant_management.flows import GrantManagementFlow
 from web.grant_management.tests.helpers import GrantManagementFlowTestHelper
 from web.tests.factories.grant_applications import CompletedGrantApplicationFactory
@@ -27,3 +30,30 @@ class TestGrantManagementFlow(GrantManagementFlowTestHelper, BaseTestCase):
 
     def test_is_start_of_process(self, *mocks):
         self.assertTrue(GrantManagementFlow.start.task_type, 'START')
+
+    @override_settings(CHANGE_EVENTS_WEBHOOK_URL='http://frontend/change-events/')
+    @patch.object(GrantManagementFlow, 'notify_service')
+    def test_start_publishes_sent_for_review_change(self, *mocks):
+        GrantManagementFlow.start.run(grant_application=self.ga)
+        self.ga.refresh_from_db()
+        self.assertEqual(self.ga.version, 2)
+        change = GrantApplicationChange.objects.get(grant_application=self.ga)
+        self.assertEqual(change.version, 2)
+        self.assertEqual(change.changed_fields, ['sent_for_review'])
+
+    @override_settings(CHANGE_EVENTS_WEBHOOK_URL='http://frontend/change-events/')
+    @patch.object(GrantManagementFlow, 'notify_service')
+    def test_start_publishes_company_change_to_other_applications(self, *mocks):
+        other_ga = CompletedGrantApplicationFactory(company=self.ga.company)
+        GrantManagementFlow.start.run(grant_application=self.ga)
+        change = GrantApplicationChange.objects.get(grant_application=other_ga)
+        self.assertEqual(change.changed_fields, ['company'])
+
+    @override_settings(CHANGE_EVENTS_WEBHOOK_URL='http://frontend/change-events/')
+    @patch.object(GrantManagementFlow, 'notify_service')
+    def test_request_event_booking_evidence_publishes_change(self, *mocks):
+        self.client.force_login(self.user)
+        self._start_process_and_step_through_until('create_review_evidence_task')
+        change = GrantApplicationChange.objects.filter(grant_application=self.ga).latest('created')
+        self.assertEqual(change.changed_fields, ['is_event_evidence_requested'])
+        self.assertEqual(change.version, 3)
@@ -20,3 +20,15 @@ class TestGrantManagementProcessModel(BaseTestCase):
         self.gm_process.decision = GrantManagementProcess.Decision.REJECTED
         self.gm_process.save()
         self.assertTrue(self.gm_process.is_rejected)
+
+    def test_summary_text_is_kept_up_to_date(self):
+        gm_process = GrantManagementProcessFactory(grant_application__manual_company_name='company-1')
+        self.assertEqual(gm_process.summary_text, 'company-1 [NEW]')
+        gm_process.status = 'DONE'
+        gm_process.save(update_fields=['status'])
+        gm_process.refresh_from_db()
+        self.assertEqual(gm_process.summary_text, 'company-1 [DONE]')
+
+    def test_summary_is_escaped(self):
+        self.gm_process.summary_text = '<b>company</b> [NEW]'
+        self.assertEqual(self.gm_process.summary(), '&lt;b&gt;company&lt;/b&gt; [NEW]')
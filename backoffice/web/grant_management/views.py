@@ -1,4 +1,7 @@
+from django.db.models import Count, Q
+from django.utils.safestring import mark_safe
 from viewflow.flow.views import UpdateProcessView
+from viewflow.frontend.views import AllArchiveListView, AllQueueListView, AllTaskListView, ProcessListView
 
 from web.grant_management.mixins import SupportingInformationMixin
 
@@ -8,3 +11,39 @@ class BaseGrantManagementView(SupportingInformationMixin, UpdateProcessView):
         'information_card_title': 'Applicant response',
         'form_heading': 'Your assessment',
     }
+
+
+class GrantManagementProcessListView(ProcessListView):
+    """Process list which renders each row from the process alone, see GrantManagementProcess.summary_text."""
+
+    def get_queryset(self):
+        return super().get_queryset().annotate(
+            active_task_count=Count('task', filter=Q(task__finished__isnull=True))
+        )
+
+    def active_tasks(self, process):
+        if process.finished is None:
+            return mark_safe('<a href="{}">{}</a>'.format(
+                self.get_process_link(process), process.active_task_count
+            ))
+        return ''
+    active_tasks.short_description = ProcessListView.active_tasks.short_description
+
+
+class FlowProcessTaskListMixin:
+    """Load the flow process of each task in the same query, it is used to render the task and process summaries."""
+
+    def get_queryset(self):
+        return super().get_queryset().select_related('process__grantmanagementprocess')
+
+
+class GrantManagementInboxView(FlowProcessTaskListMixin, AllTaskListView):
+    pass
+
+
+class GrantManagementQueueView(FlowProcessTaskListMixin, AllQueueListView):
+    pass
+
+
+class GrantManagementArchiveView(FlowProcessTaskListMixin, AllArchiveListView):
+    pass
@@ -0,0 +1,20 @@
+from viewflow.frontend.viewset import FlowViewSet, FrontendViewSet
+
+from web.grant_management.views import (
+    GrantManagementArchiveView, GrantManagementInboxView, GrantManagementProcessListView,
+    GrantManagementQueueView
+)
+
+
+class GrantManagementFlowViewSet(FlowViewSet):
+    process_list_view = [
+        r'^$',
+        GrantManagementProcessListView.as_view(),
+        'index'
+    ]
+
+
+class GrantManagementFrontendViewSet(FrontendViewSet):
+    inbox_view_class = GrantManagementInboxView
+    queue_view_class = GrantManagementQueueView
+    archive_view_class = GrantManagementArchiveView
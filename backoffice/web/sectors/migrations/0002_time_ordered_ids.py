@@ -0,0 +1,19 @@
+# Generated by Django 3.1.1 on 2026-10-19 18:46
+
+from django.db import migrations, models
+import web.core.abstract_models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sectors', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='sector',
+            name='id',
+            field=models.UUIDField(default=web.core.abstract_models.generate_id, editable=False, primary_key=True, serialize=False),
+        ),
+    ]
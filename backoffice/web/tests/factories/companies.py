@@ -1,7 +1,7 @@
 import factory
 
 from web.companies.models import Company, DnbGetCompanyResponse
-from web.tests.external_api_responses import FAKE_DNB_SEARCH_COMPANIES
+from web.core.external_api_responses import FAKE_DNB_SEARCH_COMPANIES
 from web.tests.factories.base import BaseMetaFactory
 
 
@@ -1,6 +1,12 @@
+from contextlib import contextmanager
+
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from rest_framework.test import APITestCase
 
+from web.core.queries import get_query_budget
+
 
 class AssertResponseMixin:
 
@@ -25,11 +31,26 @@ class AssertResponseMixin:
                 self.assertEqual(data[k], v, msg=f'Value for key "{k}" does not match')
 
 
-class BaseAPITestCase(AssertResponseMixin, APITestCase):
+class QueryBudgetMixin:
+
+    @contextmanager
+    def assert_within_query_budget(self, view_name):
+        """Assert the block runs no more queries than the budget configured for view_name."""
+        budget = get_query_budget(view_name)
+        with CaptureQueriesContext(connection) as context:
+            yield context
+        queries = '\n'.join(q['sql'] for q in context.captured_queries)
+        self.assertLessEqual(
+            len(context), budget,
+            msg=f'{view_name} ran {len(context)} queries, budget is {budget}:\n{queries}'
+        )
+
+
+class BaseAPITestCase(AssertResponseMixin, QueryBudgetMixin, APITestCase):
     pass
 
 
-class BaseTestCase(AssertResponseMixin, TestCase):
+class BaseTestCase(AssertResponseMixin, QueryBudgetMixin, TestCase):
 
     def set_session_value(self, key, value):
         s = self.client.session
@@ -52,6 +52,9 @@ INSTALLED_APPS = [
 ] + TAP_APPS
 
 MIDDLEWARE = [
+    'web.core.middleware.LoadSheddingMiddleware',
+    'web.core.middleware.ServerTimingMiddleware',
+    'web.core.profiling.ProfilingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -100,6 +103,19 @@ else:
         }
     }
 
+# Must be shared by all workers in deployed environments, eg. CACHE_URL=dbcache://frontend_cache
+# (followed by `python manage.py createcachetable`)
+CACHES = {'default': env.cache('CACHE_URL', default='locmemcache://')}
+
+# Sessions are either:
+#  - 'db': cached database sessions
+#  - 'cookie': signed cookie sessions, values of SESSION_BLOB_MIN_SIZE bytes or more are stored in the cache
+SESSION_MODE = env('SESSION_MODE', default='db')
+SESSION_ENGINE = {
+    'db': 'django.contrib.sessions.backends.cached_db',
+    'cookie': 'web.core.cookie_sessions',
+}[SESSION_MODE]
+SESSION_BLOB_MIN_SIZE = env.int('SESSION_BLOB_MIN_SIZE', default=512)
 
 # Password validation
 # https://docs.djangoproject.com/en/3.0/ref/settings/#auth-password-validators
@@ -150,6 +166,66 @@ SASS_PROCESSOR_INCLUDE_DIRS = [
 BOOLEAN_CHOICES = [(True, 'Yes'), (False, 'No')]
 
 BACKOFFICE_API_URL = env('BACKOFFICE_API_URL', default=None)
+# Dotted path of a callable returning the requests transport adapter BackofficeService calls the backoffice
+# with, eg. a web.core.transports.StubTransport in tests
+BACKOFFICE_TRANSPORT = 'web.core.transports.http_transport'
+# Independent backoffice calls made by a page are run concurrently on a pool of this many threads
+# (per process). Set to 1 to make them one after another.
+CONCURRENT_CALLS_MAX_WORKERS = env.int('CONCURRENT_CALLS_MAX_WORKERS', default=8)
+
+# Sampled request profiling. Profiles are listed for staff users at /profiling/
+PROFILING_ENABLED = env.bool('PROFILING_ENABLED', default=False)
+# Profile requests sent with an `X-Profile: <PROFILING_TOKEN>` header
+PROFILING_TOKEN = env('PROFILING_TOKEN', default=None)
+PROFILING_SAMPLE_RATE = env.float('PROFILING_SAMPLE_RATE', default=0)
+# Url names (shell-style patterns are allowed) to profile on every request
+PROFILING_ROUTES = env.list('PROFILING_ROUTES', default=[])
+PROFILING_DIR = env('PROFILING_DIR', default=os.path.join(BASE_DIR, '..', 'reports', 'profiles'))
+PROFILING_MAX_FILES = env.int('PROFILING_MAX_FILES', default=100)
+# Filters (regular expressions on file:line(function)) offered on each profile
+PROFILING_HOT_PATHS = {
+    'ApplicationReviewView.get_application_summary': r'grant_applications/views\.py:\d+\(get_application_summary\)',
+    'ApplicationReviewService.section_summary_list': r'grant_applications/services\.py:\d+\(section_summary_list\)',
+}
+
+# Bearer token required to scrape /metrics/ (the endpoint is disabled when unset, unless DEBUG)
+METRICS_TOKEN = env('METRICS_TOKEN', default=None)
+
+# Timeout (seconds) for calls to other services
+UPSTREAM_TIMEOUT = env.float('UPSTREAM_TIMEOUT', default=30)
+
+# Load shedding (see web.core.middleware.LoadSheddingMiddleware), 0 turns a check off.
+# Keep LOAD_SHEDDING_MAX_IN_FLIGHT below the gunicorn threads per worker so that a thread is left to shed.
+LOAD_SHEDDING_MAX_IN_FLIGHT = env.int('LOAD_SHEDDING_MAX_IN_FLIGHT', default=0)
+LOAD_SHEDDING_MAX_QUEUE_TIME = env.float('LOAD_SHEDDING_MAX_QUEUE_TIME', default=0)  # seconds
+LOAD_SHEDDING_RETRY_AFTER = env.int('LOAD_SHEDDING_RETRY_AFTER', default=5)  # seconds
+LOAD_SHEDDING_EXEMPT_PATHS = ['/metrics/']
+
+# Request and response bodies are truncated to LOG_BODY_MAX_LENGTH characters when logged
+LOG_BODY_MAX_LENGTH = env.int('LOG_BODY_MAX_LENGTH', default=1000)
+# Keys whose values are never written to the logs
+LOG_REDACTED_FIELDS = {
+    'email', 'email_address', 'applicant_email', 'applicant_full_name', 'applicant_mobile_number',
+    'personalisation', 'magic_link', 'body', 'password', 'token',
+}
+# Fraction of INFO records kept per logger, eg. LOG_SAMPLE_RATES='web.grant_applications.services=0.1'
+LOG_SAMPLE_RATES = env.dict('LOG_SAMPLE_RATES', cast={'value': float}, default={})
+
+# Company search results shown on the select company page are kept so that the selection can
+# be validated without searching again.
+COMPANY_SEARCH_SNAPSHOT_TIMEOUT = env.int('COMPANY_SEARCH_SNAPSHOT_TIMEOUT', default=60 * 30)  # 30 minutes
+COMPANY_SEARCH_SNAPSHOT_MAX_SIZE = env.int('COMPANY_SEARCH_SNAPSHOT_MAX_SIZE', default=256 * 1024)  # bytes
+
+# Completed applications are remembered so that magic link requests for them skip the backoffice
+COMPLETED_APPLICATION_CACHE_TIMEOUT = env.int('COMPLETED_APPLICATION_CACHE_TIMEOUT', default=60 * 60 * 24 * 7)  # 7 days
+
+# Grant applications read from the backoffice are cached until the backoffice posts a change event for them
+# to /grant-applications/change-events/. Needs a CACHE_URL shared by all instances, 0 disables caching.
+# Changes to events and sectors (only made by data migrations), and updates made directly in the backoffice
+# database or shell, are not published, so cached applications can show them up to this long after.
+GRANT_APPLICATION_CACHE_TIMEOUT = env.int('GRANT_APPLICATION_CACHE_TIMEOUT', default=0)  # seconds
+# Change events are signed by the backoffice with this secret, the webhook is disabled when it is empty
+CHANGE_EVENTS_SECRET = env('CHANGE_EVENTS_SECRET', default='')
 
 MAGIC_LINK_HASH_TTL = 60 * 60 * 24 * 30  # 30 days
 
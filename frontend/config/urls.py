@@ -19,6 +19,8 @@ from django.contrib import admin
 from django.urls import path, include
 from django.views.generic import RedirectView
 
+from web.core.views import metrics, profile_detail, profile_list
+
 handler404 = 'web.core.views.handler404'
 handler500 = 'web.core.views.handler500'
 
@@ -35,6 +37,9 @@ urlpatterns = [
     ),
 
     path('admin/', admin.site.urls),
+    path('metrics/', metrics, name='metrics'),
+    path('profiling/', profile_list, name='profile-list'),
+    path('profiling/<str:name>/', profile_detail, name='profile-detail'),
 
     # Templates
     path('', RedirectView.as_view(url='grant-applications/')),
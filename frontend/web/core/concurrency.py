@@ -0,0 +1,39 @@
+import contextvars
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+
+_executor = None
+_executor_lock = threading.Lock()
+_in_worker = contextvars.ContextVar('in_concurrent_worker', default=False)
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.CONCURRENT_CALLS_MAX_WORKERS, thread_name_prefix='concurrent-calls'
+            )
+    return _executor
+
+
+def _run_in_worker(call):
+    _in_worker.set(True)
+    return call()
+
+
+def run_concurrently(*calls):
+    """Make independent IO bound calls (eg. backoffice requests) at the same time and return their
+    results in order. The first exception raised by a call is re-raised.
+
+    Calls run in a copy of the caller's context so that outbound calls are still recorded for the
+    request. They must not use the database (connections are per thread) or share a requests session.
+    """
+    if len(calls) < 2 or settings.CONCURRENT_CALLS_MAX_WORKERS < 2 or _in_worker.get():
+        return [call() for call in calls]
+
+    executor = _get_executor()
+    futures = [executor.submit(contextvars.copy_context().run, _run_in_worker, call) for call in calls]
+    return [future.result() for future in futures]
@@ -0,0 +1,62 @@
+import hashlib
+
+from django.conf import settings
+from django.contrib.sessions.backends.signed_cookies import SessionStore as SignedCookieSessionStore
+from django.core import signing
+from django.core.cache import cache
+
+CACHE_REFERENCE_KEY = '__session_cache__'
+
+
+def _cache_key(value):
+    if isinstance(value, dict) and len(value) == 1:
+        return value.get(CACHE_REFERENCE_KEY)
+
+
+class SessionStore(SignedCookieSessionStore):
+    """Signed cookie sessions which keep large values in the cache.
+
+    Small values are kept in the (signed, not encrypted) session cookie so that sessions don't touch
+    the database. Values which serialize to SESSION_BLOB_MIN_SIZE bytes or more are stored in the
+    cache, keyed on their content, and the cookie only holds a reference to them. References are
+    resolved when the session is loaded, a value which has been evicted from the cache is treated as
+    missing.
+    """
+
+    def load(self):
+        """The session data with cached values in place of their references, so that every accessor
+        of the session returns the values themselves. Evicted values are left out.
+        """
+        session_data = super().load()
+        cache_keys = {key: _cache_key(value) for key, value in session_data.items() if _cache_key(value)}
+        if not cache_keys:
+            return session_data
+        cached_data = cache.get_many(cache_keys.values())
+        serializer = self.serializer()
+        for key, cache_key in cache_keys.items():
+            if cache_key in cached_data:
+                session_data[key] = serializer.loads(cached_data[cache_key])
+            else:
+                del session_data[key]
+        return session_data
+
+    def _store_in_cache(self, session_data):
+        serializer = self.serializer()
+        stored_data = {}
+        for key, value in session_data.items():
+            if not _cache_key(value):
+                data = serializer.dumps(value)
+                if len(data) >= settings.SESSION_BLOB_MIN_SIZE:
+                    cache_key = f'session-value:{hashlib.sha256(data).hexdigest()}'
+                    cache.set(cache_key, data, timeout=self.get_session_cookie_age())
+                    value = {CACHE_REFERENCE_KEY: cache_key}
+            stored_data[key] = value
+        return stored_data
+
+    def _get_session_key(self):
+        session_cache = getattr(self, '_session_cache', {})
+        return signing.dumps(
+            self._store_in_cache(session_cache), compress=True,
+            salt='django.contrib.sessions.backends.signed_cookies',
+            serializer=self.serializer,
+        )
@@ -0,0 +1,308 @@
+import json
+import os
+import re
+import statistics
+import subprocess
+import time
+import uuid
+from collections import defaultdict
+from contextlib import contextmanager
+from unittest.mock import patch
+
+import requests
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, setup_test_environment
+from django.urls import reverse
+from django.utils import timezone
+
+from web.grant_applications.constants import APPLICATION_BACKOFFICE_ID_SESSION_KEY
+from web.grant_applications.models import GrantApplicationLink
+from web.grant_applications.services import BackofficeService
+
+
+# The backoffice reports the queries it ran in its Server-Timing header
+SERVER_TIMING_DB_QUERIES_PATTERN = re.compile(r'db;[^,]*desc="(\d+) queries"')
+
+
+class BackofficeCallCounter:
+    """Counts the round trips made to the backoffice api, and the queries they ran, while it is installed."""
+
+    def __init__(self):
+        self.count = 0
+        self.sql_queries = 0
+        self._send = requests.Session.send
+
+    def send(self, session, request, **kwargs):
+        response = self._send(session, request, **kwargs)
+        if request.url.startswith(settings.BACKOFFICE_API_URL):
+            self.count += 1
+            match = SERVER_TIMING_DB_QUERIES_PATTERN.search(response.headers.get('Server-Timing', ''))
+            if match:
+                self.sql_queries += int(match.group(1))
+        return response
+
+    @contextmanager
+    def install(self):
+        counter = self
+
+        def send(session, request, **kwargs):
+            return counter.send(session, request, **kwargs)
+
+        with patch.object(requests.Session, 'send', send):
+            yield self
+
+
+class Command(BaseCommand):
+    help = "Benchmark the applicant journey against a running backoffice"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--iterations',
+            help='Number of complete journeys to run',
+            type=int,
+            default=5
+        )
+        parser.add_argument(
+            '--duns-number',
+            help='DUNS number of the company to select (must be returned by dnb-service)',
+            default='239896579'
+        )
+        parser.add_argument(
+            '--output',
+            help='Path of the JSON results file. Defaults to reports/benchmarks/',
+        )
+        parser.add_argument(
+            '--compare',
+            help='Path of a previous JSON results file to compare against',
+        )
+
+    def get_commit(self):
+        try:
+            return subprocess.check_output(
+                ['git', 'rev-parse', '--short', 'HEAD'], stderr=subprocess.DEVNULL
+            ).decode().strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    def get_reference_data(self):
+        service = BackofficeService()
+        trade_events = service.list_trade_events(page=1, page_size=1)
+        sectors = service.list_sectors()
+        if not trade_events['results'] or not sectors:
+            raise CommandError('The backoffice needs trade events and sectors. Run `make seed-db`.')
+        return {'event': trade_events['results'][0]['id'], 'sector': sectors[0]['id']}
+
+    def get_steps(self, email, reference_data):
+        search_term = 'benchmark company'
+        return [
+            ('new-application-email', 'POST', None, {'email': email}),
+            ('previous-applications', 'GET', None, None),
+            ('previous-applications', 'POST', None, {'previous_applications': 0}),
+            ('find-an-event', 'GET', None, None),
+            ('find-an-event', 'POST', None, {}),
+            ('select-an-event', 'GET', None, None),
+            ('select-an-event', 'POST', None, {'event': reference_data['event']}),
+            ('event-commitment', 'GET', None, None),
+            ('event-commitment', 'POST', None, {'is_already_committed_to_event': False}),
+            ('search-company', 'GET', None, None),
+            ('search-company', 'POST', None, {'search_term': search_term}),
+            ('select-company', 'GET', {'search_term': search_term}, None),
+            ('select-company', 'POST', {'search_term': search_term}, {
+                'duns_number': self.duns_number
+            }),
+            ('company-details', 'GET', None, None),
+            ('company-details', 'POST', None, {
+                'number_of_employees': 'fewer-than-10',
+                'is_turnover_greater_than': False,
+            }),
+            ('contact-details', 'GET', None, None),
+            ('contact-details', 'POST', None, {
+                'applicant_full_name': 'Benchmark Applicant',
+                'applicant_email': email,
+                'applicant_mobile_number': '07777777777',
+                'job_title': 'Director',
+            }),
+            ('company-trading-details', 'GET', None, None),
+            ('company-trading-details', 'POST', None, {
+                'previous_years_turnover_1': '1000',
+                'previous_years_turnover_2': '1000',
+                'previous_years_turnover_3': '1000',
+                'previous_years_export_turnover_1': '100',
+                'previous_years_export_turnover_2': '100',
+                'previous_years_export_turnover_3': '100',
+                'sector': reference_data['sector'],
+                'products_and_services_description': 'A description',
+                'products_and_services_competitors': 'A description',
+            }),
+            ('export-experience', 'GET', None, None),
+            ('export-experience', 'POST', None, {
+                'has_exported_before': False,
+                'has_product_or_service_for_export': True,
+            }),
+            ('trade-event-details', 'GET', None, None),
+            ('trade-event-details', 'POST', None, {
+                'interest_in_event_description': 'A description',
+                'is_in_contact_with_tcp': False,
+                'is_intending_to_exhibit_as_tcp_stand': False,
+                'stand_trade_name': 'A name',
+                'trade_show_experience_description': 'A description',
+                'additional_guidance': 'Some guidance',
+            }),
+            ('state-aid-summary', 'GET', None, None),
+            ('state-aid-summary', 'POST', None, {}),
+            ('application-review', 'GET', None, None),
+            ('application-review', 'POST', None, {}),
+        ]
+
+    def get_url(self, step, link, query_params):
+        if link is None:
+            url = reverse(f'grant-applications:{step}')
+        else:
+            url = reverse(f'grant-applications:{step}', args=(link.pk,))
+        if query_params:
+            url = f"{url}?{'&'.join(f'{k}={v}' for k, v in query_params.items())}"
+        return url
+
+    def run_journey(self, reference_data):
+        client = Client()
+        email = f'benchmark+{uuid.uuid4()}@example.com'
+        link = None
+        measurements = []
+
+        for step, method, query_params, data in self.get_steps(email, reference_data):
+            url = self.get_url(step, link, query_params)
+            counter = BackofficeCallCounter()
+
+            with counter.install(), CaptureQueriesContext(connection) as queries:
+                start = time.perf_counter()
+                if method == 'GET':
+                    response = client.get(url)
+                else:
+                    response = client.post(url, data=data)
+                latency = time.perf_counter() - start
+
+            if response.status_code >= 400 or (method == 'POST' and response.status_code == 200):
+                raise CommandError(f'{method} {url} failed with status {response.status_code}')
+
+            measurements.append({
+                'step': step,
+                'method': method,
+                'latency_ms': latency * 1000,
+                'backoffice_calls': counter.count,
+                'backoffice_sql_queries': counter.sql_queries,
+                'sql_queries': len(queries),
+            })
+
+            if link is None:
+                link = GrantApplicationLink.objects.get(
+                    backoffice_grant_application_id=client.session[APPLICATION_BACKOFFICE_ID_SESSION_KEY]
+                )
+
+        return measurements
+
+    @staticmethod
+    def _percentile(values, percent):
+        values = sorted(values)
+        index = min(len(values) - 1, round(percent / 100 * (len(values) - 1)))
+        return values[index]
+
+    def summarise(self, journeys):
+        grouped = defaultdict(list)
+        for measurements in journeys:
+            for m in measurements:
+                grouped[(m['step'], m['method'])].append(m)
+
+        steps = []
+        for (step, method), measurements in grouped.items():
+            latencies = [m['latency_ms'] for m in measurements]
+            steps.append({
+                'step': step,
+                'method': method,
+                'latency_ms': {
+                    'min': round(min(latencies), 2),
+                    'median': round(statistics.median(latencies), 2),
+                    'p95': round(self._percentile(latencies, 95), 2),
+                    'max': round(max(latencies), 2),
+                },
+                'backoffice_calls': max(m['backoffice_calls'] for m in measurements),
+                'backoffice_sql_queries': max(m['backoffice_sql_queries'] for m in measurements),
+                'sql_queries': max(m['sql_queries'] for m in measurements),
+            })
+
+        journey_latencies = [sum(m['latency_ms'] for m in measurements) for measurements in journeys]
+        return {
+            'steps': steps,
+            'journey': {
+                'latency_ms': {
+                    'median': round(statistics.median(journey_latencies), 2),
+                    'max': round(max(journey_latencies), 2),
+                },
+                'backoffice_calls': sum(s['backoffice_calls'] for s in steps),
+                'backoffice_sql_queries': sum(s['backoffice_sql_queries'] for s in steps),
+                'sql_queries': sum(s['sql_queries'] for s in steps),
+            }
+        }
+
+    def write_results(self, results, output):
+        if not output:
+            name = results['meta']['commit'] or timezone.now().strftime('%Y%m%d%H%M%S')
+            output = os.path.join('reports', 'benchmarks', f'applicant-journey-{name}.json')
+        os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+        with open(output, 'w') as f:
+            json.dump(results, f, indent=2)
+        return output
+
+    def print_results(self, results, previous=None):
+        previous_steps = {
+            (s['step'], s['method']): s for s in (previous or {}).get('steps', [])
+        }
+        self.stdout.write(
+            f"{'step':<28}{'method':<8}{'median ms':>12}{'p95 ms':>10}{'backoffice':>12}{'bo sql':>8}{'sql':>6}"
+        )
+        for s in results['steps']:
+            line = (
+                f"{s['step']:<28}{s['method']:<8}{s['latency_ms']['median']:>12}"
+                f"{s['latency_ms']['p95']:>10}{s['backoffice_calls']:>12}{s['backoffice_sql_queries']:>8}"
+                f"{s['sql_queries']:>6}"
+            )
+            previous_step = previous_steps.get((s['step'], s['method']))
+            if previous_step:
+                delta = s['latency_ms']['median'] - previous_step['latency_ms']['median']
+                line += f"  ({delta:+.2f} ms)"
+            self.stdout.write(line)
+        journey = results['journey']
+        self.stdout.write(
+            f"Journey median {journey['latency_ms']['median']} ms, "
+            f"{journey['backoffice_calls']} backoffice calls, "
+            f"{journey['backoffice_sql_queries']} backoffice SQL queries, "
+            f"{journey['sql_queries']} frontend SQL queries"
+        )
+
+    def handle(self, *args, **options):
+        self.duns_number = options['duns_number']
+        setup_test_environment()
+
+        reference_data = self.get_reference_data()
+        journeys = [self.run_journey(reference_data) for _ in range(options['iterations'])]
+
+        results = {
+            'meta': {
+                'commit': self.get_commit(),
+                'created': timezone.now().isoformat(),
+                'iterations': options['iterations'],
+                'backoffice_api_url': settings.BACKOFFICE_API_URL,
+            },
+            **self.summarise(journeys)
+        }
+
+        previous = None
+        if options['compare']:
+            with open(options['compare']) as f:
+                previous = json.load(f)
+
+        self.print_results(results, previous=previous)
+        output = self.write_results(results, options['output'])
+        self.stdout.write(self.style.SUCCESS(f'Results written to {output}'))
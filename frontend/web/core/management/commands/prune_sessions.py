@@ -0,0 +1,30 @@
+import time
+
+from django.contrib.sessions.models import Session
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+
+class Command(BaseCommand):
+    help = "Delete expired database sessions in batches"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Rows deleted per query')
+        parser.add_argument(
+            '--pause', type=float, default=0.1, help='Seconds to wait between batches, to spread out the load'
+        )
+
+    def _delete_in_batches(self, queryset, batch_size, pause):
+        total = 0
+        while True:
+            batch = list(queryset.values_list('pk', flat=True)[:batch_size])
+            if not batch:
+                return total
+            total += queryset.model.objects.filter(pk__in=batch).delete()[0]
+            time.sleep(pause)
+
+    def handle(self, *args, **options):
+        deleted = self._delete_in_batches(
+            Session.objects.filter(expire_date__lt=timezone.now()), options['batch_size'], options['pause']
+        )
+        self.stdout.write(f'Deleted {deleted} expired sessions')
@@ -0,0 +1,100 @@
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.http import HttpResponse
+
+from web.core.instrumentation import server_timing_header, start_recording, stop_recording, summarise_calls
+from web.core.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+registry.describe('requests_shed_total', 'Requests answered with a 503 by the load shedding middleware.')
+
+
+class ServerTimingMiddleware:
+    """Aggregate the outbound calls made while handling a request.
+
+    The per upstream totals are returned in a `Server-Timing` header and recorded against the view
+    so that the upstream dominating each page can be seen in the metrics.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = start_recording()
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            calls = stop_recording(token)
+
+        response['Server-Timing'] = server_timing_header(calls, total_duration=time.perf_counter() - start)
+
+        view_name = getattr(request.resolver_match, 'view_name', None) or 'unresolved'
+        for upstream, summary in summarise_calls(calls).items():
+            registry.observe(
+                'request_outbound_duration_seconds',
+                summary['duration'],
+                labels={'view': view_name, 'upstream': upstream}
+            )
+        return response
+
+
+def _queue_time(request):
+    """Seconds since the router received the request, from an `X-Request-Start` header in seconds,
+    milliseconds or microseconds since the epoch (optionally prefixed with `t=`)."""
+    header = request.headers.get('X-Request-Start', '')
+    try:
+        start = float(header[2:] if header.startswith('t=') else header)
+    except ValueError:
+        return None
+    while start > 1e11:
+        start /= 1000
+    return time.time() - start
+
+
+class LoadSheddingMiddleware:
+    """Return a fast 503 rather than queueing more requests behind a slow upstream.
+
+    A request is shed when:
+     - LOAD_SHEDDING_MAX_IN_FLIGHT requests are already being handled by this process
+     - it waited more than LOAD_SHEDDING_MAX_QUEUE_TIME seconds to get here (see `X-Request-Start`)
+    Either check is off when set to 0. Paths in LOAD_SHEDDING_EXEMPT_PATHS are never shed.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.in_flight = 0
+        self.lock = threading.Lock()
+
+    def _shed(self, request, reason):
+        registry.inc('requests_shed_total', labels={'reason': reason})
+        logger.warning('Request shed (%s): %s %s', reason, request.method, request.path)
+        response = HttpResponse('Service temporarily unavailable, please try again.', status=503)
+        response['Retry-After'] = settings.LOAD_SHEDDING_RETRY_AFTER
+        return response
+
+    def __call__(self, request):
+        if request.path in settings.LOAD_SHEDDING_EXEMPT_PATHS:
+            return self.get_response(request)
+
+        if settings.LOAD_SHEDDING_MAX_QUEUE_TIME:
+            queue_time = _queue_time(request)
+            if queue_time is not None and queue_time > settings.LOAD_SHEDDING_MAX_QUEUE_TIME:
+                return self._shed(request, 'queue_time')
+
+        with self.lock:
+            is_full = 0 < settings.LOAD_SHEDDING_MAX_IN_FLIGHT <= self.in_flight
+            if not is_full:
+                self.in_flight += 1
+        if is_full:
+            return self._shed(request, 'in_flight')
+
+        try:
+            return self.get_response(request)
+        finally:
+            with self.lock:
+                self.in_flight -= 1
@@ -0,0 +1,125 @@
+import cProfile
+import io
+import logging
+import os
+import pstats
+import random
+import re
+import time
+import uuid
+from fnmatch import fnmatchcase
+
+from django.conf import settings
+from django.urls import Resolver404, resolve
+from django.utils import timezone
+from django.utils.crypto import constant_time_compare
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = 'X-Profile'
+PROFILE_NAME_PATTERN = re.compile(r'^[\w.-]+\.prof$')
+
+
+def _view_name(request):
+    try:
+        return resolve(request.path_info).view_name
+    except Resolver404:
+        return None
+
+
+def should_profile(request, view_name):
+    if not settings.PROFILING_ENABLED:
+        return False
+    token = request.headers.get(PROFILE_HEADER)
+    if token and settings.PROFILING_TOKEN and constant_time_compare(token, settings.PROFILING_TOKEN):
+        return True
+    if view_name and any(fnmatchcase(view_name, pattern) for pattern in settings.PROFILING_ROUTES):
+        return True
+    return random.random() < settings.PROFILING_SAMPLE_RATE
+
+
+def save_profile(profile, request, view_name, duration):
+    os.makedirs(settings.PROFILING_DIR, exist_ok=True)
+    safe_view_name = re.sub(r'[^\w-]', '-', view_name or 'unresolved')
+    name = (
+        f"{timezone.now().strftime('%Y%m%dT%H%M%S')}_{safe_view_name}_{request.method}_"
+        f"{round(duration * 1000)}ms_{uuid.uuid4().hex[:8]}.prof"
+    )
+    profile.dump_stats(os.path.join(settings.PROFILING_DIR, name))
+    prune_profiles()
+    return name
+
+
+def list_profiles():
+    """Stored profile file names, newest first."""
+    if not os.path.isdir(settings.PROFILING_DIR):
+        return []
+    return sorted((f for f in os.listdir(settings.PROFILING_DIR) if PROFILE_NAME_PATTERN.match(f)), reverse=True)
+
+
+def prune_profiles():
+    for name in list_profiles()[settings.PROFILING_MAX_FILES:]:
+        try:
+            os.remove(os.path.join(settings.PROFILING_DIR, name))
+        except FileNotFoundError:
+            pass
+
+
+def get_profile_path(name):
+    if not PROFILE_NAME_PATTERN.match(name):
+        return None
+    path = os.path.join(settings.PROFILING_DIR, name)
+    return path if os.path.isfile(path) else None
+
+
+def render_profile(path, sort='cumulative', restriction=None, limit=60):
+    """Render a stored profile as text. When a restriction (regex) is given the callees of each
+    matching function are included, giving the call tree below the hot path.
+    """
+    stream = io.StringIO()
+    stats = pstats.Stats(path, stream=stream).sort_stats(sort)
+    if restriction:
+        stats.print_stats(restriction, limit)
+        stats.print_callees(restriction, limit)
+    else:
+        stats.print_stats(limit)
+    return stream.getvalue()
+
+
+class ProfilingMiddleware:
+    """Profile sampled requests with cProfile and store the profiles in settings.PROFILING_DIR.
+
+    A request is profiled when PROFILING_ENABLED is on and either:
+     - it has an `X-Profile` header matching PROFILING_TOKEN
+     - its url name matches one of PROFILING_ROUTES
+     - it is sampled at PROFILING_SAMPLE_RATE
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        view_name = _view_name(request)
+        if not should_profile(request, view_name):
+            return self.get_response(request)
+
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Another profiler is already active in this thread
+            return self.get_response(request)
+
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            profile.disable()
+
+        try:
+            name = save_profile(profile, request, view_name, time.perf_counter() - start)
+        except OSError as e:
+            logger.error('Could not save profile', exc_info=e)
+        else:
+            response['X-Profile-Name'] = name
+        return response
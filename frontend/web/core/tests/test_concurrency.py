@@ -0,0 +1,55 @@
+import threading
+import time
+
+import httpretty
+from django.test import override_settings
+
+from web.core.concurrency import run_concurrently
+from web.core.instrumentation import InstrumentedSession, start_recording, stop_recording
+from web.tests.helpers.testcases import BaseTestCase
+
+
+class TestRunConcurrently(BaseTestCase):
+
+    def test_results_are_in_order(self):
+        def slow():
+            time.sleep(0.05)
+            return 'slow'
+
+        self.assertEqual(run_concurrently(slow, lambda: 'fast'), ['slow', 'fast'])
+
+    def test_calls_run_at_the_same_time(self):
+        barrier = threading.Barrier(2, timeout=1)
+        # Each call waits for the other, so this would time out if they were made one after another
+        self.assertEqual(sorted(run_concurrently(barrier.wait, barrier.wait)), [0, 1])
+
+    def test_exception_is_raised(self):
+        def fail():
+            raise ValueError('bad value')
+
+        with self.assertRaisesRegex(ValueError, 'bad value'):
+            run_concurrently(lambda: None, fail)
+
+    @httpretty.activate
+    def test_outbound_calls_are_recorded(self):
+        httpretty.register_uri(httpretty.GET, 'http://test.com/api/sectors/', status=200)
+
+        def call():
+            InstrumentedSession(upstream='backoffice').get('http://test.com/api/sectors/')
+
+        token = start_recording()
+        run_concurrently(call, call)
+        calls = stop_recording(token)
+        self.assertEqual(len(calls), 2)
+
+    def test_nested_calls_are_made_in_the_worker_thread(self):
+        def nested():
+            return run_concurrently(threading.get_ident, threading.get_ident)
+
+        results = run_concurrently(nested, nested)
+        for idents in results:
+            self.assertEqual(len(set(idents)), 1)
+
+    @override_settings(CONCURRENT_CALLS_MAX_WORKERS=1)
+    def test_calls_are_made_in_caller_thread_when_disabled(self):
+        self.assertEqual(run_concurrently(threading.get_ident, threading.get_ident), [threading.get_ident()] * 2)
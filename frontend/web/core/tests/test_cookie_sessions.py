@@ -0,0 +1,70 @@
+from django.core.cache import cache
+from django.core.signing import loads
+from django.test import override_settings
+
+from web.core.cookie_sessions import CACHE_REFERENCE_KEY, SessionStore
+from web.tests.helpers.testcases import BaseTestCase
+
+
+@override_settings(SESSION_BLOB_MIN_SIZE=100)
+class TestCookieSessionStore(BaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.large_value = {'answer': 'a' * 200}
+
+    def make_session(self, **data):
+        session = SessionStore()
+        session.update(data)
+        session.save()
+        return session
+
+    def cookie_data(self, session):
+        return loads(
+            session.session_key, salt='django.contrib.sessions.backends.signed_cookies',
+            serializer=session.serializer
+        )
+
+    def test_small_values_are_stored_in_cookie(self):
+        session = self.make_session(application_id='1')
+        self.assertEqual(self.cookie_data(session), {'application_id': '1'})
+        with self.assertNumQueries(0):
+            self.assertEqual(SessionStore(session.session_key)['application_id'], '1')
+
+    def test_large_values_are_stored_in_cache(self):
+        session = self.make_session(application_id='1', summary=self.large_value)
+        self.assertIn(CACHE_REFERENCE_KEY, self.cookie_data(session)['summary'])
+        self.assertEqual(SessionStore(session.session_key)['summary'], self.large_value)
+
+    def test_evicted_value_is_missing(self):
+        session = self.make_session(summary=self.large_value)
+        cache.clear()
+        session = SessionStore(session.session_key)
+        self.assertIsNone(session.get('summary'))
+        self.assertRaises(KeyError, session.__getitem__, 'summary')
+
+    def test_changed_value_is_saved(self):
+        session = self.make_session(summary=self.large_value)
+        session = SessionStore(session.session_key)
+        session['summary']['answer'] = 'b' * 200
+        session.modified = True
+        session.save()
+        self.assertEqual(SessionStore(session.session_key)['summary'], {'answer': 'b' * 200})
+
+    def test_accessors_return_cached_values(self):
+        session = self.make_session(application_id='1', summary=self.large_value)
+        session = SessionStore(session.session_key)
+        self.assertIn('summary', session)
+        self.assertEqual(dict(session.items()), {'application_id': '1', 'summary': self.large_value})
+        self.assertEqual(list(session.values()), ['1', self.large_value])
+        self.assertEqual(session.setdefault('summary', None), self.large_value)
+        self.assertEqual(session.pop('summary'), self.large_value)
+
+    def test_evicted_value_is_not_in_session(self):
+        session = self.make_session(application_id='1', summary=self.large_value)
+        cache.clear()
+        session = SessionStore(session.session_key)
+        self.assertNotIn('summary', session)
+        self.assertEqual(dict(session.items()), {'application_id': '1'})
+        self.assertIsNone(session.pop('summary', None))
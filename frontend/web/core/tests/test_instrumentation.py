@@ -0,0 +1,155 @@
+import threading
+from unittest.mock import patch
+
+import httpretty
+from django.test import override_settings
+from django.urls import reverse
+
+from web.core.instrumentation import (
+    InstrumentedSession, endpoint_template, get_thread_session, server_timing_header, start_recording,
+    stop_recording
+)
+from web.core.metrics import registry
+from web.tests.helpers.testcases import BaseTestCase
+
+
+class TestEndpointTemplate(BaseTestCase):
+
+    def test_uuids_and_numbers_are_collapsed(self):
+        self.assertEqual(
+            endpoint_template(
+                'http://test.com/api/grant-applications/0ab1c2d3-1111-2222-3333-444455556666/state-aid/12/'
+            ),
+            '/api/grant-applications/{id}/state-aid/{id}/'
+        )
+
+    def test_query_string_is_dropped(self):
+        self.assertEqual(endpoint_template('http://test.com/api/sectors/?page=1'), '/api/sectors/')
+
+
+class TestInstrumentedSession(BaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        registry.clear()
+        self.session = InstrumentedSession(upstream='backoffice')
+        self.url = 'http://test.com/api/companies/1/'
+
+    @httpretty.activate
+    def test_call_is_recorded(self):
+        httpretty.register_uri(httpretty.GET, self.url, status=200, body='{"id": 1}')
+        token = start_recording()
+        self.session.get(self.url)
+        calls = stop_recording(token)
+
+        self.assertEqual(len(calls), 1)
+        call_data = calls[0].as_dict()
+        call_data.pop('duration_ms')
+        self.assertDictEqual(
+            call_data,
+            {
+                'upstream': 'backoffice',
+                'method': 'GET',
+                'endpoint': '/api/companies/{id}/',
+                'status': 200,
+                'retries': 0,
+                'bytes': 9,
+            }
+        )
+        self.assertIn(
+            'outbound_requests_total{endpoint="/api/companies/{id}/",method="GET",status="200",'
+            'upstream="backoffice"} 1',
+            registry.render()
+        )
+
+    @httpretty.activate
+    def test_call_is_recorded_when_a_response_hook_raises(self):
+        def raise_hook(response, **kwargs):
+            raise ValueError
+
+        httpretty.register_uri(httpretty.GET, self.url, status=400)
+        self.session.hooks['response'] = [raise_hook]
+        token = start_recording()
+        self.assertRaises(ValueError, self.session.get, self.url)
+        calls = stop_recording(token)
+        self.assertEqual(calls[0].status, 400)
+
+    def test_calls_outside_of_a_request_are_still_counted(self):
+        with httpretty.enabled():
+            httpretty.register_uri(httpretty.GET, self.url, status=200)
+            self.session.get(self.url)
+        self.assertIn('outbound_requests_total', registry.render())
+
+    @patch('requests.Session.send')
+    def test_default_timeout(self, send):
+        InstrumentedSession(upstream='backoffice', timeout=5).get(self.url)
+        self.assertEqual(send.call_args[1]['timeout'], 5)
+
+
+class TestGetThreadSession(BaseTestCase):
+
+    def factory(self):
+        return InstrumentedSession(upstream='test')
+
+    def test_session_is_reused_by_thread(self):
+        session = get_thread_session('test', self.factory)
+        self.assertIs(get_thread_session('test', self.factory), session)
+        self.assertIsNot(get_thread_session('other', self.factory), session)
+
+    def test_threads_have_their_own_session(self):
+        sessions = []
+        thread = threading.Thread(target=lambda: sessions.append(get_thread_session('test', self.factory)))
+        thread.start()
+        thread.join()
+        self.assertIsNot(sessions[0], get_thread_session('test', self.factory))
+
+    @httpretty.activate
+    def test_cookies_are_not_stored(self):
+        httpretty.register_uri(httpretty.GET, 'http://test.com/', status=200, set_cookie='sessionid=1')
+        session = get_thread_session('cookies', self.factory)
+        session.get('http://test.com/')
+        self.assertEqual(len(session.cookies), 0)
+
+
+class TestServerTiming(BaseTestCase):
+
+    def test_server_timing_header(self):
+        session = InstrumentedSession(upstream='backoffice')
+        with httpretty.enabled():
+            httpretty.register_uri(httpretty.GET, 'http://test.com/api/sectors/', status=200)
+            token = start_recording()
+            session.get('http://test.com/api/sectors/')
+            session.get('http://test.com/api/sectors/')
+            calls = stop_recording(token)
+
+        header = server_timing_header(calls, total_duration=0.5)
+        self.assertRegex(header, r'^backoffice;dur=[\d.]+;desc="2 calls, 0 retries", total;dur=500.0$')
+
+    def test_server_timing_header_is_added_to_responses(self):
+        response = self.client.get(reverse('grant-applications:index'))
+        self.assertIn('Server-Timing', response)
+        self.assertRegex(response['Server-Timing'], r'total;dur=[\d.]+$')
+
+
+class TestMetricsView(BaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.url = reverse('metrics')
+
+    @override_settings(DEBUG=False, METRICS_TOKEN=None)
+    def test_disabled_without_token(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 404)
+
+    @override_settings(METRICS_TOKEN='a-token')
+    def test_token_is_required(self):
+        response = self.client.get(self.url, HTTP_AUTHORIZATION='Bearer wrong-token')
+        self.assertEqual(response.status_code, 403)
+
+    @override_settings(METRICS_TOKEN='a-token')
+    def test_metrics_are_rendered(self):
+        registry.inc('a_counter', labels={'upstream': 'backoffice'})
+        response = self.client.get(self.url, HTTP_AUTHORIZATION='Bearer a-token')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('a_counter{upstream="backoffice"}', response.content.decode())
@@ -0,0 +1,117 @@
+import os
+import tempfile
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.test import override_settings
+from django.urls import reverse
+
+from web.core.profiling import list_profiles
+from web.tests.helpers.testcases import BaseTestCase
+
+
+class ProfilingTestCase(BaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.profiling_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.profiling_dir.cleanup)
+        settings_override = override_settings(
+            PROFILING_ENABLED=True,
+            PROFILING_TOKEN='a-token',
+            PROFILING_SAMPLE_RATE=0,
+            PROFILING_ROUTES=[],
+            PROFILING_DIR=self.profiling_dir.name,
+            PROFILING_MAX_FILES=2,
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.url = reverse('grant-applications:before-you-start')
+
+
+class TestProfilingMiddleware(ProfilingTestCase):
+
+    def test_request_is_not_profiled_by_default(self):
+        response = self.client.get(self.url)
+        self.assertNotIn('X-Profile-Name', response)
+        self.assertEqual(list_profiles(), [])
+
+    def test_request_is_profiled_with_token_header(self):
+        response = self.client.get(self.url, HTTP_X_PROFILE='a-token')
+        self.assertEqual(list_profiles(), [response['X-Profile-Name']])
+        self.assertRegex(
+            response['X-Profile-Name'], r'^\d{8}T\d{6}_grant-applications-before-you-start_GET_\d+ms_\w{8}\.prof$'
+        )
+
+    def test_request_is_not_profiled_with_wrong_token(self):
+        response = self.client.get(self.url, HTTP_X_PROFILE='wrong-token')
+        self.assertNotIn('X-Profile-Name', response)
+
+    def test_request_is_profiled_by_route(self):
+        with override_settings(PROFILING_ROUTES=['grant-applications:*']):
+            response = self.client.get(self.url)
+        self.assertIn('X-Profile-Name', response)
+
+    @patch('web.core.profiling.random.random', return_value=0.4)
+    def test_request_is_profiled_by_sample_rate(self, *mocks):
+        with override_settings(PROFILING_SAMPLE_RATE=0.5):
+            response = self.client.get(self.url)
+        self.assertIn('X-Profile-Name', response)
+
+    def test_request_is_not_profiled_when_disabled(self):
+        with override_settings(PROFILING_ENABLED=False):
+            response = self.client.get(self.url, HTTP_X_PROFILE='a-token')
+        self.assertNotIn('X-Profile-Name', response)
+
+    def test_profiles_are_pruned(self):
+        for _ in range(3):
+            self.client.get(self.url, HTTP_X_PROFILE='a-token')
+        self.assertEqual(len(os.listdir(self.profiling_dir.name)), 2)
+
+
+class TestProfilingViews(ProfilingTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.name = self.client.get(self.url, HTTP_X_PROFILE='a-token')['X-Profile-Name']
+        self.staff_user = User.objects.create_user(username='staff', is_staff=True)
+
+    def test_staff_only(self):
+        response = self.client.get(reverse('profile-list'))
+        self.assertEqual(response.status_code, 302)
+
+    def test_list(self):
+        self.client.force_login(self.staff_user)
+        response = self.client.get(reverse('profile-list'))
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, reverse('profile-detail', args=(self.name,)))
+
+    def test_detail(self):
+        self.client.force_login(self.staff_user)
+        response = self.client.get(
+            reverse('profile-detail', args=(self.name,)), {'filter': r'\(__call__\)'}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'function calls')
+        self.assertContains(response, 'called...')
+
+    def test_detail_invalid_sort(self):
+        self.client.force_login(self.staff_user)
+        response = self.client.get(reverse('profile-detail', args=(self.name,)), {'sort': 'name'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_detail_invalid_filter(self):
+        self.client.force_login(self.staff_user)
+        response = self.client.get(reverse('profile-detail', args=(self.name,)), {'filter': '(unclosed'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_detail_unknown_profile(self):
+        self.client.force_login(self.staff_user)
+        response = self.client.get(reverse('profile-detail', args=('unknown.prof',)))
+        self.assertEqual(response.status_code, 404)
+
+    def test_download(self):
+        self.client.force_login(self.staff_user)
+        response = self.client.get(reverse('profile-detail', args=(self.name,)), {'download': ''})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Disposition'], f'attachment; filename="{self.name}"')
@@ -0,0 +1,23 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.sessions.models import Session
+from django.core.management import call_command
+from django.utils import timezone
+
+from web.tests.helpers.testcases import BaseTestCase
+
+
+class TestPruneSessionsCommand(BaseTestCase):
+
+    def test_expired_sessions_are_deleted(self):
+        expired = timezone.now() - timedelta(days=1)
+        for i in range(3):
+            Session.objects.create(session_key=f'expired-{i}', session_data='', expire_date=expired)
+        Session.objects.create(session_key='active', session_data='', expire_date=timezone.now() + timedelta(days=1))
+
+        out = StringIO()
+        call_command('prune_sessions', batch_size=2, pause=0, stdout=out)
+
+        self.assertListEqual(list(Session.objects.values_list('session_key', flat=True)), ['active'])
+        self.assertIn('Deleted 3 expired sessions', out.getvalue())
@@ -0,0 +1,56 @@
+import datetime
+import json
+from urllib.parse import urlsplit
+
+from django.test import override_settings
+from requests.adapters import HTTPAdapter
+
+from web.core.transports import StubTransport, http_transport
+from web.grant_applications.services import BackofficeService, BackofficeServiceException
+from web.tests.helpers.testcases import BaseTestCase
+
+
+def echo(request):
+    path = urlsplit(request.url).path
+    if path.endswith('/missing/'):
+        return 404, {'detail': 'Not found.'}
+    body = request.body
+    return 200, {
+        'method': request.method,
+        'path': path,
+        'content_type': request.headers.get('Content-Type'),
+        'body': body.decode() if isinstance(body, bytes) else body,
+    }
+
+
+def echo_transport():
+    return StubTransport(echo)
+
+
+class TestHttpTransport(BaseTestCase):
+
+    def test_retries_server_errors(self):
+        transport = http_transport()
+        self.assertIsInstance(transport, HTTPAdapter)
+        self.assertEqual(transport.max_retries.total, 3)
+        self.assertEqual(transport.max_retries.status_forcelist, [500])
+
+
+@override_settings(
+    BACKOFFICE_API_URL='http://backoffice/api/',
+    BACKOFFICE_TRANSPORT='web.core.tests.test_transports.echo_transport'
+)
+class TestBackofficeServiceTransport(BaseTestCase):
+
+    def test_requests_are_sent_with_transport(self):
+        response = BackofficeService().update_grant_application('an-id', event_date=datetime.date(2020, 12, 1))
+        self.assertEqual(response['method'], 'PATCH')
+        self.assertEqual(response['path'], '/api/grant-applications/an-id/')
+        self.assertEqual(response['content_type'], 'application/json')
+        # Encoded once, with dates as strings
+        self.assertEqual(json.loads(response['body']), {'event_date': '2020-12-01'})
+
+    def test_response_hooks_apply(self):
+        service = BackofficeService()
+        with self.assertRaises(BackofficeServiceException):
+            service.request('PATCH', 'http://backoffice/api/missing/', {})
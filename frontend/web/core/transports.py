@@ -0,0 +1,40 @@
+import json
+
+from requests import Response
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from urllib3 import Retry
+
+
+def http_transport():
+    """The default BACKOFFICE_TRANSPORT, which sends requests over HTTP and retries server errors."""
+    retry_strategy = Retry(total=3, status_forcelist=[500], method_whitelist=['GET', 'POST'])
+    return HTTPAdapter(max_retries=retry_strategy)
+
+
+class StubTransport(BaseAdapter):
+    """requests transport adapter which answers requests in-process, without a socket, with
+    `handler(request)` returning the status code and json data of the response.
+
+    Use it as a BACKOFFICE_TRANSPORT in tests in place of the backoffice. Session hooks, and the
+    instrumentation of InstrumentedSession, still apply to every call.
+    """
+
+    def __init__(self, handler):
+        super().__init__()
+        self.handler = handler
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        status_code, data = self.handler(request)
+        response = Response()
+        response.status_code = status_code
+        response.headers = CaseInsensitiveDict({'Content-Type': 'application/json'})
+        response.encoding = 'utf-8'
+        response._content = json.dumps(data).encode()
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        return response
+
+    def close(self):
+        pass
@@ -1,4 +1,13 @@
+import re
+
+from django.conf import settings
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import FileResponse, Http404, HttpResponse, HttpResponseBadRequest, HttpResponseForbidden
 from django.shortcuts import render
+from django.utils.crypto import constant_time_compare
+
+from web.core.metrics import registry
+from web.core.profiling import get_profile_path, list_profiles, render_profile
 
 
 def handler404(request, exception):
@@ -6,4 +15,46 @@ def handler404(request, exception):
 
 
 def handler500(request, *args, **argv):
-    return render(request, 'core/500.html', status=500)  # noqa
\ No newline at end of file
+    return render(request, 'core/500.html', status=500)  # noqa
+
+
+def metrics(request):
+    """Prometheus scrape endpoint. Only served when DEBUG is on or a METRICS_TOKEN is configured."""
+    if not (settings.DEBUG or settings.METRICS_TOKEN):
+        raise Http404
+    if settings.METRICS_TOKEN and not constant_time_compare(
+        request.headers.get('Authorization', ''), f'Bearer {settings.METRICS_TOKEN}'
+    ):
+        return HttpResponseForbidden()
+    return HttpResponse(registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+@staff_member_required
+def profile_list(request):
+    return render(request, 'core/profiling.html', {
+        'profiles': list_profiles(),
+        'hot_paths': settings.PROFILING_HOT_PATHS,
+        'profiling_enabled': settings.PROFILING_ENABLED,
+    })
+
+
+@staff_member_required
+def profile_detail(request, name):
+    path = get_profile_path(name)
+    if path is None:
+        raise Http404
+
+    if 'download' in request.GET:
+        return FileResponse(open(path, 'rb'), as_attachment=True, filename=name)
+
+    sort = request.GET.get('sort', 'cumulative')
+    if sort not in ['cumulative', 'tottime', 'calls']:
+        return HttpResponseBadRequest(f'Cannot sort by {sort}')
+    restriction = request.GET.get('filter')
+    if restriction:
+        try:
+            re.compile(restriction)
+        except re.error as e:
+            return HttpResponseBadRequest(f'Invalid filter: {e}')
+    content = render_profile(path, sort=sort, restriction=restriction)
+    return HttpResponse(content, content_type='text/plain; charset=utf-8')
@@ -10,8 +10,8 @@ from web.core.utils import str_to_bool
 from web.grant_applications.form_mixins import FormatLabelMixin
 from web.grant_applications.models import GrantApplicationLink
 from web.grant_applications.services import (
-    BackofficeService, BackofficeServiceException, get_sector_select_choices,
-    get_trade_event_filter_choices, get_trade_event_filter_by_month_choices,
+    get_sector_select_choices,
+    get_trade_event_filters_choices,
     generate_company_select_options, generate_trade_event_select_options,
     validate_registration_number, validate_vat_number
 )
@@ -73,11 +73,12 @@ class FindAnEventForm(forms.ModelForm):
         model = GrantApplicationLink
         fields = ['filter_by_name', 'filter_by_sector', 'filter_by_country', 'filter_by_month']
 
-    def __init__(self, *args, **kwargs):
+    def __init__(self, trade_event_filters_choices=None, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.fields['filter_by_month'].choices = get_trade_event_filter_by_month_choices()
-        self.fields['filter_by_country'].choices = get_trade_event_filter_choices('country')
-        self.fields['filter_by_sector'].choices = get_trade_event_filter_choices('sector')
+        filters_choices = trade_event_filters_choices or get_trade_event_filters_choices()
+        self.fields['filter_by_month'].choices = filters_choices['month']
+        self.fields['filter_by_country'].choices = filters_choices['country']
+        self.fields['filter_by_sector'].choices = filters_choices['sector']
 
     filter_by_name = forms.CharField(
         required=False,
@@ -130,11 +131,12 @@ class SelectAnEventForm(forms.ModelForm):
             'event'
         ]
 
-    def __init__(self, trade_events=None, *args, **kwargs):
+    def __init__(self, trade_events=None, trade_event_filters_choices=None, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.fields['filter_by_month'].choices = get_trade_event_filter_by_month_choices()
-        self.fields['filter_by_country'].choices = get_trade_event_filter_choices('country')
-        self.fields['filter_by_sector'].choices = get_trade_event_filter_choices('sector')
+        filters_choices = trade_event_filters_choices or get_trade_event_filters_choices()
+        self.fields['filter_by_month'].choices = filters_choices['month']
+        self.fields['filter_by_country'].choices = filters_choices['country']
+        self.fields['filter_by_sector'].choices = filters_choices['sector']
         trade_events_options = generate_trade_event_select_options(trade_events)
         self.fields['event'].choices = trade_events_options['choices']
         self.fields['event'].widget.attrs['hints'] = trade_events_options['hints']
@@ -255,19 +257,11 @@ class SelectCompanyForm(forms.ModelForm):
     def clean(self):
         cleaned_data = super().clean()
         if not self.errors and 'duns_number' in cleaned_data:
-            searched_company = next(
+            # The search result is sent to the backoffice as is when the company is selected
+            cleaned_data['searched_company'] = next(
                 c for c in self.companies
                 if c['dnb_data']['duns_number'] == self.cleaned_data['duns_number']
             )
-            try:
-                company = BackofficeService().get_or_create_company(
-                    duns_number=self.cleaned_data['duns_number'],
-                    registration_number=searched_company['registration_number'],
-                    name=searched_company['dnb_data']['primary_name']
-                )
-                cleaned_data['company'] = company['id']
-            except BackofficeServiceException:
-                raise forms.ValidationError(FORM_MSGS['resubmit'])
         return cleaned_data
 
 
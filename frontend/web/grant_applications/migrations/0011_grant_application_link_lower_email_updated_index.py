@@ -0,0 +1,21 @@
+# Generated by Django 3.1.1 on 2026-10-19 19:05
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    # Functional indexes can't be declared on the model before Django 3.2. The index matches
+    # get_latest_grant_application_link and is built without locking the table against writes.
+    atomic = False
+
+    dependencies = [
+        ('grant_applications', '0010_grant_application_link_model_email_not_unique'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql='CREATE INDEX CONCURRENTLY IF NOT EXISTS grant_application_link_lower_email_updated '
+                'ON grant_applications_grantapplicationlink (lower(email), updated DESC)',
+            reverse_sql='DROP INDEX CONCURRENTLY IF EXISTS grant_application_link_lower_email_updated',
+        ),
+    ]
@@ -1,4 +1,5 @@
 import calendar
+import hashlib
 import json
 import logging
 import re
@@ -7,14 +8,16 @@ from urllib.parse import urljoin, urlparse
 
 import requests
 from django.conf import settings
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
 from django.core.serializers.json import DjangoJSONEncoder
-from django.urls import reverse
+from django.urls import resolve, reverse
 from django.utils.dateparse import parse_date
+from django.utils.module_loading import import_string
 from django.utils.translation import gettext_lazy as _
-from requests.adapters import HTTPAdapter
-from urllib3 import Retry
 
+from web.core.instrumentation import InstrumentedSession, get_thread_session
+from web.core.logs import LogBody, LogUrl
 from web.core.services import SummaryListHelper
 
 logger = logging.getLogger(__name__)
@@ -33,10 +36,11 @@ def _raise_for_status(response, **kwargs):
 
 
 def _log_hook(response, **kwargs):
-    body = response.request.body or 'No content'
-    logger.info(f'EXTERNAL {response.request.method} : {response.request.url} : {body}')
+    logger.info(
+        'EXTERNAL %s : %s : %s', response.request.method, LogUrl(response.request.url), LogBody(response.request.body)
+    )
     if not response.ok:
-        logger.error(f'RESPONSE : {response.status_code} : {response.text}')
+        logger.error('RESPONSE : %s : %s', response.status_code, LogBody(response.text))
 
 
 class BackofficeService:
@@ -53,19 +57,25 @@ class BackofficeService:
         self.send_user_email_url = urljoin(self.base_url, 'send-resume-application-email/')
         self.image_upload_url = urljoin(self.base_url, 'image-upload/')
 
-        self.session = requests.Session()
+        self.session = get_thread_session(
+            ('backoffice', self.base_url, settings.BACKOFFICE_TRANSPORT), self._create_session
+        )
+
+    def _create_session(self):
+        session = InstrumentedSession(upstream='backoffice', timeout=settings.UPSTREAM_TIMEOUT)
 
-        # Attach retry adapter
-        retry_strategy = Retry(total=3, status_forcelist=[500], method_whitelist=['GET', 'POST'])
-        retry_adapter = HTTPAdapter(max_retries=retry_strategy)
-        self.session.mount(f'{urlparse(self.base_url).scheme}://', retry_adapter)
+        # Attach transport
+        session.mount(f'{urlparse(self.base_url).scheme}://', import_string(settings.BACKOFFICE_TRANSPORT)())
 
         # Attach response hooks
-        self.session.hooks['response'] = [_log_hook, _raise_for_status]
+        session.hooks['response'] = [_log_hook, _raise_for_status]
+        return session
 
     def request(self, method, url, data):
+        # Encoded once, with support for dates, decimals and uuids
         return self.session.request(
-            method, url, json=json.loads(json.dumps(data, cls=DjangoJSONEncoder))
+            method, url, data=json.dumps(data, cls=DjangoJSONEncoder),
+            headers={'Content-Type': 'application/json'}
         )
 
     def post(self, url, data):
@@ -131,19 +141,40 @@ class BackofficeService:
     def update_grant_application(self, grant_application_id, **data):
         url = urljoin(self.grant_applications_url, f'{grant_application_id}/')
         response = self.patch(url, data)
-        return response.json()
+        return cache_grant_application(response.json())
 
     def get_grant_application(self, grant_application_id):
+        grant_application = get_cached_grant_application(grant_application_id)
+        if grant_application is not None:
+            return grant_application
+
         url = urljoin(self.grant_applications_url, f'{str(grant_application_id)}/')
         response = self.session.get(url)
-        return response.json()
+        return cache_grant_application(response.json())
 
     def send_grant_application_for_review(self, grant_application_id, application_summary):
         response = self.post(
             urljoin(self.grant_applications_url, f'{grant_application_id}/send-for-review/'),
             data={'application_summary': application_summary}
         )
-        return response.json()
+        return cache_grant_application(response.json())
+
+    def update_application_summary_sections(self, grant_application_id, sections):
+        response = self.patch(
+            urljoin(self.grant_applications_url, f'{grant_application_id}/'),
+            data={'application_summary_sections': sections}
+        )
+        return cache_grant_application(response.json())
+
+    def select_company(self, grant_application_id, dnb_data, application_summary_sections=None):
+        data = {'dnb_data': dnb_data}
+        if application_summary_sections:
+            data['application_summary_sections'] = application_summary_sections
+        response = self.post(
+            urljoin(self.grant_applications_url, f'{grant_application_id}/select-company/'),
+            data=data
+        )
+        return cache_grant_application(response.json())
 
     def create_state_aid(self, **data):
         response = self.post(self.state_aid_url, data)
@@ -219,6 +250,49 @@ class BackofficeService:
         return response.json()
 
 
+def _grant_application_cache_key(grant_application_id):
+    return f'grant-application:{grant_application_id}'
+
+
+def _grant_application_version_key(grant_application_id):
+    return f'grant-application-version:{grant_application_id}'
+
+
+def get_cached_grant_application(grant_application_id):
+    if not settings.GRANT_APPLICATION_CACHE_TIMEOUT:
+        return None
+    return cache.get(_grant_application_cache_key(grant_application_id))
+
+
+def cache_grant_application(grant_application):
+    """Keep a grant application returned by the backoffice until the backoffice reports a change to it.
+
+    Responses older than the latest change event (eg. a read which was in flight when the change was made)
+    are not kept. Returns the grant application.
+    """
+    if not settings.GRANT_APPLICATION_CACHE_TIMEOUT or 'id' not in grant_application:
+        return grant_application
+
+    latest_version = cache.get(_grant_application_version_key(grant_application['id']), 0)
+    if grant_application.get('version', 0) >= latest_version:
+        cache.set(
+            _grant_application_cache_key(grant_application['id']), grant_application,
+            timeout=settings.GRANT_APPLICATION_CACHE_TIMEOUT
+        )
+    return grant_application
+
+
+def invalidate_grant_application(grant_application_id, version):
+    """Drop the cached copy of a grant application which has changed in the backoffice."""
+    if not settings.GRANT_APPLICATION_CACHE_TIMEOUT:
+        return
+
+    version_key = _grant_application_version_key(grant_application_id)
+    if version > cache.get(version_key, 0):
+        cache.set(version_key, version, timeout=settings.GRANT_APPLICATION_CACHE_TIMEOUT)
+    cache.delete(_grant_application_cache_key(grant_application_id))
+
+
 def get_backoffice_choices(object_type, choice_id_key, choice_name_key, request_kwargs=None):
     request_kwargs = request_kwargs or {}
     backoffice_choices = []
@@ -233,18 +307,22 @@ def get_backoffice_choices(object_type, choice_id_key, choice_name_key, request_
     return backoffice_choices
 
 
-def get_trade_event_filter_choices(attribute):
-    backoffice_choices = get_backoffice_choices(
-        'list_trade_events', choice_id_key=attribute, choice_name_key=attribute
-    )
+def get_trade_event_filter_choices(attribute, trade_events=None):
+    if trade_events is None:
+        backoffice_choices = get_backoffice_choices(
+            'list_trade_events', choice_id_key=attribute, choice_name_key=attribute
+        )
+    else:
+        backoffice_choices = [(te[attribute], te[attribute]) for te in trade_events]
     backoffice_choices = list(set(backoffice_choices))  # remove duplicates
     backoffice_choices.sort(key=lambda x: x[0])  # sort chronologically
     backoffice_choices.insert(0, ('', 'All'))
     return backoffice_choices
 
 
-def get_trade_event_filter_by_month_choices():
-    trade_events = BackofficeService().request_factory('list_trade_events', raise_exception=False)
+def get_trade_event_filter_by_month_choices(trade_events=None):
+    if trade_events is None:
+        trade_events = BackofficeService().request_factory('list_trade_events', raise_exception=False)
     if not trade_events:
         return []
 
@@ -265,6 +343,16 @@ def get_trade_event_filter_by_month_choices():
     return choices
 
 
+def get_trade_event_filters_choices():
+    """Choices for the month, country and sector trade event filters, from a single request."""
+    trade_events = BackofficeService().request_factory('list_trade_events', raise_exception=False) or []
+    return {
+        'month': get_trade_event_filter_by_month_choices(trade_events),
+        'country': get_trade_event_filter_choices('country', trade_events),
+        'sector': get_trade_event_filter_choices('sector', trade_events),
+    }
+
+
 def get_sector_select_choices():
     backoffice_choices = get_backoffice_choices(
         'list_sectors', choice_id_key='id', choice_name_key='full_name'
@@ -341,6 +429,32 @@ def get_companies_from_search_term(search_term):
     return BackofficeService().request_factory('search_companies', raise_exception=False, **params)
 
 
+def _company_search_snapshot_key(grant_application_link_id, search_term):
+    search_term_hash = hashlib.sha256(search_term.encode()).hexdigest()
+    return f'company-search:{grant_application_link_id}:{search_term_hash}'
+
+
+def save_company_search_snapshot(grant_application_link_id, search_term, companies):
+    """Keep the companies shown for a search so that the selection can be validated without
+    searching again. Result sets larger than COMPANY_SEARCH_SNAPSHOT_MAX_SIZE are not kept.
+    """
+    if not search_term or companies is None:
+        return
+    if len(json.dumps(companies, cls=DjangoJSONEncoder)) > settings.COMPANY_SEARCH_SNAPSHOT_MAX_SIZE:
+        return
+    cache.set(
+        _company_search_snapshot_key(grant_application_link_id, search_term),
+        companies,
+        timeout=settings.COMPANY_SEARCH_SNAPSHOT_TIMEOUT
+    )
+
+
+def get_company_search_snapshot(grant_application_link_id, search_term):
+    if not search_term:
+        return None
+    return cache.get(_company_search_snapshot_key(grant_application_link_id, search_term))
+
+
 def get_state_aid_summary_table(grant_application_link, state_aid_items):
     if not state_aid_items:
         return {
@@ -376,13 +490,59 @@ def get_state_aid_summary_table(grant_application_link, state_aid_items):
     return table
 
 
+# Application review page sections in page order, named after the url of the step they summarise
+APPLICATION_SUMMARY_SECTIONS = [
+    'previous-applications',
+    'select-an-event',
+    'event-commitment',
+    'select-company',
+    'manual-company-details',
+    'company-details',
+    'contact-details',
+    'company-trading-details',
+    'export-experience',
+    'export-details',
+    'trade-event-details',
+    'state-aid-summary',
+]
+# Sections which aren't stored against the grant application, as they summarise data saved without it
+UNSTORED_SUMMARY_SECTIONS = ['state-aid-summary']
+
+
+def build_application_summary(sections):
+    """The summary lists shown on the application review page, in page order, from a dict of
+    section name to summary list. Empty sections are left out."""
+    application_summary = []
+    for section in APPLICATION_SUMMARY_SECTIONS:
+        if sections.get(section):
+            summary_list = sections[section].copy()
+            summary_list['id'] = f'id_summary_list_{len(application_summary)}'
+            application_summary.append(summary_list)
+    return application_summary
+
+
 class ApplicationReviewService:
 
-    def __init__(self, grant_application_link, application_data):
+    def __init__(self, grant_application_link, application_data, state_aids=None):
         self.grant_application_link = grant_application_link
         self.application_data = application_data
+        self.state_aids = state_aids
         self.summary_list_helper = SummaryListHelper()
 
+    def section_summary_list(self, section):
+        """The summary list of one of APPLICATION_SUMMARY_SECTIONS, an empty dict if the section
+        has nothing to show."""
+        url = reverse(f'grant-applications:{section}', args=(self.grant_application_link.pk,))
+        view_class = resolve(url).func.view_class
+        form = view_class.form_class(data=self.application_data)
+        method = getattr(self, f"{section.replace('-', '_')}_summary_list", self.generic_summary_list)
+        summary_list = method(
+            heading=str(view_class.extra_context['page']['heading']),
+            fields=form.visible_fields(),
+            url=url
+        )
+        return summary_list or {}
+
     @staticmethod
     def _serialize_field(value):
         if value is True:
@@ -688,9 +848,11 @@ class ApplicationReviewService:
         return self.summary_list_helper.make_summary_list(heading=heading, rows=rows)
 
     def state_aid_summary_summary_list(self, heading, fields, url):
-        state_aids = BackofficeService().list_state_aids(
-            grant_application=self.grant_application_link.backoffice_grant_application_id
-        )
+        state_aids = self.state_aids
+        if state_aids is None:
+            state_aids = BackofficeService().list_state_aids(
+                grant_application=self.grant_application_link.backoffice_grant_application_id
+            )
         row = self._make_row(
             url=url,
             key='Total aid added',
@@ -2,9 +2,12 @@ from unittest.mock import patch
 
 from bs4 import BeautifulSoup
 from django.urls import reverse, resolve
+from testfixtures import LogCapture
 
 from web.grant_applications.forms import ExportExperienceForm
-from web.grant_applications.services import BackofficeService, BackofficeServiceException
+from web.grant_applications.services import (
+    APPLICATION_SUMMARY_SECTIONS, BackofficeService, BackofficeServiceException
+)
 from web.grant_applications.views import (
     PreviousApplicationsView, SelectAnEventView, ManualCompanyDetailsView, CompanyDetailsView,
     EventCommitmentView, ContactDetailsView, ExportExperienceView, StateAidSummaryView,
@@ -19,6 +22,7 @@ from web.tests.helpers.backoffice_objects import (
 from web.tests.helpers.testcases import BaseTestCase
 
 
+@patch.object(BackofficeService, 'update_application_summary_sections', return_value=FAKE_GRANT_APPLICATION)
 @patch.object(
     BackofficeService, 'send_grant_application_for_review',
     return_value=FAKE_GRANT_MANAGEMENT_PROCESS
@@ -39,6 +43,13 @@ class TestApplicationReviewView(BaseTestCase):
         self.assertEqual(response.status_code, 200)
         self.assertIn('core/govt_summary_list.html', [t.name for t in response.templates])
 
+    def test_get_backoffice_calls(self, *mocks):
+        self.client.get(self.url)
+        mocks[0].assert_called_once()
+        mocks[1].assert_called_once()
+        mocks[3].assert_called_once_with(grant_application=self.gal.backoffice_grant_application_id)
+        mocks[4].assert_called_once()
+
     def test_summary_shows_correct_sections_if_company_found(self, *mocks):
         response = self.client.get(self.url)
         html = BeautifulSoup(response.content, 'html.parser')
@@ -175,14 +186,52 @@ class TestApplicationReviewView(BaseTestCase):
             response, reverse('grant-applications:confirmation', args=(self.gal.pk,))
         )
 
-    def test_send_grant_application_for_review(self, *mocks):
+    def test_missing_summary_sections_are_stored(self, *mocks):
         self.client.get(self.url)
+        mocks[6].assert_called_once()
+        sections = mocks[6].call_args[1]['sections']
+        # State aid is always built, from the state aids
+        self.assertListEqual(list(sections), [s for s in APPLICATION_SUMMARY_SECTIONS if s != 'state-aid-summary'])
+        # Sections with nothing to show are stored empty so that they aren't built again
+        self.assertEqual(sections['manual-company-details'], {})
+
+    def test_stored_summary_sections_are_used(self, *mocks):
+        fake_grant_application = FAKE_GRANT_APPLICATION.copy()
+        fake_grant_application['application_summary_sections'] = {
+            section: {'heading': section, 'rows': []} for section in APPLICATION_SUMMARY_SECTIONS
+        }
+        fake_grant_application['application_summary_sections']['export-details'] = {}
+        mocks[4].return_value = fake_grant_application
+
+        response = self.client.get(self.url)
+        html = BeautifulSoup(response.content, 'html.parser')
+        headings = html.find_all(id='id_summary_list_heading')
+        self.assertListEqual(
+            [h.text for h in headings],
+            [s for s in APPLICATION_SUMMARY_SECTIONS if s not in ['export-details', 'state-aid-summary']]
+            + [StateAidSummaryView.extra_context['page']['heading']]
+        )
+        self.assertIsNotNone(html.find(id='id_summary_list_10'))
+        mocks[3].assert_called_once_with(grant_application=self.gal.backoffice_grant_application_id)
+        mocks[6].assert_not_called()
+
+    def test_summary_sections_not_stored_on_backoffice_exception(self, *mocks):
+        application_summary = self.client.get(self.url).context['application_summary']
+        mocks[6].side_effect = BackofficeServiceException
+        with LogCapture() as log_capture:
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['application_summary'], application_summary)
+        log_capture.check_present(
+            ('web.grant_applications.views', 'WARNING', 'Could not store application summary sections: ')
+        )
+
+    def test_send_grant_application_for_review(self, *mocks):
+        response = self.client.get(self.url)
         self.client.post(self.url)
-        self.gal.refresh_from_db()
-        self.assertIn('application_summary', self.client.session)
         mocks[5].assert_called_once_with(
             str(self.gal.backoffice_grant_application_id),
-            application_summary=self.client.session['application_summary']
+            application_summary=response.context['application_summary']
         )
 
     def test_backoffice_exception_on_send_grant_application_for_review(self, *mocks):
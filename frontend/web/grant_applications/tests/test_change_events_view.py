@@ -0,0 +1,46 @@
+import hashlib
+import hmac
+import json
+from unittest.mock import patch
+
+from django.test import override_settings
+from django.urls import reverse
+
+from web.tests.helpers.testcases import BaseTestCase
+
+
+@override_settings(CHANGE_EVENTS_SECRET='a-secret')
+@patch('web.grant_applications.views.invalidate_grant_application')
+class TestChangeEventsView(BaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.url = reverse('grant-applications:change-events')
+        self.body = json.dumps({
+            'changes': [{'grant_application': 'an-id', 'version': 2, 'changed_fields': ['is_completed']}]
+        }).encode()
+
+    def post(self, body, secret='a-secret'):
+        signature = hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+        return self.client.post(
+            self.url, data=body, content_type='application/json', HTTP_X_SIGNATURE=f'sha256={signature}'
+        )
+
+    def test_changes_are_invalidated(self, invalidate):
+        response = self.post(self.body)
+        self.assertEqual(response.status_code, 204)
+        invalidate.assert_called_once_with('an-id', 2)
+
+    def test_bad_signature(self, invalidate):
+        response = self.post(self.body, secret='another-secret')
+        self.assertEqual(response.status_code, 403)
+        self.assertFalse(invalidate.called)
+
+    def test_bad_body(self, invalidate):
+        response = self.post(b'{"changes": [{}]}')
+        self.assertEqual(response.status_code, 400)
+
+    @override_settings(CHANGE_EVENTS_SECRET='')
+    def test_not_found_without_secret(self, invalidate):
+        response = self.post(self.body, secret='')
+        self.assertEqual(response.status_code, 404)
@@ -13,6 +13,7 @@ from web.tests.helpers.backoffice_objects import (
 from web.tests.helpers.testcases import BaseTestCase
 
 
+@patch.object(BackofficeService, 'update_application_summary_sections', return_value=FAKE_GRANT_APPLICATION)
 @patch.object(BackofficeService, 'create_company', return_value=FAKE_COMPANY)
 @patch.object(BackofficeService, 'get_grant_application', return_value=FAKE_GRANT_APPLICATION)
 @patch.object(BackofficeService, 'update_grant_application', return_value=FAKE_GRANT_APPLICATION)
@@ -12,6 +12,7 @@ from web.tests.helpers.backoffice_objects import FAKE_GRANT_APPLICATION, FAKE_SE
 from web.tests.helpers.testcases import BaseTestCase
 
 
+@patch.object(BackofficeService, 'update_application_summary_sections', return_value=FAKE_GRANT_APPLICATION)
 @patch.object(BackofficeService, 'get_grant_application', return_value=FAKE_GRANT_APPLICATION)
 @patch.object(BackofficeService, 'list_sectors', return_value=[FAKE_SECTOR])
 @patch.object(BackofficeService, 'update_grant_application', return_value=FAKE_GRANT_APPLICATION)
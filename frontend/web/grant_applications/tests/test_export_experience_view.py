@@ -9,6 +9,7 @@ from web.tests.helpers.backoffice_objects import FAKE_GRANT_APPLICATION
 from web.tests.helpers.testcases import BaseTestCase
 
 
+@patch.object(BackofficeService, 'update_application_summary_sections', return_value=FAKE_GRANT_APPLICATION)
 @patch.object(BackofficeService, 'get_grant_application', return_value=FAKE_GRANT_APPLICATION)
 @patch.object(BackofficeService, 'update_grant_application', return_value=FAKE_GRANT_APPLICATION)
 class TestExportExperienceView(BaseTestCase):
@@ -22,6 +23,21 @@ class TestExportExperienceView(BaseTestCase):
         self.assertEqual(response.status_code, 200)
         self.assertTemplateUsed(response, ExportExperienceView.template_name)
 
+    def test_post_clears_stale_summary_sections(self, *mocks):
+        fake_grant_application = FAKE_GRANT_APPLICATION.copy()
+        fake_grant_application['application_summary_sections'] = {
+            'export-experience': {'heading': 'Export experience'},
+            'export-details': {'heading': 'Export details'},
+            'contact-details': {'heading': 'Contact details'},
+        }
+        mocks[1].return_value = fake_grant_application
+        self.client.post(self.url, data={'has_exported_before': True})
+        # Export details depend on the answer so are cleared too, to be built by the review page
+        self.assertEqual(
+            mocks[0].call_args[1]['application_summary_sections'], {'export-experience': None, 'export-details': None}
+        )
+        mocks[2].assert_not_called()
+
     def test_post(self, *mocks):
         response = self.client.post(
             self.url,
@@ -16,17 +16,17 @@ from web.tests.helpers.backoffice_objects import (
 from web.tests.helpers.testcases import BaseTestCase
 
 
+def fake_list_trade_events(**params):
+    # Paginated when listing events to select from, otherwise all events (for the filter choices)
+    return FAKE_PAGINATED_LIST_EVENTS if 'page' in params else [FAKE_EVENT]
+
+
 @patch.object(
     BackofficeService, 'get_trade_event_aggregates', return_value=FAKE_TRADE_EVENT_AGGREGATES
 )
 @patch.object(BackofficeService, 'get_grant_application', return_value=FAKE_GRANT_APPLICATION)
 @patch.object(BackofficeService, 'update_grant_application', return_value=FAKE_GRANT_APPLICATION)
-@patch.object(
-    BackofficeService, 'list_trade_events', side_effect=[
-        [FAKE_EVENT], [FAKE_EVENT], [FAKE_EVENT], FAKE_PAGINATED_LIST_EVENTS, [FAKE_EVENT],
-        [FAKE_EVENT], [FAKE_EVENT]
-    ]
-)
+@patch.object(BackofficeService, 'list_trade_events', side_effect=fake_list_trade_events)
 class TestFindAnEventView(BaseTestCase):
 
     def setUp(self):
@@ -38,6 +38,18 @@ class TestFindAnEventView(BaseTestCase):
         self.assertEqual(response.status_code, 200)
         self.assertTemplateUsed(response, FindAnEventView.template_name)
 
+    def test_get_backoffice_calls(self, *mocks):
+        self.client.get(self.url)
+        # The filter choices are all taken from one list of trade events
+        mocks[0].assert_called_once_with()
+        mocks[2].assert_called_once()
+        mocks[3].assert_called_once_with(start_date_from=timezone.now().date())
+
+    def test_post_fetches_grant_application_once(self, *mocks):
+        self.client.post(self.url, data={'filter_by_name': 'Name 1'})
+        mocks[2].assert_called_once()
+        mocks[3].assert_not_called()
+
     def test_back_url(self, *mocks):
         response = self.client.get(self.url)
         self.assertEqual(response.status_code, 200)
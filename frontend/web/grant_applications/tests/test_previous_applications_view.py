@@ -10,6 +10,7 @@ from web.tests.helpers.backoffice_objects import FAKE_SEARCH_COMPANIES, FAKE_GRA
 from web.tests.helpers.testcases import BaseTestCase
 
 
+@patch.object(BackofficeService, 'update_application_summary_sections', return_value=FAKE_GRANT_APPLICATION)
 @patch.object(BackofficeService, 'search_companies', return_value=FAKE_SEARCH_COMPANIES)
 @patch.object(BackofficeService, 'get_grant_application', return_value=FAKE_GRANT_APPLICATION)
 @patch.object(BackofficeService, 'update_grant_application', return_value=FAKE_GRANT_APPLICATION)
@@ -14,14 +14,15 @@ from web.tests.helpers.backoffice_objects import (
 from web.tests.helpers.testcases import BaseTestCase
 
 
+def fake_list_trade_events(**params):
+    # Paginated when listing events to select from, otherwise all events (for the filter choices)
+    return FAKE_PAGINATED_LIST_EVENTS if 'page' in params else [FAKE_EVENT]
+
+
+@patch.object(BackofficeService, 'update_application_summary_sections', return_value=FAKE_GRANT_APPLICATION)
 @patch.object(BackofficeService, 'get_grant_application', return_value=FAKE_GRANT_APPLICATION)
 @patch.object(BackofficeService, 'update_grant_application', return_value=FAKE_GRANT_APPLICATION)
-@patch.object(
-    BackofficeService, 'list_trade_events', side_effect=[
-        FAKE_PAGINATED_LIST_EVENTS, [FAKE_EVENT], [FAKE_EVENT], [FAKE_EVENT],
-        FAKE_PAGINATED_LIST_EVENTS, [FAKE_EVENT], [FAKE_EVENT], [FAKE_EVENT]
-    ]
-)
+@patch.object(BackofficeService, 'list_trade_events', side_effect=fake_list_trade_events)
 class TestSelectAnEventView(BaseTestCase):
     page_size = SelectAnEventView.events_page_size
 
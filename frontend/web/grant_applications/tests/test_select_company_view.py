@@ -1,26 +1,32 @@
 from unittest.mock import patch
 
 from bs4 import BeautifulSoup
+from django.core.cache import cache
+from django.test import override_settings
 from django.urls import reverse
+from django.utils.http import urlencode
 
-from web.grant_applications.services import BackofficeServiceException, BackofficeService
+from web.grant_applications.services import (
+    BackofficeServiceException, BackofficeService, get_company_search_snapshot
+)
 from web.grant_applications.views import SelectCompanyView
 from web.tests.factories.grant_application_link import GrantApplicationLinkFactory
 from web.tests.helpers.backoffice_objects import (
-    FAKE_GRANT_APPLICATION, FAKE_COMPANY, FAKE_SEARCH_COMPANIES
+    FAKE_GRANT_APPLICATION, FAKE_SEARCH_COMPANIES
 )
 from web.tests.helpers.testcases import BaseTestCase, LogCaptureMixin
 
 
-@patch.object(BackofficeService, 'create_company', return_value=FAKE_COMPANY)
+@patch.object(BackofficeService, 'update_application_summary_sections', return_value=FAKE_GRANT_APPLICATION)
 @patch.object(BackofficeService, 'get_grant_application', return_value=FAKE_GRANT_APPLICATION)
-@patch.object(BackofficeService, 'list_companies', return_value=[FAKE_COMPANY])
+@patch.object(BackofficeService, 'select_company', return_value=FAKE_GRANT_APPLICATION)
 @patch.object(BackofficeService, 'update_grant_application', return_value=FAKE_GRANT_APPLICATION)
 @patch.object(BackofficeService, 'search_companies', return_value=FAKE_SEARCH_COMPANIES)
 class TestSelectCompanyView(LogCaptureMixin, BaseTestCase):
 
     def setUp(self):
         super().setUp()
+        cache.clear()
         self.gal = GrantApplicationLinkFactory()
         self.url = reverse('grant-applications:select-company', args=(self.gal.pk,))
 
@@ -103,43 +109,51 @@ class TestSelectCompanyView(LogCaptureMixin, BaseTestCase):
             expected_url=reverse('grant-applications:company-details', args=(self.gal.pk,))
         )
 
-    def test_post_creates_backoffice_company(self, m_search_companies, m_update_grant_application,
-                                             m_list_companies, m_get_grant_application,
-                                             m_create_company):
-        # mock out that list_companies returns nothing
-        # so that create_company gets called to create the company
-        m_list_companies.return_value = []
+    def test_post_selects_backoffice_company(self, m_search_companies, m_update_grant_application,
+                                             m_select_company, m_get_grant_application,
+                                             m_update_application_summary_sections):
         response = self.client.post(
             self.url, data={'duns_number': FAKE_GRANT_APPLICATION['company']['duns_number']}
         )
         self.assertEqual(response.status_code, 302)
-        m_create_company.assert_called_once_with(
-            duns_number=str(FAKE_GRANT_APPLICATION['company']['duns_number']),
-            registration_number=FAKE_GRANT_APPLICATION['company']['registration_number'],
-            name=FAKE_GRANT_APPLICATION['company']['name']
+        m_search_companies.assert_called_with(
+            duns_number=FAKE_GRANT_APPLICATION['company']['duns_number']
         )
+        # The company and its dnb data are stored in a single backoffice call
+        m_select_company.assert_called_once_with(
+            grant_application_id=str(self.gal.backoffice_grant_application_id),
+            dnb_data=FAKE_SEARCH_COMPANIES[0]['dnb_data'],
+            application_summary_sections=None
+        )
+        m_update_grant_application.assert_not_called()
+        m_update_application_summary_sections.assert_not_called()
 
-    def test_post_list_companies_finds_too_many_backoffice_companies(self, m_search_companies,
-                                                                     m_update_grant_application,
-                                                                     m_list_companies,
-                                                                     m_get_grant_application,
-                                                                     m_create_company):
-        # mock out that list_companies returns more than 1 companies
-        m_list_companies.return_value = [FAKE_COMPANY, FAKE_COMPANY]
-
+    def test_post_uses_search_snapshot(self, m_search_companies, *mocks):
+        self.client.get(self.url, data={'search_term': 'company-1'})
         response = self.client.post(
-            self.url, data={'duns_number': FAKE_GRANT_APPLICATION['company']['duns_number']}
+            f"{self.url}?{urlencode({'search_term': 'company-1'})}",
+            data={'duns_number': FAKE_GRANT_APPLICATION['company']['duns_number']}
         )
+        self.assertEqual(response.status_code, 302)
+        # Only the search made to render the page
+        m_search_companies.assert_called_once_with(primary_name='company-1')
 
-        # This means there is a problem in the backoffice api
-        self.assertFormError(response, 'form', None, self.form_msgs['resubmit'])
-
-        m_create_company.assert_not_called()
-        self.log_capture.check_present(
-            ('web.grant_applications.services', 'ERROR', 'Too many companies'),
+    def test_post_search_snapshot_is_per_search_term(self, m_search_companies, *mocks):
+        self.client.get(self.url, data={'search_term': 'company-1'})
+        self.client.post(
+            f"{self.url}?{urlencode({'search_term': 'company-2'})}",
+            data={'duns_number': FAKE_GRANT_APPLICATION['company']['duns_number']}
         )
+        m_search_companies.assert_called_with(
+            duns_number=FAKE_GRANT_APPLICATION['company']['duns_number']
+        )
+
+    @override_settings(COMPANY_SEARCH_SNAPSHOT_MAX_SIZE=10)
+    def test_large_search_results_are_not_kept(self, *mocks):
+        self.client.get(self.url, data={'search_term': 'company-1'})
+        self.assertIsNone(get_company_search_snapshot(self.gal.pk, 'company-1'))
 
-    def test_post_list_companies_causes_backoffice_service_exception(self, *mocks):
+    def test_post_select_company_causes_backoffice_service_exception(self, *mocks):
         mocks[2].side_effect = BackofficeServiceException
         response = self.client.post(
             self.url,
@@ -148,35 +162,6 @@ class TestSelectCompanyView(LogCaptureMixin, BaseTestCase):
         )
         self.assertFormError(response, 'form', None, self.form_msgs['resubmit'])
 
-    def test_post_updates_backoffice_grant_application_company(self, m_search_companies,
-                                                               m_update_grant_application,
-                                                               m_list_companies,
-                                                               m_get_grant_application,
-                                                               m_create_company):
-        response = self.client.post(
-            self.url, data={'duns_number': FAKE_GRANT_APPLICATION['company']['duns_number']}
-        )
-        self.assertEqual(response.status_code, 302)
-        m_search_companies.assert_called_with(
-            duns_number=FAKE_GRANT_APPLICATION['company']['duns_number']
-        )
-        m_update_grant_application.assert_called_once_with(
-            grant_application_id=str(self.gal.backoffice_grant_application_id),
-            company=FAKE_COMPANY['id'],
-            # Set manual company details to None in case they have previously been set
-            manual_company_type=None,
-            manual_company_name=None,
-            manual_company_address_line_1=None,
-            manual_company_address_line_2=None,
-            manual_company_address_town=None,
-            manual_company_address_county=None,
-            manual_company_address_postcode=None,
-            manual_time_trading_in_uk=None,
-            manual_registration_number=None,
-            manual_vat_number=None,
-            manual_website=None
-        )
-
     def test_get_redirects_to_confirmation_if_application_already_sent_for_review(self, *mocks):
         fake_grant_application = FAKE_GRANT_APPLICATION.copy()
         fake_grant_application['sent_for_review'] = True
@@ -4,10 +4,13 @@ from unittest.mock import patch
 from urllib.parse import urljoin
 
 import httpretty
+from django.core.cache import cache
+from django.test import override_settings
 
 from web.grant_applications.services import (
     BackofficeService, BackofficeServiceException,
-    get_backoffice_choices, get_companies_from_search_term, generate_company_select_options
+    get_backoffice_choices, get_companies_from_search_term, generate_company_select_options,
+    invalidate_grant_application
 )
 from web.tests.helpers.backoffice_objects import (
     FAKE_GRANT_APPLICATION, FAKE_GRANT_MANAGEMENT_PROCESS, FAKE_SEARCH_COMPANIES, FAKE_COMPANY,
@@ -261,6 +264,18 @@ class TestBackofficeService(LogCaptureMixin, BaseTestCase):
         gmp = self.service.send_grant_application_for_review(self.bga['id'], 'fake-summary')
         self.assertEqual(gmp['id'], self.gmp['id'])
 
+    @httpretty.activate
+    def test_select_company(self):
+        httpretty.register_uri(
+            httpretty.POST,
+            urljoin(self.service.grant_applications_url, f"{self.bga['id']}/select-company/"),
+            status=200,
+            body=self.bga_response_body
+        )
+        bga = self.service.select_company(self.bga['id'], dnb_data={'duns_number': '1'})
+        self.assertEqual(bga['id'], self.bga['id'])
+        self.assertEqual(json.loads(httpretty.last_request().body), {'dnb_data': {'duns_number': '1'}})
+
     @httpretty.activate
     def test_search_companies(self):
         httpretty.register_uri(
@@ -378,6 +393,64 @@ class TestBackofficeService(LogCaptureMixin, BaseTestCase):
         )
 
 
+@override_settings(GRANT_APPLICATION_CACHE_TIMEOUT=60)
+class TestGrantApplicationCache(BaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.service = BackofficeService()
+        self.bga = {**FAKE_GRANT_APPLICATION, 'version': 1}
+        self.url = urljoin(self.service.grant_applications_url, f'{self.bga["id"]}/')
+
+    def register_get(self, bga):
+        httpretty.register_uri(httpretty.GET, self.url, status=200, body=json.dumps(bga))
+
+    @httpretty.activate
+    def test_get_grant_application_is_cached(self):
+        self.register_get(self.bga)
+        self.service.get_grant_application(self.bga['id'])
+        bga = self.service.get_grant_application(self.bga['id'])
+        self.assertEqual(bga['id'], self.bga['id'])
+        self.assertEqual(len(httpretty.latest_requests()), 1)
+
+    @httpretty.activate
+    @override_settings(GRANT_APPLICATION_CACHE_TIMEOUT=0)
+    def test_get_grant_application_is_not_cached_when_disabled(self):
+        self.register_get(self.bga)
+        self.service.get_grant_application(self.bga['id'])
+        self.service.get_grant_application(self.bga['id'])
+        self.assertEqual(len(httpretty.latest_requests()), 2)
+
+    @httpretty.activate
+    def test_update_grant_application_response_is_cached(self):
+        httpretty.register_uri(
+            httpretty.PATCH, self.url, status=200, body=json.dumps({**self.bga, 'turnover': 2000})
+        )
+        self.service.update_grant_application(self.bga['id'], turnover=2000)
+        bga = self.service.get_grant_application(self.bga['id'])
+        self.assertEqual(bga['turnover'], 2000)
+        self.assertEqual(httpretty.last_request().method, 'PATCH')
+
+    @httpretty.activate
+    def test_change_event_invalidates_cached_grant_application(self):
+        self.register_get(self.bga)
+        self.service.get_grant_application(self.bga['id'])
+        invalidate_grant_application(self.bga['id'], 2)
+        self.register_get({**self.bga, 'version': 2, 'is_event_evidence_requested': True})
+        bga = self.service.get_grant_application(self.bga['id'])
+        self.assertTrue(bga['is_event_evidence_requested'])
+        self.assertEqual(len(httpretty.latest_requests()), 2)
+
+    @httpretty.activate
+    def test_response_older_than_change_event_is_not_cached(self):
+        invalidate_grant_application(self.bga['id'], 2)
+        self.register_get(self.bga)
+        self.service.get_grant_application(self.bga['id'])
+        self.service.get_grant_application(self.bga['id'])
+        self.assertEqual(len(httpretty.latest_requests()), 2)
+
+
 class TestServices(BaseTestCase):
 
     @patch.object(BackofficeService, 'request_factory', side_effect=BackofficeServiceException)
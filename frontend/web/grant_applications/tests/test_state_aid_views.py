@@ -12,6 +12,7 @@ from web.tests.helpers.backoffice_objects import FAKE_GRANT_APPLICATION, FAKE_ST
 from web.tests.helpers.testcases import BaseTestCase
 
 
+@patch.object(BackofficeService, 'update_application_summary_sections', return_value=FAKE_GRANT_APPLICATION)
 @patch.object(BackofficeService, 'list_state_aids', return_value=[FAKE_STATE_AID])
 @patch.object(BackofficeService, 'get_state_aid', return_value=FAKE_STATE_AID)
 @patch.object(BackofficeService, 'update_state_aid', return_value=FAKE_STATE_AID)
@@ -40,6 +41,11 @@ class TestStateAidSummaryView(BaseTestCase):
         for cell in all_table_cells:
             self.assertEqual(cell.text, '\n        -\n      ')
 
+    def test_get_does_not_update_grant_application(self, *mocks):
+        self.client.get(self.url)
+        mocks[0].assert_not_called()
+        mocks[6].assert_not_called()
+
     def test_back_url(self, *mocks):
         response = self.client.get(self.url)
         self.assertEqual(response.status_code, 200)
@@ -112,6 +118,7 @@ class TestStateAidSummaryView(BaseTestCase):
         )
 
 
+@patch.object(BackofficeService, 'update_application_summary_sections', return_value=FAKE_GRANT_APPLICATION)
 @patch.object(BackofficeService, 'get_state_aid', return_value=FAKE_STATE_AID)
 @patch.object(BackofficeService, 'update_state_aid', return_value=FAKE_STATE_AID)
 @patch.object(BackofficeService, 'create_state_aid', return_value=FAKE_STATE_AID)
@@ -257,6 +264,7 @@ class TestAddStateAidView(BaseTestCase):
         )
 
 
+@patch.object(BackofficeService, 'update_application_summary_sections', return_value=FAKE_GRANT_APPLICATION)
 @patch.object(BackofficeService, 'list_state_aids', return_value=[FAKE_STATE_AID])
 @patch.object(BackofficeService, 'get_state_aid', return_value=FAKE_STATE_AID)
 @patch.object(BackofficeService, 'update_state_aid', return_value=FAKE_STATE_AID)
@@ -345,6 +353,7 @@ class TestEditStateAidView(BaseTestCase):
         )
 
 
+@patch.object(BackofficeService, 'update_application_summary_sections', return_value=FAKE_GRANT_APPLICATION)
 @patch.object(BackofficeService, 'delete_state_aid')
 @patch.object(BackofficeService, 'get_grant_application', return_value=FAKE_GRANT_APPLICATION)
 class TestDeleteStateAidView(BaseTestCase):
@@ -424,6 +433,7 @@ class TestDeleteStateAidView(BaseTestCase):
         )
 
 
+@patch.object(BackofficeService, 'update_application_summary_sections', return_value=FAKE_GRANT_APPLICATION)
 @patch.object(BackofficeService, 'get_state_aid', return_value=FAKE_STATE_AID)
 @patch.object(BackofficeService, 'create_state_aid', return_value=FAKE_STATE_AID)
 @patch.object(BackofficeService, 'get_grant_application', return_value=FAKE_GRANT_APPLICATION)
@@ -0,0 +1,45 @@
+from unittest.mock import patch
+
+from django.core.cache import cache
+
+from web.grant_applications.services import BackofficeService
+from web.grant_applications.utils import get_active_backoffice_application, get_latest_grant_application_link
+from web.tests.factories.grant_application_link import GrantApplicationLinkFactory
+from web.tests.helpers.backoffice_objects import FAKE_GRANT_APPLICATION
+from web.tests.helpers.testcases import BaseTestCase
+
+
+class TestGetLatestGrantApplicationLink(BaseTestCase):
+
+    def test_latest_link_is_found_case_insensitively_in_one_query(self):
+        GrantApplicationLinkFactory(email='user@test.com')
+        latest = GrantApplicationLinkFactory(email='User@Test.com')
+        GrantApplicationLinkFactory(email='other@test.com')
+        with self.assertNumQueries(1):
+            self.assertEqual(get_latest_grant_application_link('USER@test.com'), latest)
+
+    def test_no_link(self):
+        self.assertIsNone(get_latest_grant_application_link('user@test.com'))
+
+
+@patch.object(BackofficeService, 'get_grant_application', return_value=FAKE_GRANT_APPLICATION)
+class TestGetActiveBackofficeApplication(BaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.gal = GrantApplicationLinkFactory(email='user@test.com')
+
+    def test_active_application(self, *mocks):
+        self.assertEqual(get_active_backoffice_application('user@test.com'), FAKE_GRANT_APPLICATION)
+        mocks[0].assert_called_once_with(self.gal.backoffice_grant_application_id)
+
+    def test_no_link_skips_backoffice(self, *mocks):
+        self.assertIsNone(get_active_backoffice_application('other@test.com'))
+        mocks[0].assert_not_called()
+
+    def test_completed_application_is_not_fetched_again(self, *mocks):
+        mocks[0].return_value = {**FAKE_GRANT_APPLICATION, 'is_completed': True}
+        self.assertIsNone(get_active_backoffice_application('user@test.com'))
+        self.assertIsNone(get_active_backoffice_application('user@test.com'))
+        mocks[0].assert_called_once()
@@ -10,13 +10,14 @@ from web.grant_applications.views import (
     StartNewApplicationView, MagicLinkHandlerView, SelectApplicationProgressView,
     CheckYourEmailView, InvalidMagicLinkView, ExpiredMagicLinkView,
     NoApplicationFoundView, ContinueApplicationView, ApplicationIndexView, EventEvidenceUploadView,
-    EventEvidenceUploadCompleteView
+    EventEvidenceUploadCompleteView, ChangeEventsView
 )
 
 app_name = 'grant_applications'
 
 urlpatterns = [
     path('', ApplicationIndexView.as_view(), name='index'),
+    path('change-events/', ChangeEventsView.as_view(), name='change-events'),
     path('before-you-start/', BeforeYouStartView.as_view(), name='before-you-start'),
     path(
         'new-application-email/',
@@ -2,6 +2,8 @@ from urllib.parse import urljoin
 
 from django.conf import settings
 from django.core import signing
+from django.core.cache import cache
+from django.db.models.functions import Lower
 from django.urls import reverse
 
 from web.grant_applications.models import GrantApplicationLink
@@ -37,15 +39,33 @@ def send_resume_application_email(grant_application):
     BackofficeService().send_resume_application_email(grant_application, magic_link)
 
 
+def get_latest_grant_application_link(email):
+    """The most recently updated link for an email, compared case insensitively, in one query which
+    uses the lower(email), updated index."""
+    return GrantApplicationLink.objects.annotate(
+        email_lower=Lower('email')
+    ).filter(email_lower=email.lower()).order_by('-updated').first()
+
+
+def _completed_application_cache_key(backoffice_grant_application_id):
+    return f'grant-application-completed:{backoffice_grant_application_id}'
+
+
 def get_active_backoffice_application(email):
-    grant_application_links = GrantApplicationLink.objects.filter(email__iexact=email).order_by('-updated')
-    backoffice_service = BackofficeService()
-    if grant_application_links.exists():
-        active_grant_application_link = grant_application_links.first()
-        backoffice_grant_application = backoffice_service.get_grant_application(
-            active_grant_application_link.backoffice_grant_application_id
-        )
-        if not backoffice_grant_application.get('is_completed', False):
-            return backoffice_grant_application
-
-    return None
+    grant_application_link = get_latest_grant_application_link(email)
+    if grant_application_link is None:
+        return None
+
+    # A decision is final, so applications known to be completed aren't fetched again
+    cache_key = _completed_application_cache_key(grant_application_link.backoffice_grant_application_id)
+    if cache.get(cache_key):
+        return None
+
+    backoffice_grant_application = BackofficeService().get_grant_application(
+        grant_application_link.backoffice_grant_application_id
+    )
+    if backoffice_grant_application.get('is_completed', False):
+        cache.set(cache_key, True, timeout=settings.COMPLETED_APPLICATION_CACHE_TIMEOUT)
+        return None
+
+    return backoffice_grant_application
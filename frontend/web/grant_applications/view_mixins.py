@@ -1,28 +1,64 @@
+from functools import partial
+
 from django.forms import forms
 from django.http import HttpResponseRedirect
 from django.urls import reverse
 
+from web.core.concurrency import run_concurrently
 from web.core.forms import FORM_MSGS
 from web.grant_applications.services import BackofficeService, BackofficeServiceException
 
 
 class BackofficeMixin:
     grant_application_fields = None
+    # Other application summary sections built from the data this step saves. They are cleared with
+    # the step's own section when the step is saved and rebuilt by the application review page.
+    dependent_summary_sections = []
+
+    def get_backoffice_calls(self, obj):
+        """Other backoffice data the view needs, as a dict of attribute name to callable. These calls
+        are made concurrently with fetching the grant application and their results set on the view.
+        Each call should use its own BackofficeService.
+        """
+        return {}
+
+    def _get_backoffice_grant_application(self, obj):
+        try:
+            return self.backoffice_service.get_grant_application(obj.backoffice_grant_application_id)
+        except BackofficeServiceException:
+            return {'id': obj.backoffice_grant_application_id}
 
     def get_object(self):
+        # Only fetch the backoffice data once per request
+        if getattr(self, '_backoffice_object', None) is not None:
+            return self._backoffice_object
+
         obj = super().get_object()
         self.backoffice_service = BackofficeService()
+        calls = self.get_backoffice_calls(obj)
         if obj.backoffice_grant_application_id:
-            try:
-                self.backoffice_grant_application = self.backoffice_service.get_grant_application(
-                    obj.backoffice_grant_application_id
-                )
-            except BackofficeServiceException:
-                self.backoffice_grant_application = {
-                    'id': obj.backoffice_grant_application_id
-                }
+            calls['backoffice_grant_application'] = partial(self._get_backoffice_grant_application, obj)
+        for name, result in zip(calls, run_concurrently(*calls.values())):
+            setattr(self, name, result)
+
+        self._backoffice_object = obj
         return obj
 
+    def get_stale_summary_sections(self):
+        """The stored application summary sections which saving this step makes out of date, as a dict of
+        section name to None. They are cleared by the same backoffice update which saves the step.
+        """
+        stored_sections = self.backoffice_grant_application.get('application_summary_sections') or {}
+        sections = [self.request.resolver_match.url_name, *self.dependent_summary_sections]
+        return {s: None for s in sections if s in stored_sections}
+
+    def save_backoffice_grant_application(self, form, grant_application_data):
+        """Save this step to the backoffice grant application, returning the updated grant application."""
+        return self.backoffice_service.update_grant_application(
+            grant_application_id=str(form.instance.backoffice_grant_application_id),
+            **grant_application_data
+        )
+
     def form_valid(self, form, extra_grant_application_data=None):
         if (form.cleaned_data or extra_grant_application_data) and form.instance.backoffice_grant_application_id:
             extra_grant_application_data = extra_grant_application_data or {}
@@ -30,12 +66,13 @@ class BackofficeMixin:
             grant_application_data = {f: form.cleaned_data[f] for f in fields}
             grant_application_data.update(extra_grant_application_data)
             if grant_application_data:
+                stale_summary_sections = self.get_stale_summary_sections()
+                if stale_summary_sections:
+                    grant_application_data['application_summary_sections'] = stale_summary_sections
                 try:
-                    self.backoffice_grant_application = \
-                        self.backoffice_service.update_grant_application(
-                            grant_application_id=str(form.instance.backoffice_grant_application_id),
-                            **grant_application_data
-                        )
+                    self.backoffice_grant_application = self.save_backoffice_grant_application(
+                        form, grant_application_data
+                    )
                 except BackofficeServiceException:
                     form.add_error(None, forms.ValidationError(FORM_MSGS['resubmit']))
                     return super().form_invalid(form)
@@ -1,10 +1,22 @@
+import hashlib
+import hmac
+import json
+import logging
+from functools import partial
+
 from django import forms
+from django.conf import settings
 from django.core.signing import SignatureExpired, BadSignature
-from django.http import HttpResponseRedirect, Http404
+from django.http import (
+    HttpResponse, HttpResponseBadRequest, HttpResponseForbidden, HttpResponseRedirect, Http404
+)
 from django.urls import reverse, resolve
 from django.utils import timezone
+from django.utils.decorators import method_decorator
 from django.utils.http import urlencode
 from django.utils.translation import gettext_lazy as _
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
 from django.views.generic import UpdateView, RedirectView, TemplateView, FormView
 from django.views.generic.detail import SingleObjectMixin, DetailView
 
@@ -24,7 +36,9 @@ from web.grant_applications.forms import (
 from web.grant_applications.models import GrantApplicationLink
 from web.grant_applications.services import (
     BackofficeServiceException, BackofficeService, get_companies_from_search_term,
-    get_state_aid_summary_table, ApplicationReviewService
+    get_state_aid_summary_table, ApplicationReviewService, get_company_search_snapshot,
+    save_company_search_snapshot, get_trade_event_filters_choices, build_application_summary,
+    invalidate_grant_application, APPLICATION_SUMMARY_SECTIONS, UNSTORED_SUMMARY_SECTIONS
 )
 from web.grant_applications.utils import (
     send_resume_application_email, decrypting_data, get_active_backoffice_application,
@@ -35,6 +49,8 @@ from web.grant_applications.view_mixins import (
     BackofficeMixin, InitialDataMixin, ConfirmationRedirectMixin, IneligibleRedirectMixin
 )
 
+logger = logging.getLogger(__name__)
+
 
 class ApplicationIndexView(TemplateView):
     template_name = 'grant_applications/index.html'
@@ -368,11 +384,26 @@ class FindAnEventView(BackContextMixin, BackofficeMixin, SaveStateMixin, Confirm
             return f'{url}?{urlencode(params)}'
         return url
 
+    def get_backoffice_calls(self, obj):
+        calls = {'trade_event_filters_choices': get_trade_event_filters_choices}
+        if self.request.method == 'GET':
+            calls['trade_event_aggregates'] = partial(
+                BackofficeService().get_trade_event_aggregates, start_date_from=timezone.now().date()
+            )
+        return calls
+
+    def get_form_kwargs(self):
+        kwargs = super().get_form_kwargs()
+        kwargs['trade_event_filters_choices'] = self.trade_event_filters_choices
+        return kwargs
+
     def get_context_data(self, **kwargs):
         kwargs = super().get_context_data(**kwargs)
-        trade_event_aggregates = self.backoffice_service.get_trade_event_aggregates(
-            start_date_from=timezone.now().date()
-        )
+        trade_event_aggregates = getattr(self, 'trade_event_aggregates', None)
+        if trade_event_aggregates is None:
+            trade_event_aggregates = self.backoffice_service.get_trade_event_aggregates(
+                start_date_from=timezone.now().date()
+            )
         kwargs.update({
             'total_trade_events': trade_event_aggregates['total_trade_events'],
             'trade_event_total_months': len(trade_event_aggregates['trade_event_months']),
@@ -396,6 +427,7 @@ class SelectAnEventView(BackContextMixin, SuccessUrlObjectPkMixin, BackofficeMix
     }
     events_page_size = 10
     grant_application_fields = ['event']
+    dependent_summary_sections = ['event-commitment', 'trade-event-details']
 
     def get_initial(self):
         initial = super().get_initial()
@@ -408,9 +440,16 @@ class SelectAnEventView(BackContextMixin, SuccessUrlObjectPkMixin, BackofficeMix
             initial['event'] = self.backoffice_grant_application['event']['id']
         return initial
 
+    def get_backoffice_calls(self, obj):
+        return {
+            'trade_events': self.get_trade_events,
+            'trade_event_filters_choices': get_trade_event_filters_choices,
+        }
+
     def get_form_kwargs(self):
         kwargs = super().get_form_kwargs()
         kwargs['trade_events'] = self.trade_events
+        kwargs['trade_event_filters_choices'] = self.trade_event_filters_choices
         return kwargs
 
     def get_pagination_total_pages(self):
@@ -451,14 +490,6 @@ class SelectAnEventView(BackContextMixin, SuccessUrlObjectPkMixin, BackofficeMix
             kwargs['results_from'] = kwargs['results_to'] - self.events_page_size + 1
         return super().get_context_data(**kwargs)
 
-    def get(self, request, *args, **kwargs):
-        self.trade_events = self.get_trade_events()
-        return super().get(request, *args, **kwargs)
-
-    def post(self, request, *args, **kwargs):
-        self.trade_events = self.get_trade_events()
-        return super().post(request, *args, **kwargs)
-
 
 class EventCommitmentView(BackContextMixin, SuccessUrlObjectPkMixin, BackofficeMixin,
                           InitialDataMixin, ConfirmationRedirectMixin, IneligibleRedirectMixin,
@@ -516,7 +547,7 @@ class SelectCompanyView(BackContextMixin, SuccessUrlObjectPkMixin, BackofficeMix
         },
         'button_text': 'Select and continue'
     }
-    grant_application_fields = ['company']
+    dependent_summary_sections = ['manual-company-details']
 
     def get_form_kwargs(self):
         kwargs = super().get_form_kwargs()
@@ -539,13 +570,13 @@ class SelectCompanyView(BackContextMixin, SuccessUrlObjectPkMixin, BackofficeMix
             initial['duns_number'] = self.backoffice_grant_application['company']['duns_number']
         return initial
 
-    def form_valid(self, form):
-        return super().form_valid(
-            form,
-            # Set manual company details to None in case they have previously been set
-            extra_grant_application_data={
-                f: None for f in ManualCompanyDetailsForm.Meta.fields
-            }
+    def save_backoffice_grant_application(self, form, grant_application_data):
+        # The backoffice stores the searched company and links it to the application (clearing any
+        # manual company details) in one call, instead of the usual grant application update
+        return self.backoffice_service.select_company(
+            grant_application_id=str(form.instance.backoffice_grant_application_id),
+            dnb_data=form.cleaned_data['searched_company']['dnb_data'],
+            application_summary_sections=grant_application_data.get('application_summary_sections')
         )
 
     def get(self, request, *args, **kwargs):
@@ -555,15 +586,19 @@ class SelectCompanyView(BackContextMixin, SuccessUrlObjectPkMixin, BackofficeMix
                 reverse(self.back_url_name, args=(self.get_object().pk,))
             )
         self.companies = get_companies_from_search_term(self.search_term)
+        save_company_search_snapshot(kwargs['pk'], self.search_term, self.companies)
         return super().get(request, *args, **kwargs)
 
     def post(self, request, *args, **kwargs):
         self.search_term = request.GET.get('search_term')
-        self.companies = BackofficeService().request_factory(
-            'search_companies',
-            raise_exception=False,
-            duns_number=self.request.POST.get('duns_number')
-        )
+        self.companies = get_company_search_snapshot(kwargs['pk'], self.search_term)
+        if self.companies is None:
+            # The snapshot has expired (or was never stored) so look up the selected company
+            self.companies = BackofficeService().request_factory(
+                'search_companies',
+                raise_exception=False,
+                duns_number=self.request.POST.get('duns_number')
+            )
         return super().post(request, *args, **kwargs)
 
 
@@ -580,6 +615,7 @@ class ManualCompanyDetailsView(BackContextMixin, SuccessUrlObjectPkMixin, Backof
             'heading':  _('Business details')
         }
     }
+    dependent_summary_sections = ['select-company']
 
     def form_valid(self, form):
         # Set company to None in case it has been set previously
@@ -653,6 +689,7 @@ class ExportExperienceView(BackContextMixin, BackofficeMixin, InitialDataMixin,
             'heading':  _('Export experience')
         }
     }
+    dependent_summary_sections = ['export-details']
 
     def get_success_url(self):
         if self.backoffice_grant_application['has_exported_before']:
@@ -858,58 +895,53 @@ class ApplicationReviewView(BackContextMixin, BackofficeMixin, SaveStateMixin,
             'heading':  _('Check your answers before sending your application')
         }
     }
-    sections = [
-        {'url_name': 'grant-applications:previous-applications'},
-        {'url_name': 'grant-applications:select-an-event'},
-        {'url_name': 'grant-applications:event-commitment'},
-        {'url_name': 'grant-applications:select-company'},
-        {'url_name': 'grant-applications:manual-company-details'},
-        {'url_name': 'grant-applications:company-details'},
-        {'url_name': 'grant-applications:contact-details'},
-        {'url_name': 'grant-applications:company-trading-details'},
-        {'url_name': 'grant-applications:export-experience'},
-        {'url_name': 'grant-applications:export-details'},
-        {'url_name': 'grant-applications:trade-event-details'},
-        {'url_name': 'grant-applications:state-aid-summary'},
-    ]
 
     def get_success_url(self):
         return reverse('grant-applications:confirmation', args=(self.object.pk,))
 
-    def generate_application_summary(self):
+    def get_backoffice_calls(self, obj):
+        return {
+            'state_aids': partial(
+                BackofficeService().list_state_aids, grant_application=obj.backoffice_grant_application_id
+            )
+        }
+
+    def get_application_summary(self):
+        # Each step clears its stored summary section when it is saved, sections missing for that reason
+        # (or for older applications) are built and stored here. State aid is added, edited and deleted
+        # without saving the grant application, so its section is always built.
+        sections = {
+            s: v for s, v in (self.backoffice_grant_application.get('application_summary_sections') or {}).items()
+            if s not in UNSTORED_SUMMARY_SECTIONS
+        }
+        missing_sections = [s for s in APPLICATION_SUMMARY_SECTIONS if s not in sections]
         service = ApplicationReviewService(
             grant_application_link=self.object,
-            application_data=self.backoffice_grant_application
+            application_data=self.backoffice_grant_application,
+            state_aids=self.state_aids
         )
-
-        application_summary = []
-
-        for section in self.sections:
-            url = reverse(section['url_name'], args=(self.object.pk,))
-            view_class = resolve(url).func.view_class
-            form = view_class.form_class(data=self.backoffice_grant_application)
-            method_name = f"{section['url_name'].split(':')[-1].replace('-', '_')}_summary_list"
-            method = getattr(service, method_name, service.generic_summary_list)
-            summary_list = method(
-                heading=str(view_class.extra_context['page']['heading']),
-                fields=form.visible_fields(),
-                url=url
-            )
-            if summary_list:
-                application_summary.append(summary_list)
-
-        return application_summary
+        missing_sections = {s: service.section_summary_list(s) for s in missing_sections}
+        sections_to_store = {s: v for s, v in missing_sections.items() if s not in UNSTORED_SUMMARY_SECTIONS}
+        if sections_to_store:
+            try:
+                self.backoffice_service.update_application_summary_sections(
+                    grant_application_id=str(self.object.backoffice_grant_application_id),
+                    sections=sections_to_store
+                )
+            except BackofficeServiceException as e:
+                # Not fatal, the sections are built again next time
+                logger.warning('Could not store application summary sections: %s', e)
+        return build_application_summary({**sections, **missing_sections})
 
     def get_context_data(self, **kwargs):
-        kwargs['application_summary'] = self.generate_application_summary()
-        self.request.session['application_summary'] = kwargs['application_summary']
+        kwargs['application_summary'] = self.get_application_summary()
         return super().get_context_data(**kwargs)
 
     def form_valid(self, form):
         try:
             self.backoffice_service.send_grant_application_for_review(
                 str(self.object.backoffice_grant_application_id),
-                application_summary=self.request.session['application_summary']
+                application_summary=self.get_application_summary()
             )
         except BackofficeServiceException:
             msg = forms.ValidationError(FORM_MSGS['resubmit'])
@@ -983,3 +1015,26 @@ class EventEvidenceUploadCompleteView(BackofficeMixin, DetailView):
             'heading':  _('Event confirmation shared successfully')
         },
     }
+
+
+@method_decorator(csrf_exempt, name='dispatch')
+class ChangeEventsView(View):
+    """Webhook for grant application change events posted by the backoffice, see GRANT_APPLICATION_CACHE_TIMEOUT."""
+    http_method_names = ['post']
+
+    def post(self, request, *args, **kwargs):
+        if not settings.CHANGE_EVENTS_SECRET:
+            raise Http404
+
+        signature = hmac.new(settings.CHANGE_EVENTS_SECRET.encode(), request.body, hashlib.sha256).hexdigest()
+        if not hmac.compare_digest(request.headers.get('X-Signature', ''), f'sha256={signature}'):
+            return HttpResponseForbidden()
+
+        try:
+            changes = json.loads(request.body)['changes']
+            for change in changes:
+                invalidate_grant_application(change['grant_application'], int(change['version']))
+        except (ValueError, KeyError, TypeError):
+            return HttpResponseBadRequest()
+
+        return HttpResponse(status=204)
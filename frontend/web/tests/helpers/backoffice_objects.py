@@ -21,14 +21,12 @@ FAKE_COMPANY = {
         'applications_in_review': 1,
         'last_dnb_get_company_response': {
             'id': '3cceee4e-32fa-4570-b8fa-514238823e25',
+            'primary_name': 'Company 1',
             'registration_number': '012345',
             'company_address': 'An address',
-            'dnb_data': {
-                'annual_sales': 1000,
-                'employee_number': 3,
-                'domain': 'www.test.com',
-                'registration_numbers': []
-            }
+            'employee_number': 3,
+            'annual_sales': 1000,
+            'annual_sales_currency': 'GBP'
         }
     }
 